@@ -1,4 +1,5 @@
-from .abstract_container import AbstractContainer
+from .abstract_container import AbstractContainer, stack_signals
 from .eeg_container import EEGContainer
 from .event_container import EventContainer
+from .ingestion import IngestionStage
 from .live_eeg_container import LiveEEGContainer
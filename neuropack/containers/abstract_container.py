@@ -7,6 +7,18 @@ from numpy.typing import NDArray
 from scipy.fft import fft, fftfreq
 
 
+def stack_signals(containers: List["AbstractContainer"]) -> NDArray:
+    """Stacks the signals of several containers of equal shape into one array of shape (containers, channels, samples).
+
+    :param containers: Containers to stack.
+    :type containers: List[AbstractContainer]
+    :return: Stacked signals.
+    :rtype: NDArray
+    """
+    return np.stack([np.asarray(c.signals, dtype=np.float64)
+                    for c in containers])
+
+
 class AbstractContainer(ABC):
     __slots__ = "channel_names", "signals", "sample_rate", "timestamps"
 
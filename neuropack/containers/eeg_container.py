@@ -8,14 +8,14 @@ from pyedflib import highlevel
 
 from neuropack.devices.base import BCISignal
 
-from ..devices.base import BCISignal
+from ..devices.base import BCIChunk, BCISignal
 from ..utils.marker_vault import MarkerVault
 from .abstract_container import AbstractContainer
 from .event_container import EventContainer
 
 
 class EEGContainer(AbstractContainer):
-    __slots__ = "event_markers"
+    __slots__ = "event_markers", "invalid_spans"
 
     @classmethod
     def from_csv(
@@ -76,6 +76,7 @@ class EEGContainer(AbstractContainer):
                 list() for _ in range(
                     len(channel_names))], [])
         self.event_markers = MarkerVault()
+        self.invalid_spans = []
 
     def add_data(self, rec: BCISignal):
         """Add new measured data point to the container. Data points consist of combinations of
@@ -93,6 +94,32 @@ class EEGContainer(AbstractContainer):
         for i in range(len(rec.signals)):
             self.signals[i].append(rec.signals[i])
 
+    def add_chunk(self, chunk: BCIChunk):
+        """Add a chunk of measured data points to the container. Signals are expected to be of shape (channels, samples)
+        and in the same order as channels initially configured for the container.
+
+        :param chunk: Data points to add to the container.
+        :type chunk: BCIChunk
+        """
+        if len(chunk.signals) != len(self.channel_names):
+            raise Exception(
+                "Number of signals does not match number of channels provided")
+
+        self.timestamps.extend(np.asarray(chunk.timestamps).tolist())
+        for i, s in enumerate(np.asarray(chunk.signals).tolist()):
+            self.signals[i].extend(s)
+
+    def mark_invalid(self, start: float, end: float):
+        """Marks a span of time as invalid, e.g., because samples were lost during transmission. Samples at start
+        and end are considered valid. Events overlapping an invalid span are rejected by get_events.
+
+        :param start: Timestamp of the last valid sample before the span.
+        :type start: float
+        :param end: Timestamp of the first valid sample after the span.
+        :type end: float
+        """
+        self.invalid_spans.append((start, end))
+
     def mark_event(self, marker: str, timestamp_s: int) -> None:
         """Marks specific event in time with marker. Markers are stored in a MarkerVault.
         Provided timestamp is altered to match timestamp of the closest data point.
@@ -117,7 +144,7 @@ class EEGContainer(AbstractContainer):
         return self.event_markers.get_marker(marker)
 
     def get_events(self, marker: str, before: int = 50,
-                   after: int = 100) -> List[EventContainer]:
+                   after: int = 100, reject_invalid: bool = True) -> List[EventContainer]:
         """Returns list of EventContainers for specific marker. EventContainers contain all channels centered around the event.
 
         :param marker: Marker to get events for.
@@ -126,6 +153,8 @@ class EEGContainer(AbstractContainer):
         :type before: int
         :param after: Duration in milliseconds after the event to include in EventContainer, defaults to 100
         :type after: int
+        :param reject_invalid: Skip events overlapping a span marked as invalid, defaults to True
+        :type reject_invalid: bool, optional
         """
         def create_event(t, b_idx, a_idx):
             _timestamps = np.array(self.timestamps[b_idx:a_idx])
@@ -137,9 +166,20 @@ class EEGContainer(AbstractContainer):
                 _signals,
                 _timestamps)
 
+        spans = np.array(self.invalid_spans).reshape(-1, 2)
+        if not reject_invalid:
+            spans = spans[:0]
+
         events = []
         for t in self.event_markers.get_marker(marker):
             before_idx, after_idx = self.__calc_samples_idx(t, before, after)
+
+            # Skip event if its window overlaps an invalid span
+            start = self.timestamps[before_idx]
+            end = self.timestamps[after_idx - 1]
+            if np.any((spans[:, 0] < end) & (spans[:, 1] > start)):
+                continue
+
             events.append(create_event(t, before_idx, after_idx))
 
         return events
@@ -372,6 +412,8 @@ class EEGContainer(AbstractContainer):
         first_timestamp = self.timestamps[0]
         self.timestamps = [x - first_timestamp for x in self.timestamps]
         self.event_markers.shift_timestamps(-first_timestamp)
+        self.invalid_spans = [(s - first_timestamp, e - first_timestamp)
+                              for s, e in self.invalid_spans]
 
     def __find_closest_timestamp(self, timestamp: float) -> float:
         """Finds the index of the closest stored timestamp to provided time stamp.
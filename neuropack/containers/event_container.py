@@ -97,10 +97,8 @@ class EventContainer(AbstractContainer):
         if not channel_names:
             channel_names = self.channel_names
 
-        for ch in self.channel_names:
-            if np.abs(self[ch]).max() > 100:
-                return True
-        return False
+        signals = np.asarray([self[ch] for ch in channel_names])
+        return bool(np.abs(signals).max() > 100)
 
     def snr(self, signal_range: Tuple[int, int] = (
             250, 400), use_absolutes: bool = False) -> dict:
@@ -0,0 +1,119 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from ..devices.base import BCIChunk
+from .eeg_container import EEGContainer
+
+
+class IngestionStage():
+    def __init__(
+            self,
+            sample_rate: int,
+            max_fill_ms: float = 50,
+            tolerance: float = 0.5) -> None:
+        """Repairs chunks of samples before they are added to an EEGContainer. Duplicate samples, i.e., samples
+        not advancing the time by at least tolerance sample periods, are dropped. Gaps of up to max_fill_ms are
+        filled by linear interpolation. Longer gaps are left untouched and reported as invalid spans, which
+        EEGContainer.get_events uses to reject affected events. All checks are vectorized per chunk, and the last
+        sample of each chunk is kept to detect gaps between chunks.
+
+        :param sample_rate: Nominal sample rate of the device in Hz.
+        :type sample_rate: int
+        :param max_fill_ms: Longest gap in milliseconds filled by interpolation, defaults to 50
+        :type max_fill_ms: float, optional
+        :param tolerance: Allowed deviation from the sample period as fraction of the sample period, defaults to 0.5
+        :type tolerance: float, optional
+        """
+        self.sample_rate = sample_rate
+        self.max_fill_ms = max_fill_ms
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        """Forget the last sample seen and reset all counters. Must be called before ingesting a new recording.
+        """
+        self._last_timestamp = None
+        self._last_signals = None
+        self.dropped_samples = 0
+        self.filled_samples = 0
+        self.invalid_spans = 0
+
+    def process(
+            self, chunk: BCIChunk) -> Tuple[BCIChunk, List[Tuple[float, float]]]:
+        """Repair a chunk of samples.
+
+        :param chunk: Chunk as received from the device.
+        :type chunk: BCIChunk
+        :return: Repaired chunk and list of invalid spans as (start, end) timestamps. Samples at both ends of a span are valid.
+        :rtype: Tuple[BCIChunk, List[Tuple[float, float]]]
+        """
+        if not len(chunk):
+            return chunk, []
+
+        timestamps = np.asarray(chunk.timestamps, dtype=np.float64)
+        signals = np.asarray(chunk.signals, dtype=np.float64)
+        period = 1 / self.sample_rate
+
+        # Prepend last sample of previous chunk to detect gaps in between
+        has_last = self._last_timestamp is not None
+        if has_last:
+            timestamps = np.concatenate(([self._last_timestamp], timestamps))
+            signals = np.concatenate((self._last_signals, signals), axis=1)
+
+        # Drop samples not advancing beyond the latest timestamp seen so far
+        latest = np.maximum.accumulate(timestamps)
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[1:] = timestamps[1:] - latest[:-1] >= self.tolerance * period
+        self.dropped_samples += int(len(keep) - keep.sum())
+        timestamps = timestamps[keep]
+        signals = signals[:, keep]
+
+        # Classify gaps by their length
+        diffs = np.diff(timestamps)
+        steps = np.maximum(np.rint(diffs / period), 1).astype(np.int64)
+        is_gap = diffs > (1 + self.tolerance) * period
+        is_long = is_gap & (diffs * 1000 > self.max_fill_ms)
+        steps[is_long] = 1
+        spans = list(zip(timestamps[:-1][is_long].tolist(),
+                         timestamps[1:][is_long].tolist()))
+        self.invalid_spans += len(spans)
+
+        # Interpolate all samples onto a grid containing the filled gaps
+        positions = np.concatenate(([0], np.cumsum(steps)))
+        if positions[-1] + 1 != len(timestamps):
+            self.filled_samples += int(positions[-1] + 1 - len(timestamps))
+            grid = np.arange(positions[-1] + 1)
+            idx = np.searchsorted(positions, grid, side="right") - 1
+            idx = np.clip(idx, 0, len(positions) - 2)
+            frac = (grid - positions[idx]) / (positions[idx + 1] - positions[idx])
+            timestamps = timestamps[idx] + frac * \
+                (timestamps[idx + 1] - timestamps[idx])
+            signals = signals[:, idx] + frac * \
+                (signals[:, idx + 1] - signals[:, idx])
+
+        # Remember last sample for the next chunk
+        self._last_timestamp = timestamps[-1]
+        self._last_signals = signals[:, -1:]
+
+        if has_last:
+            timestamps = timestamps[1:]
+            signals = signals[:, 1:]
+
+        return BCIChunk(timestamps, signals), spans
+
+    def ingest(self, container: EEGContainer, chunk: BCIChunk):
+        """Repair a chunk of samples and add it to a container. Invalid spans are marked in the container.
+
+        :param container: Container to add repaired samples to.
+        :type container: EEGContainer
+        :param chunk: Chunk as received from the device.
+        :type chunk: BCIChunk
+        """
+        chunk, spans = self.process(chunk)
+        container.add_chunk(chunk)
+        for start, end in spans:
+            container.mark_invalid(start, end)
+
+    def __str__(self) -> str:
+        return f"IngestionStage(sample_rate={self.sample_rate}, max_fill_ms={self.max_fill_ms}, tolerance={self.tolerance})"
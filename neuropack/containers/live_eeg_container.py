@@ -6,7 +6,7 @@ import matplotlib.pyplot as plt
 from neuropack.devices.base import BCISignal
 from neuropack.utils import FastQueue
 
-from ..devices.base import BCISignal
+from ..devices.base import BCIChunk, BCISignal
 from .eeg_container import EEGContainer
 
 
@@ -28,6 +28,12 @@ class LiveEEGContainer(EEGContainer):
             self.queue.put(rec)
         super().add_data(rec)
 
+    def add_chunk(self, chunk: BCIChunk):
+        if self.queue:
+            for t, s in zip(chunk.timestamps, chunk.signals.T):
+                self.queue.put(BCISignal(t, s.tolist()))
+        super().add_chunk(chunk)
+
     def start_vis(self):
         """Starts the visualization of the data. This method blocks the main thread.
         """
@@ -0,0 +1,149 @@
+import asyncio
+from functools import partial
+from time import time
+from typing import AsyncIterator, List, Optional
+
+from ..containers import EEGContainer, IngestionStage
+from .base import BCIChunk, DeviceBase
+from .metrics import DeviceMetrics
+
+
+class AsyncDevice():
+    __slots__ = "device", "poll_interval", "max_chunk_samples"
+
+    def __init__(
+            self,
+            device: DeviceBase,
+            poll_interval: float = 0.005,
+            max_chunk_samples: Optional[int] = None) -> None:
+        """Asyncio adapter for any DeviceBase. Blocking calls, i.e., connecting and disconnecting, are run in the
+        event loop's default executor. Streaming only uses the non-blocking parts of DeviceBase and waits with
+        asyncio.sleep, so a single event loop can serve many devices without a thread per blocking call.
+        Streams are pull-based: data is only fetched from the device once the consumer asks for the next chunk,
+        and control is handed back to the loop after every chunk.
+
+        :param device: Device to wrap.
+        :type device: DeviceBase
+        :param poll_interval: Time in seconds to wait before polling the device again if no data is available, defaults to 0.005
+        :type poll_interval: float, optional
+        :param max_chunk_samples: Maximum number of samples per chunk. If None, chunks contain all available samples. defaults to None
+        :type max_chunk_samples: Optional[int], optional
+        """
+        assert isinstance(device, DeviceBase)
+        self.device = device
+        self.poll_interval = poll_interval
+        self.max_chunk_samples = max_chunk_samples
+
+    @property
+    def channel_names(self) -> List[str]:
+        return self.device.channel_names
+
+    @property
+    def sample_rate(self) -> int:
+        return self.device.sample_rate
+
+    async def connect(self, timeout: int = 20,
+                      raise_exception: bool = True) -> bool:
+        """Connects to device without blocking the event loop.
+
+        :param timeout: Timeout for connection, defaults to 20
+        :type timeout: int, optional
+        :param raise_exception: Raise exception when no connection could be created, defaults to True
+        :type raise_exception: bool, optional
+        :return: True if connection was successful, False otherwise
+        :rtype: bool
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.device.connect, timeout, raise_exception))
+
+    async def disconnect(self):
+        """Disconnects from device without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.device.disconnect)
+
+    async def stream(
+            self, duration_s: Optional[float] = None) -> AsyncIterator[BCIChunk]:
+        """Stream chunks of data from the device. The device's stream is started when iteration begins and stopped
+        when iteration ends. Iteration ends if the device disconnects or the duration has passed.
+
+        :param duration_s: Duration of stream in seconds. If None, streams until the device disconnects. defaults to None
+        :type duration_s: Optional[float], optional
+        :yield: Chunks of data from the device.
+        :rtype: AsyncIterator[BCIChunk]
+        """
+        self.device.start_stream()
+        start = time()
+        try:
+            while self.device.is_connected():
+                if duration_s is not None and time() - start >= duration_s:
+                    break
+
+                if not self.device.has_data():
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                yield self.device.fetch_chunk(self.max_chunk_samples)
+
+                # Give other devices on the same loop a chance to run
+                await asyncio.sleep(0)
+        finally:
+            self.device.stop_stream()
+
+    async def wait_until_worn(self, timeout: Optional[float] = None) -> bool:
+        """Waits for device to be worn without blocking the event loop.
+
+        :param timeout: Maximum time to wait in seconds. If None, waits indefinitely. defaults to None
+        :type timeout: Optional[float], optional
+        :return: True if device is worn, False if the timeout passed first.
+        :rtype: bool
+        """
+        start = time()
+        while not self.device.is_worn():
+            if timeout is not None and time() - start >= timeout:
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    async def record(
+            self,
+            duration_s: float,
+            ingestion: Optional[IngestionStage] = None) -> EEGContainer:
+        """Records data from device for a given duration without blocking the event loop.
+
+        :param duration_s: Duration of recording in seconds
+        :type duration_s: float
+        :param ingestion: Ingestion stage repairing gaps and duplicate samples, defaults to None
+        :type ingestion: Optional[IngestionStage], optional
+        :return: Recorded data
+        :rtype: EEGContainer
+        """
+        container = EEGContainer(self.channel_names, self.sample_rate)
+        if ingestion:
+            ingestion.reset()
+
+        async for chunk in self.stream(duration_s):
+            if ingestion:
+                ingestion.ingest(container, chunk)
+            else:
+                container.add_chunk(chunk)
+
+        return container
+
+    def is_worn(self) -> bool:
+        return self.device.is_worn()
+
+    def is_connected(self) -> bool:
+        return self.device.is_connected()
+
+    def get_metrics(self) -> DeviceMetrics:
+        return self.device.get_metrics()
+
+    async def __aenter__(self):
+        """Connects to device and returns self. This function is used for the async with statement."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Disconnects from device. This function is used for the async with statement."""
+        await self.disconnect()
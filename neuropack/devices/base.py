@@ -2,10 +2,14 @@ from abc import ABC, abstractmethod
 from ctypes import c_double, c_short
 from dataclasses import dataclass
 from multiprocessing import Pipe, Process, Value
-from typing import List
+from typing import List, Optional
 
+import numpy as np
 from numpy.typing import NDArray
 
+from .clock_sync import ClockSync
+from .metrics import DeviceMetrics, DeviceMonitor
+
 
 @dataclass
 class BCISignal:
@@ -13,8 +17,24 @@ class BCISignal:
     signals: List[float]
 
 
+@dataclass
+class BCIChunk:
+    timestamps: NDArray
+    signals: NDArray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
 class DeviceBase(ABC):
-    __slots__ = "removal_time_stamp", "sample_rate", "channel_names"
+    __slots__ = "removal_time_stamp", "sample_rate", "channel_names", "monitor", "clock"
+
+    def __init__(self) -> None:
+        """Base class for all devices. Creates a DeviceMonitor and a ClockSync, which implementations should feed with
+        every chunk of samples received from the hardware.
+        """
+        self.monitor = DeviceMonitor()
+        self.clock = ClockSync()
 
     @abstractmethod
     def start_stream():
@@ -53,6 +73,28 @@ class DeviceBase(ABC):
         """
         pass
 
+    def fetch_chunk(self, max_samples: Optional[int] = None) -> BCIChunk:
+        """Fetches all data currently available from device without blocking. Devices receiving data in blocks
+        should override this function to hand out their blocks directly.
+
+        :param max_samples: Maximum number of samples to fetch. If None, fetches all available samples. defaults to None
+        :type max_samples: Optional[int], optional
+        :return: Data from device as BCIChunk object containing an array of timestamps and an array of shape (channels, samples) with signal values in the same order as channel_names.
+        :rtype: BCIChunk
+        """
+        timestamps = []
+        signals = []
+        while self.has_data():
+            if max_samples is not None and len(timestamps) >= max_samples:
+                break
+            rec = self.fetch_data()
+            timestamps.append(rec.timestamp)
+            signals.append(rec.signals)
+
+        signals = np.array(signals, dtype=np.float64).reshape(
+            len(timestamps), len(self.channel_names))
+        return BCIChunk(np.array(timestamps, dtype=np.float64), signals.T)
+
     @abstractmethod
     def has_data(self) -> bool:
         """Checks if data is available. This function is non-blocking. It returns True if data is available, False otherwise. If data is available, fetch_data() can be called without blocking.
@@ -80,6 +122,32 @@ class DeviceBase(ABC):
         """
         pass
 
+    def get_metrics(self) -> DeviceMetrics:
+        """Returns a snapshot of the device's throughput and health counters. This function is non-blocking.
+        Devices not reporting to a DeviceMonitor return an empty snapshot.
+
+        :return: Snapshot of throughput and health counters
+        :rtype: DeviceMetrics
+        """
+        monitor = getattr(self, "monitor", None)
+        if monitor is None:
+            return DeviceMetrics()
+        return monitor.snapshot(self.sample_rate)
+
+    def to_device_time(self, host_time: float) -> float:
+        """Maps a host timestamp, e.g., of a stimulus, onto the time base of the device's samples.
+        Devices not reporting to a ClockSync return the host timestamp unchanged.
+
+        :param host_time: Host timestamp in seconds
+        :type host_time: float
+        :return: Corresponding device timestamp in seconds
+        :rtype: float
+        """
+        clock = getattr(self, "clock", None)
+        if clock is None:
+            return host_time
+        return clock.to_device_time(host_time)
+
     def __enter__(self):
         """Connects to device and returns self. This function is used for the with statement."""
         self.connect()
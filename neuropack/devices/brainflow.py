@@ -71,7 +71,8 @@ class BrainFlowDevice(DeviceBase):
             self._msg_queue = Queue()
 
     def connect(self, timeout: int = 20, raise_exception: bool = True) -> bool:
-        """Tries to connect to Muse device via Bluetooth.
+        """Tries to connect to Muse device via Bluetooth. Metrics, clock synchronization and the wear detection window
+        of a previous connection are reset.
 
         :param timeout: Timeout for connection, defaults to 20
         :type timeout: int, optional
@@ -85,6 +86,14 @@ class BrainFlowDevice(DeviceBase):
         # Disconnect if already connected
         self.disconnect()
         self._params.timeout = timeout
+
+        # Counters and timestamps of a previous session would count as gaps, and its device clock is unrelated
+        self.monitor.reset()
+        self.clock.reset()
+        self._average_window = FastQueue(self.window_size)
+        self._signal_avg = 0
+        self._on_head = True
+
         self.board = BoardShim(self.board_id, self._params)
 
         # Try to connect
@@ -192,6 +201,7 @@ class BrainFlowDevice(DeviceBase):
             if sample_count == 0:
                 # No new samples, check how long ago was last sample
                 if time() - last_timestamp > 1:
+                    self.monitor.record_disconnect()
                     self.__thread_disconnect()
                     break
 
@@ -200,6 +210,7 @@ class BrainFlowDevice(DeviceBase):
                 continue
 
             # Fetch data
+            gather_start = time()
             try:
                 sample = self.board.get_board_data(sample_count)
             except BaseException:
@@ -211,6 +222,9 @@ class BrainFlowDevice(DeviceBase):
                 sleep(0.001)
                 continue
 
+            self.clock.update(
+                gather_start, sample[self._timestamp_channel][-1])
+
             dim = sample.shape[1]
             for i in range(dim):
                 timestamp = sample[self._timestamp_channel][i]
@@ -228,6 +242,12 @@ class BrainFlowDevice(DeviceBase):
                 if self._streaming:
                     self._msg_queue.put(BCISignal(timestamp, signals))
 
+            self.monitor.record_chunk(
+                sample[self._timestamp_channel],
+                self.sample_rate,
+                time() - gather_start,
+                self._msg_queue.qsize())
+
     def _check_device_on_head(self, sample: list):
         """Use window mechanism to check if device was taken of head
         during recording.
@@ -247,8 +267,10 @@ class BrainFlowDevice(DeviceBase):
             if self._on_head:
                 self._on_head = False
                 self.removal_time_stamp = time()
+                self.monitor.record_wear_transition()
         elif not self._on_head:
             self._on_head = True
+            self.monitor.record_wear_transition()
 
     def __del__(self):
         self.disconnect()
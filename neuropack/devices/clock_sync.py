@@ -0,0 +1,153 @@
+from threading import Lock
+from typing import Union
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.stats import theilslopes
+
+
+class ClockSync():
+    __slots__ = "window", "min_points", "quantile", "_lock", "_host", "_device", "_head", "_count", "_dirty", "_reference", "_offset", "_drift", "_latency", "_session"
+
+    def __init__(
+            self,
+            window: int = 256,
+            min_points: int = 8,
+            quantile: float = 0.95) -> None:
+        """Estimates offset and drift between the host clock, used to timestamp stimuli, and the device timestamps
+        of incoming samples. Every chunk contributes one observation pairing the host time of its arrival with the
+        timestamp of its last sample. Drift is estimated with a Theil-Sen fit over the most recent observations.
+        As arrival is always delayed by transport and polling, the offset is taken from an upper quantile of the
+        detrended observations, i.e., from the chunks delivered fastest. The median delay on top of that is
+        reported as latency. Until min_points observations are available, host time is mapped unchanged.
+
+        :param window: Number of most recent observations used for the fit, defaults to 256
+        :type window: int, optional
+        :param min_points: Minimum number of observations before a fit is performed, defaults to 8
+        :type min_points: int, optional
+        :param quantile: Quantile of the detrended observations used as offset, defaults to 0.95
+        :type quantile: float, optional
+        """
+        self.window = window
+        self.min_points = min_points
+        self.quantile = quantile
+        self._lock = Lock()
+        self._session = 0
+        self.reset()
+
+    def reset(self):
+        """Forget all observations.
+        """
+        with self._lock:
+            self._session += 1
+            self._host = np.zeros(self.window, dtype=np.float64)
+            self._device = np.zeros(self.window, dtype=np.float64)
+            self._head = 0
+            self._count = 0
+            self._dirty = False
+            self._reference = 0
+            self._offset = 0
+            self._drift = 0
+            self._latency = 0
+
+    def update(self, host_time: float, device_time: float):
+        """Add an observation. Should be called for every chunk received from the device.
+
+        :param host_time: Host time the chunk arrived at.
+        :type host_time: float
+        :param device_time: Device timestamp of the last sample in the chunk.
+        :type device_time: float
+        """
+        with self._lock:
+            self._host[self._head] = host_time
+            self._device[self._head] = device_time
+            self._head = (self._head + 1) % self.window
+            self._count = min(self._count + 1, self.window)
+            self._dirty = True
+
+    def is_synchronized(self) -> bool:
+        """Checks if enough observations are available to map between both clocks.
+
+        :return: True if enough observations are available, False otherwise.
+        :rtype: bool
+        """
+        return self._count >= self.min_points
+
+    def to_device_time(
+            self, host_time: Union[float, NDArray]) -> Union[float, NDArray]:
+        """Map host time, e.g., of a stimulus, onto the device time base.
+
+        :param host_time: Host time(s) to map.
+        :type host_time: Union[float, NDArray]
+        :return: Corresponding device time(s).
+        :rtype: Union[float, NDArray]
+        """
+        reference, offset, drift = self.__fit()
+        return host_time + offset + drift * (host_time - reference)
+
+    def to_host_time(
+            self, device_time: Union[float, NDArray]) -> Union[float, NDArray]:
+        """Map device time, e.g., of a sample, onto the host time base.
+
+        :param device_time: Device time(s) to map.
+        :type device_time: Union[float, NDArray]
+        :return: Corresponding host time(s).
+        :rtype: Union[float, NDArray]
+        """
+        reference, offset, drift = self.__fit()
+        return (device_time - offset + drift * reference) / (1 + drift)
+
+    @property
+    def offset(self) -> float:
+        """Offset between device and host clock in seconds at the time of the oldest observation in the window."""
+        self.__fit()
+        return self._offset
+
+    @property
+    def drift(self) -> float:
+        """Drift of the device clock relative to the host clock in seconds per second."""
+        self.__fit()
+        return self._drift
+
+    @property
+    def latency(self) -> float:
+        """Median delay between a sample being timestamped and it arriving on the host, in seconds."""
+        self.__fit()
+        return self._latency
+
+    def __fit(self) -> tuple:
+        """Refit clock model if new observations were added since the last fit.
+
+        :return: Reference, offset and drift of the current fit, read together.
+        :rtype: tuple
+        """
+        with self._lock:
+            if not self._dirty or self._count < self.min_points:
+                return self._reference, self._offset, self._drift
+            self._dirty = False
+            session = self._session
+            host = self._host[:self._count].copy()
+            device = self._device[:self._count].copy()
+
+        # Fit relative to the oldest observation to keep the numbers small
+        reference = host.min()
+        x = host - reference
+        residual = device - host
+        drift = theilslopes(residual, x)[0] if np.ptp(x) > 0 else 0
+
+        detrended = residual - drift * x
+        offset = np.quantile(detrended, self.quantile)
+        latency = offset - np.median(detrended)
+
+        with self._lock:
+            # Observations were reset while fitting, the fit belongs to a previous session
+            if self._session != session:
+                return self._reference, self._offset, self._drift
+            self._reference = reference
+            self._drift = drift
+            self._offset = offset
+            self._latency = latency
+            return reference, offset, drift
+
+    def __str__(self) -> str:
+        return f"ClockSync(offset={self.offset}, drift={self.drift}, latency={self.latency})"
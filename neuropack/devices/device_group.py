@@ -0,0 +1,243 @@
+from threading import Thread
+from time import time
+from typing import List, Optional, Union
+
+import numpy as np
+
+from ..containers import EEGContainer, IngestionStage
+from ..utils.marker_vault import MarkerVault
+from .base import DeviceBase
+
+
+class DeviceGroup():
+    def __init__(self, *devices: DeviceBase,
+                 prefixes: Optional[List[str]] = None) -> None:
+        """Group of devices recorded together. The first device acts as reference: recordings of all other devices
+        are mapped onto its time base using the devices' clock estimates. Recordings can either be merged into one
+        EEGContainer with prefixed channel names, or returned as one container per device sharing one MarkerVault.
+
+        :param devices: Devices to record from. The first device is used as reference.
+        :type devices: DeviceBase
+        :param prefixes: Prefix for the channel names of each device in merged recordings. If None, devices are prefixed with "D<index>_". defaults to None
+        :type prefixes: Optional[List[str]], optional
+        """
+        assert len(devices) > 0, "Group needs at least one device."
+        for d in devices:
+            assert isinstance(d, DeviceBase)
+
+        if prefixes is None:
+            prefixes = [f"D{i}_" for i in range(len(devices))]
+        assert len(prefixes) == len(devices), "Expected one prefix per device."
+
+        self.devices = list(devices)
+        self.prefixes = list(prefixes)
+
+    @property
+    def reference(self) -> DeviceBase:
+        """Device whose time base is shared by all recordings."""
+        return self.devices[0]
+
+    @property
+    def channel_names(self) -> List[str]:
+        """Prefixed channel names of all devices in the order used for merged recordings."""
+        return [p + ch for d, p in zip(self.devices, self.prefixes)
+                for ch in d.channel_names]
+
+    def connect(self, timeout: int = 20, raise_exception: bool = True) -> bool:
+        """Connects to all devices concurrently. Blocks until every device is either connected or failed to connect.
+
+        :param timeout: Timeout for connection of each device, defaults to 20
+        :type timeout: int, optional
+        :param raise_exception: Raise exception when any device could not be connected, defaults to True
+        :type raise_exception: bool, optional
+        :return: True if all devices were connected, False otherwise
+        :rtype: bool
+        """
+        results = [False] * len(self.devices)
+        errors = [None] * len(self.devices)
+
+        def connect_device(i):
+            try:
+                results[i] = self.devices[i].connect(timeout, raise_exception)
+            except BaseException as e:
+                errors[i] = e
+
+        threads = [Thread(target=connect_device, args=(i,))
+                   for i in range(len(self.devices))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for e in errors:
+            if e is not None:
+                raise e
+
+        return all(results)
+
+    def disconnect(self):
+        """Disconnects from all devices.
+        """
+        for d in self.devices:
+            d.disconnect()
+
+    def start_stream(self):
+        """Starts data stream of all devices.
+        """
+        for d in self.devices:
+            d.start_stream()
+
+    def stop_stream(self):
+        """Stops data stream of all devices.
+        """
+        for d in self.devices:
+            d.stop_stream()
+
+    def is_connected(self) -> bool:
+        """Checks if all devices are connected.
+
+        :return: True if all devices are connected, False otherwise
+        :rtype: bool
+        """
+        return all(d.is_connected() for d in self.devices)
+
+    def is_worn(self) -> bool:
+        """Checks if all devices are worn.
+
+        :return: True if all devices are worn, False otherwise
+        :rtype: bool
+        """
+        return all(d.is_worn() for d in self.devices)
+
+    def to_device_time(self, host_time: float) -> float:
+        """Maps a host timestamp, e.g., of a stimulus, onto the group's time base.
+
+        :param host_time: Host timestamp in seconds
+        :type host_time: float
+        :return: Corresponding timestamp in the reference device's time base
+        :rtype: float
+        """
+        return self.reference.to_device_time(host_time)
+
+    def record(
+            self,
+            duration_s: float,
+            merge: bool = True,
+            check_worn: bool = True,
+            ingestion: Optional[IngestionStage] = None) -> Union[EEGContainer, List[EEGContainer]]:
+        """Records data from all devices for a given duration. Data is fetched chunk-wise from each device, so the
+        cost of the recording loop grows linearly with the number of devices.
+
+        :param duration_s: Duration of recording in seconds
+        :type duration_s: float
+        :param merge: Return one merged container instead of one container per device, defaults to True
+        :type merge: bool, optional
+        :param check_worn: Stop recording if any device is not worn anymore, defaults to True
+        :type check_worn: bool, optional
+        :param ingestion: Ingestion stage whose settings are used to repair the stream of every device, defaults to None
+        :type ingestion: Optional[IngestionStage], optional
+        :return: Merged container or one container per device sharing one MarkerVault
+        :rtype: Union[EEGContainer, List[EEGContainer]]
+        """
+        containers = self.create_containers()
+        stages = [None] * len(self.devices)
+        if ingestion:
+            stages = [IngestionStage(d.sample_rate, ingestion.max_fill_ms, ingestion.tolerance)
+                      for d in self.devices]
+
+        self.start_stream()
+        start = time()
+        while time() - start < duration_s:
+            if check_worn and not self.is_worn():
+                break
+            for d, c, s in zip(self.devices, containers, stages):
+                if not d.has_data():
+                    continue
+                chunk = d.fetch_chunk()
+                if s:
+                    s.ingest(c, chunk)
+                else:
+                    c.add_chunk(chunk)
+        self.stop_stream()
+
+        self.align(containers)
+        if merge:
+            return self.merge(containers)
+        return containers
+
+    def create_containers(self) -> List[EEGContainer]:
+        """Creates one empty container per device. All containers share one MarkerVault.
+
+        :return: One container per device
+        :rtype: List[EEGContainer]
+        """
+        vault = MarkerVault()
+        containers = []
+        for d in self.devices:
+            c = EEGContainer(d.channel_names, d.sample_rate)
+            c.event_markers = vault
+            containers.append(c)
+        return containers
+
+    def align(self, containers: List[EEGContainer]):
+        """Maps timestamps and invalid spans of all containers onto the reference device's time base. The operation
+        is performed in place. Containers are expected in the same order as the devices.
+
+        :param containers: One container per device
+        :type containers: List[EEGContainer]
+        """
+        ref_clock = self.reference.clock
+        for d, c in zip(self.devices[1:], containers[1:]):
+            def to_reference(t):
+                return ref_clock.to_device_time(d.clock.to_host_time(t))
+
+            c.timestamps = to_reference(np.asarray(
+                c.timestamps, dtype=np.float64)).tolist()
+            c.invalid_spans = [(to_reference(s), to_reference(e))
+                               for s, e in c.invalid_spans]
+
+    def merge(self, containers: List[EEGContainer]) -> EEGContainer:
+        """Merges aligned containers into one container. Signals of all devices are linearly interpolated onto the
+        timestamps of the reference device. Time ranges not covered by every device are marked as invalid.
+
+        :param containers: One aligned container per device
+        :type containers: List[EEGContainer]
+        :return: Merged container with prefixed channel names
+        :rtype: EEGContainer
+        """
+        for p, c in zip(self.prefixes, containers):
+            if not len(c):
+                raise Exception(f"Device {p} did not record any data.")
+
+        ref = containers[0]
+        ref_ts = np.asarray(ref.timestamps, dtype=np.float64)
+
+        signals = []
+        spans = []
+        for c in containers:
+            ts = np.asarray(c.timestamps, dtype=np.float64)
+            for s in c.signals:
+                signals.append(np.interp(ref_ts, ts, s).tolist())
+
+            # Mark spans not covered by device and carry over its own spans
+            if ts[0] > ref_ts[0]:
+                spans.append((ref_ts[0], ts[0]))
+            if ts[-1] < ref_ts[-1]:
+                spans.append((ts[-1], ref_ts[-1]))
+            spans.extend(c.invalid_spans)
+
+        merged = EEGContainer(self.channel_names, ref.sample_rate)
+        merged.timestamps = ref_ts.tolist()
+        merged.signals = signals
+        merged.invalid_spans = spans
+        merged.event_markers = ref.event_markers
+        return merged
+
+    def __enter__(self):
+        """Connects to all devices and returns self. This function is used for the with statement."""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Disconnects from all devices. This function is used for the with statement."""
+        self.disconnect()
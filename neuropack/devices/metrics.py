@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+from threading import Lock
+from time import time
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass
+class DeviceMetrics:
+    samples_per_second: float = 0
+    sample_rate_drift: float = 0
+    total_samples: int = 0
+    chunk_count: int = 0
+    chunk_size_min: int = 0
+    chunk_size_max: int = 0
+    chunk_size_mean: float = 0
+    queue_depth: int = 0
+    queue_high_water: int = 0
+    gather_latency_mean_ms: float = 0
+    gather_latency_max_ms: float = 0
+    timestamp_gaps: int = 0
+    lost_samples: int = 0
+    wear_transitions: int = 0
+    disconnects: int = 0
+    time_since_last_sample: Optional[float] = None
+
+
+class DeviceMonitor():
+    __slots__ = "_lock", "_first_arrival", "_first_chunk", "_last_arrival", "_last_timestamp", "_total_samples", "_chunk_count", "_chunk_min", "_chunk_max", "_latency_total", "_latency_max", "_queue_depth", "_queue_high_water", "_timestamp_gaps", "_lost_samples", "_wear_transitions", "_disconnects"
+
+    def __init__(self) -> None:
+        """Collects throughput and health counters of a device's acquisition path. Counters are updated by the
+        thread gathering data from the hardware and can be read at any time as a DeviceMetrics snapshot.
+        """
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Resets all counters to their initial state.
+        """
+        with self._lock:
+            self._first_arrival = None
+            self._first_chunk = 0
+            self._last_arrival = None
+            self._last_timestamp = None
+            self._total_samples = 0
+            self._chunk_count = 0
+            self._chunk_min = 0
+            self._chunk_max = 0
+            self._latency_total = 0
+            self._latency_max = 0
+            self._queue_depth = 0
+            self._queue_high_water = 0
+            self._timestamp_gaps = 0
+            self._lost_samples = 0
+            self._wear_transitions = 0
+            self._disconnects = 0
+
+    def record_chunk(
+            self,
+            timestamps: NDArray,
+            sample_rate: int,
+            latency_s: float,
+            queue_depth: int):
+        """Record a chunk of samples received from the device. Gaps in the timestamp channel are detected by
+        comparing the distance between consecutive timestamps, including the last timestamp of the previous chunk,
+        with the nominal sample period.
+
+        :param timestamps: Timestamps of all samples in the chunk.
+        :type timestamps: NDArray
+        :param sample_rate: Nominal sample rate of the device.
+        :type sample_rate: int
+        :param latency_s: Time in seconds it took to process the chunk.
+        :type latency_s: float
+        :param queue_depth: Number of samples waiting to be fetched after the chunk was processed.
+        :type queue_depth: int
+        """
+        size = len(timestamps)
+        if size == 0:
+            return
+        arrival = time()
+
+        with self._lock:
+            # Detect gaps against the nominal sample period
+            if self._last_timestamp is not None:
+                timestamps = np.concatenate(([self._last_timestamp], timestamps))
+            diffs = np.diff(timestamps)
+            period = 1 / sample_rate
+            gaps = diffs[diffs > 1.5 * period]
+            self._timestamp_gaps += len(gaps)
+            self._lost_samples += int(np.round(gaps / period).sum()) - len(gaps)
+            self._last_timestamp = timestamps[-1]
+
+            if self._first_arrival is None:
+                self._first_arrival = arrival
+                self._first_chunk = size
+                self._chunk_min = size
+            self._last_arrival = arrival
+
+            self._total_samples += size
+            self._chunk_count += 1
+            self._chunk_min = min(self._chunk_min, size)
+            self._chunk_max = max(self._chunk_max, size)
+            self._latency_total += latency_s
+            self._latency_max = max(self._latency_max, latency_s)
+            self._queue_depth = queue_depth
+            self._queue_high_water = max(self._queue_high_water, queue_depth)
+
+    def record_wear_transition(self):
+        """Record that the device was either put on or taken off the head.
+        """
+        with self._lock:
+            self._wear_transitions += 1
+
+    def record_disconnect(self):
+        """Record that the device was disconnected because it stopped delivering samples.
+        """
+        with self._lock:
+            self._disconnects += 1
+
+    def snapshot(self, sample_rate: int) -> DeviceMetrics:
+        """Create a snapshot of all counters.
+
+        :param sample_rate: Nominal sample rate of the device, used to calculate the drift of the effective sample rate.
+        :type sample_rate: int
+        :return: Snapshot of all counters.
+        :rtype: DeviceMetrics
+        """
+        with self._lock:
+            if not self._chunk_count:
+                return DeviceMetrics(disconnects=self._disconnects,
+                                     wear_transitions=self._wear_transitions)
+
+            # The first chunk only marks the start of the measurement window
+            duration = self._last_arrival - self._first_arrival
+            sps = 0
+            drift = 0
+            if duration > 0:
+                sps = (self._total_samples - self._first_chunk) / duration
+                drift = sps / sample_rate - 1
+
+            return DeviceMetrics(
+                samples_per_second=sps,
+                sample_rate_drift=drift,
+                total_samples=self._total_samples,
+                chunk_count=self._chunk_count,
+                chunk_size_min=self._chunk_min,
+                chunk_size_max=self._chunk_max,
+                chunk_size_mean=self._total_samples / self._chunk_count,
+                queue_depth=self._queue_depth,
+                queue_high_water=self._queue_high_water,
+                gather_latency_mean_ms=1000 * self._latency_total / self._chunk_count,
+                gather_latency_max_ms=1000 * self._latency_max,
+                timestamp_gaps=self._timestamp_gaps,
+                lost_samples=self._lost_samples,
+                wear_transitions=self._wear_transitions,
+                disconnects=self._disconnects,
+                time_since_last_sample=time() - self._last_arrival)
@@ -1,12 +1,285 @@
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Hashable, List, Optional, Tuple, TypeVar, Union
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from numpy.typing import NDArray
-from statsmodels.regression import yule_walker
+from scipy.fft import rfft, rfftfreq
 
-from .containers import EventContainer
+from .containers import AbstractContainer, EventContainer, stack_signals
 from .utils import normalize_npy
+from .utils.cache_stats import CacheStats
+from .utils.projection import IncrementalPCA
+from .utils.spd import EIGENVALUE_FLOOR, covariance, spd_apply, upper_triangle
+from .utils.spectral import (autocorrelation, levinson_durbin, morlet_transform,
+                             multitaper_psd, welch_psd, yule_walker)
+
+
+# A band is given as (low, high) or (low, high, include_low). Frequencies above low, or equal to it if include_low
+# is set, and up to high are part of the band.
+Band = Union[Tuple[float, float], Tuple[float, float, bool]]
+
+
+class BandPlan():
+    __slots__ = "bands", "freqs", "weights"
+
+    def __init__(self, freqs: NDArray, bands: Tuple[Band, ...]) -> None:
+        """Aggregation of a power spectrum into frequency bands. Band membership is resolved once into a weight matrix,
+        so averaging all bands of all epochs and channels is a single matrix product. Use band_plan to get cached plans.
+
+        :param freqs: Frequencies of the power spectrum.
+        :type freqs: NDArray
+        :param bands: Bands to aggregate.
+        :type bands: Tuple[Band, ...]
+        """
+        self.bands = bands
+        self.freqs = freqs
+        self.weights = np.zeros((len(freqs), len(bands)))
+        for i, band in enumerate(bands):
+            low, high = band[0], band[1]
+            lower = freqs >= low if len(band) > 2 and band[2] else freqs > low
+            mask = lower & (freqs <= high)
+            # Empty bands average to nan, as np.mean of an empty selection
+            self.weights[:, i] = mask / mask.sum() if mask.any() else np.nan
+
+    def apply(self, power: NDArray) -> NDArray:
+        """Average a power spectrum within each band.
+
+        :param power: Power of shape (..., frequencies).
+        :type power: NDArray
+        :return: Band power of shape (..., bands).
+        :rtype: NDArray
+        """
+        return power @ self.weights
+
+    def __str__(self) -> str:
+        return f"BandPlan(bands={list(self.bands)})"
+
+
+@lru_cache(maxsize=128)
+def band_plan(n_fft: int, n_freqs: int, sample_rate: float,
+              bands: Tuple[Band, ...]) -> BandPlan:
+    """Returns the cached band plan for the first n_freqs frequencies of a real FFT of length n_fft.
+
+    :param n_fft: Length of the FFT.
+    :type n_fft: int
+    :param n_freqs: Number of frequencies in the power spectrum.
+    :type n_freqs: int
+    :param sample_rate: Sample rate of the signals.
+    :type sample_rate: float
+    :param bands: Bands to aggregate.
+    :type bands: Tuple[Band, ...]
+    :return: Band plan.
+    :rtype: BandPlan
+    """
+    return BandPlan(rfftfreq(n_fft, 1 / sample_rate)[:n_freqs], bands)
+
+
+def sliding_windows(signals: NDArray, window: int, step: int) -> NDArray:
+    """Returns overlapping windows of signals without copying them. Windows start every step samples, the last
+    incomplete window is dropped.
+
+    :param signals: Signals of shape (channels, samples).
+    :type signals: NDArray
+    :param window: Length of each window in samples.
+    :type window: int
+    :param step: Distance between the starts of consecutive windows in samples.
+    :type step: int
+    :return: Read-only view of shape (windows, channels, window).
+    :rtype: NDArray
+    """
+    if signals.shape[-1] < window:
+        return np.empty((0, signals.shape[0], window), dtype=signals.dtype)
+    return sliding_window_view(signals, window, axis=-1)[:, ::step].swapaxes(0, 1)
+
+
+class EpochBatch():
+    __slots__ = "signals", "channel_names", "sample_rate", "timestamps", "_cache"
+
+    def __init__(
+            self,
+            signals: NDArray,
+            channel_names: List[str],
+            sample_rate: int,
+            timestamps: Optional[NDArray] = None) -> None:
+        """Epochs of equal shape stacked into one array. Intermediate results shared by several feature extraction models,
+        e.g., the power spectrum, autocorrelation or channel averages, are computed once per batch and cached. The
+        signals must not be modified after creation.
+
+        :param signals: Signals of shape (epochs, channels, samples).
+        :type signals: NDArray
+        :param channel_names: Channel names of the second axis.
+        :type channel_names: List[str]
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :param timestamps: Timestamps relative to the stimulus of shape (samples,). If None, timestamps start at 0. defaults to None
+        :type timestamps: Optional[NDArray], optional
+        """
+        self.signals = np.asarray(signals, dtype=np.float64)
+        self.channel_names = list(channel_names)
+        self.sample_rate = sample_rate
+        if timestamps is None:
+            timestamps = np.arange(self.signals.shape[-1]) / sample_rate
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self._cache = {}
+
+    @classmethod
+    def create(cls, epochs: Union[List[EventContainer], "EpochBatch"]) -> "EpochBatch":
+        """Stack events into a batch. Batches are returned unchanged.
+
+        :param epochs: Events of equal shape or batch.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Batch of the events.
+        :rtype: EpochBatch
+        """
+        if isinstance(epochs, EpochBatch):
+            return epochs
+        assert len(epochs) > 0, "Batch needs at least one event."
+        return cls(stack_signals(epochs), epochs[0].channel_names,
+                   epochs[0].sample_rate, epochs[0].timestamps)
+
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the intermediate result stored under key. The result is computed on first use. Models use this to
+        share results they derive from the batch with other models.
+
+        :param key: Key identifying the result, including all parameters it depends on.
+        :type key: Hashable
+        :param compute: Function computing the result.
+        :type compute: Callable[[], Any]
+        :return: Cached result. Shared between models and must not be modified.
+        :rtype: Any
+        """
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @classmethod
+    def sliding(cls, container: AbstractContainer, window_s: float,
+                step_s: float) -> "EpochBatch":
+        """Cut a continuous recording into overlapping windows, e.g., to extract features without events. The signals
+        are converted into one array, windows are views of that array.
+
+        :param container: Recording to cut into windows.
+        :type container: AbstractContainer
+        :param window_s: Length of each window in seconds.
+        :type window_s: float
+        :param step_s: Distance between the starts of consecutive windows in seconds.
+        :type step_s: float
+        :return: Batch with one epoch per window. Timestamps are relative to the start of each window.
+        :rtype: EpochBatch
+        """
+        window = round(window_s * container.sample_rate)
+        step = max(1, round(step_s * container.sample_rate))
+        signals = np.asarray(container.signals, dtype=np.float64)
+        return cls(sliding_windows(signals, window, step),
+                   container.channel_names, container.sample_rate)
+
+    def events(self) -> List[EventContainer]:
+        """Returns the epochs as EventContainers.
+
+        :return: One EventContainer per epoch. Shared between models and must not be modified.
+        :rtype: List[EventContainer]
+        """
+        return self.cached("events", lambda: [
+            EventContainer(self.channel_names, self.sample_rate, list(e), np.copy(self.timestamps))
+            for e in self.signals])
+
+    def channel_indices(self, channels: List[str]) -> List[int]:
+        """Returns the indices of channels on the second axis. If no channels are given, all channels are returned.
+
+        :param channels: Channel names.
+        :type channels: List[str]
+        :return: Indices of the channels.
+        :rtype: List[int]
+        """
+        if not channels:
+            return list(range(len(self.channel_names)))
+        return [self.channel_names.index(ch) for ch in channels]
+
+    def power_spectrum(self) -> Tuple[NDArray, NDArray]:
+        """Calculates the power spectrum of all epochs and channels, scaled like EventContainer.power_spectrum.
+
+        :return: Power of shape (epochs, channels, frequencies) and the frequencies.
+        :rtype: Tuple[NDArray, NDArray]
+        """
+        def compute():
+            n = self.signals.shape[-1]
+            freqs = rfftfreq(n, 1 / self.sample_rate)[:n // 2]
+            power = 2.0 / n * np.abs(rfft(self.signals, axis=-1)[..., :n // 2])
+            return power, freqs
+        return self.cached("power_spectrum", compute)
+
+    def autocorrelation(self, max_lag: int) -> NDArray:
+        """Biased autocorrelation of all epochs and channels. All lags are computed at once, so models using
+        different lags share one computation.
+
+        :param max_lag: Largest lag to return.
+        :type max_lag: int
+        :return: Autocorrelation of shape (epochs, channels, max_lag + 1).
+        :rtype: NDArray
+        """
+        r = self.cached("autocorrelation", lambda: autocorrelation(
+            self.signals, self.signals.shape[-1] - 1))
+        return r[..., :max_lag + 1]
+
+    def ar_coefficients(self, order: int) -> NDArray:
+        """AR coefficients of all epochs and channels, equal to ar_coefficients(signals, order).
+
+        :param order: Order of the AR model.
+        :type order: int
+        :return: Coefficients of shape (epochs, channels, order).
+        :rtype: NDArray
+        """
+        return self.cached(("ar_coefficients", order), lambda: levinson_durbin(
+            self.autocorrelation(order), order)[0])
+
+    def channel_mean(self, channels: List[str]) -> NDArray:
+        """Average of channels of each epoch. If no channels are given, all channels are averaged.
+
+        :param channels: Channel names.
+        :type channels: List[str]
+        :return: Average of shape (epochs, samples).
+        :rtype: NDArray
+        """
+        return self.cached(("channel_mean", tuple(channels)),
+                           lambda: self.signals[:, self.channel_indices(channels)].mean(axis=1))
+
+    def band_means(self, bands: List[Band]) -> NDArray:
+        """Averages the power spectrum within frequency bands.
+
+        :param bands: Bands to average.
+        :type bands: List[Band]
+        :return: Band power of shape (epochs, channels, bands).
+        :rtype: NDArray
+        """
+        power, freqs = self.power_spectrum()
+        n = self.signals.shape[-1]
+        return band_plan(n, len(freqs), self.sample_rate, tuple(bands)).apply(power)
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+
+# Power bands of PAC models as (low, high, include_low)
+PAC_BANDS = ((0, 10, True), (10, 13), (13, 30), (30, 50))
+
+
+def ar_coefficients(signals: NDArray, order: int) -> NDArray:
+    """Estimates AR coefficients of every signal along the last axis using Yule-Walker equations. All signals are
+    solved at once through FFT autocorrelation and a vectorized Levinson-Durbin recursion.
+
+    :param signals: Signals of shape (..., samples).
+    :type signals: NDArray
+    :param order: Order of the AR model.
+    :type order: int
+    :return: Coefficients of shape (..., order).
+    :rtype: NDArray
+    """
+    return yule_walker(signals, order)[0]
 
 
 class FeatureExtractionModelBase(ABC):
@@ -24,6 +297,20 @@ class FeatureExtractionModelBase(ABC):
         :rtype: NDArray"""
         pass
 
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Models override this with a vectorized implementation, the
+        default extracts the features of each event separately.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, features).
+        :rtype: NDArray
+        """
+        if isinstance(epochs, EpochBatch):
+            epochs = epochs.events()
+        return np.stack([self.extract_features(e) for e in epochs])
+
 
 class AverageModel(FeatureExtractionModelBase):
     __slots__ = "channels"
@@ -48,33 +335,46 @@ class AverageModel(FeatureExtractionModelBase):
         t = ev.average_ch(*self.channels)
         return t[0]
 
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are: Average of the selected channels of each event.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, samples).
+        :rtype: NDArray
+        """
+        return EpochBatch.create(epochs).channel_mean(self.channels)
+
     def __str__(self) -> str:
-        return f"AverageModel()"
+        _sub = ", ".join([str(ch) for ch in self.channels])
+        return f"AverageModel({_sub})"
 
 
 class BandpowerModel(FeatureExtractionModelBase):
-    def __init__(self) -> None:
-        """Model that extracts features from an EventContainer. Features are: power spectrum in the form of mean values for alpha and beta powerbands.
+    __slots__ = "bands"
+
+    def __init__(self, bands: Optional[List[Band]] = None) -> None:
+        """Model that extracts features from an EventContainer. Features are: power spectrum in the form of mean values for each power band, by default alpha [10-13Hz] and beta [13-30Hz].
+
+        :param bands: Bands as (low, high) or (low, high, include_low). If None, alpha and beta bands are used. defaults to None
+        :type bands: Optional[List[Band]], optional
         """
+        self.bands = tuple(bands) if bands is not None else (
+            (10, 13), (13, 30))
         super().__init__()
 
-    def aggregate_ps(self, power: NDArray, freqs: NDArray) -> List[float]:
-        """Returns median for alpha and beta powerbands
-        alpha [10-13Hz]
-        beta [13-30Hz]
+    def aggregate_ps(self, power: NDArray, freqs: NDArray) -> NDArray:
+        """Returns mean value of each power band.
 
         :param power: Data points for each frequency.
         :type power: NDArray
         :param freqs: Frequency labels.
         :type freqs: NDArray
-        :return: List of length 2, with the mean value for each power bands.
-        Ordered as [<alpha>, <beta>]
-        :rtype: List[int]
+        :return: Array with the mean value for each power band, in the order of bands.
+        :rtype: NDArray
         """
-        alpha = np.mean(np.sort(power[(freqs > 10) & (freqs <= 13)]))
-        beta = np.mean(np.sort(power[(freqs > 13) & (freqs <= 30)]))
-
-        return [alpha, beta]
+        return BandPlan(freqs, self.bands).apply(power)
 
     def extract_features(self, ev: EventContainer) -> NDArray:
         """Extract features from an EventContainer. Features are: power spectrum.
@@ -84,15 +384,205 @@ class BandpowerModel(FeatureExtractionModelBase):
         :return: Features as a numpy array.
         :rtype: NDArray
         """
-        features = []
         power_spectrum = ev.power_spectrum()
-        for ch_ps in power_spectrum[:-1]:
-            features.append(self.aggregate_ps(ch_ps, power_spectrum[-1]))
+        plan = band_plan(len(ev), len(power_spectrum[-1]), ev.sample_rate,
+                         self.bands)
+        return plan.apply(np.array(power_spectrum[:-1])).ravel()
 
-        return np.concatenate(features)
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are: mean alpha and beta power of each channel.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, bands * channels).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        return batch.band_means(self.bands).reshape(len(batch), -1)
+
+    def __str__(self) -> str:
+        return f"BandpowerModel(bands={list(self.bands)})"
+
+
+class WelchBandpowerModel(BandpowerModel):
+    __slots__ = "segment_s", "overlap", "window"
+
+    def __init__(self, bands: Optional[List[Band]] = None, segment_s: float = 0.5,
+                 overlap: float = 0.5, window: str = "hann") -> None:
+        """Model that extracts mean values of power bands like BandpowerModel, but estimates the power spectrum with
+        Welch's method. Averaging the periodograms of overlapping windowed segments lowers the variance of the features,
+        so shorter recordings yield stable features. Frequency resolution is reduced to 1 / segment_s.
+
+        :param bands: Bands as (low, high) or (low, high, include_low). If None, alpha and beta bands are used. defaults to None
+        :type bands: Optional[List[Band]], optional
+        :param segment_s: Length of each segment in seconds. Limited to the length of the events. defaults to 0.5
+        :type segment_s: float, optional
+        :param overlap: Fraction of each segment shared with the next one, defaults to 0.5
+        :type overlap: float, optional
+        :param window: Window applied to each segment, defaults to "hann"
+        :type window: str, optional
+        """
+        super().__init__(bands)
+        self.segment_s = segment_s
+        self.overlap = overlap
+        self.window = window
+
+    def extract_features(self, ev: EventContainer) -> NDArray:
+        """Extract features from an EventContainer. Features are: mean power of each band and channel.
+
+        :param ev: EventContainer to extract features from.
+        :type ev: EventContainer
+        :return: Features as a numpy array.
+        :rtype: NDArray
+        """
+        return self.extract_batch([ev])[0]
+
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are: mean power of each band and channel.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, bands * channels).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        nperseg = min(batch.signals.shape[-1],
+                      max(1, round(self.segment_s * batch.sample_rate)))
+        noverlap = int(nperseg * self.overlap)
+        psd, freqs = batch.cached(("welch_psd", nperseg, noverlap, self.window),
+                                  lambda: welch_psd(batch.signals, batch.sample_rate, nperseg,
+                                                    noverlap, self.window))
+        plan = band_plan(nperseg, len(freqs), batch.sample_rate, self.bands)
+        return plan.apply(psd).reshape(len(batch), -1)
+
+    def __str__(self) -> str:
+        return f"WelchBandpowerModel(bands={list(self.bands)}, segment_s={self.segment_s}, overlap={self.overlap}, window={self.window})"
+
+
+class MultitaperBandpowerModel(BandpowerModel):
+    __slots__ = "nw", "tapers"
+
+    def __init__(self, bands: Optional[List[Band]] = None, nw: float = 4,
+                 tapers: Optional[int] = None) -> None:
+        """Model that extracts mean values of power bands like BandpowerModel, but estimates the power spectrum with
+        the multitaper method. Periodograms of the same event under several orthogonal DPSS tapers are averaged, which
+        lowers the variance of the features without splitting short events into segments. The spectrum is smoothed
+        over a bandwidth of 2 * nw / duration.
+
+        :param bands: Bands as (low, high) or (low, high, include_low). If None, alpha and beta bands are used. defaults to None
+        :type bands: Optional[List[Band]], optional
+        :param nw: Time-halfbandwidth product, defaults to 4
+        :type nw: float, optional
+        :param tapers: Number of tapers. If None, 2 * nw - 1 tapers are used. defaults to None
+        :type tapers: Optional[int], optional
+        """
+        super().__init__(bands)
+        self.nw = nw
+        self.tapers = tapers
+
+    def extract_features(self, ev: EventContainer) -> NDArray:
+        """Extract features from an EventContainer. Features are: mean power of each band and channel.
+
+        :param ev: EventContainer to extract features from.
+        :type ev: EventContainer
+        :return: Features as a numpy array.
+        :rtype: NDArray
+        """
+        return self.extract_batch([ev])[0]
+
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are: mean power of each band and channel.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, bands * channels).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        psd, freqs = batch.cached(("multitaper_psd", self.nw, self.tapers),
+                                  lambda: multitaper_psd(batch.signals, batch.sample_rate,
+                                                         self.nw, self.tapers))
+        plan = band_plan(batch.signals.shape[-1], len(freqs),
+                         batch.sample_rate, self.bands)
+        return plan.apply(psd).reshape(len(batch), -1)
+
+    def __str__(self) -> str:
+        return f"MultitaperBandpowerModel(bands={list(self.bands)}, nw={self.nw}, tapers={self.tapers})"
+
+
+class MorletModel(FeatureExtractionModelBase):
+    __slots__ = "bands", "freqs_per_band", "n_cycles", "time_bins"
+
+    def __init__(self, bands: Optional[List[Tuple[float, float]]] = None, freqs_per_band: int = 3,
+                 n_cycles: float = 5, time_bins: int = 4) -> None:
+        """Model that extracts time-frequency features. Every channel is convolved with complex Morlet wavelets, whose
+        center frequencies are spread evenly within each band. The power of all wavelets of a band is averaged within
+        equally long time bins, yielding a compact band x time bin map per channel.
+
+        :param bands: Bands as (low, high). If None, theta [4-8Hz], alpha [8-13Hz] and beta [13-30Hz] are used. defaults to None
+        :type bands: Optional[List[Tuple[float, float]]], optional
+        :param freqs_per_band: Number of wavelets per band, defaults to 3
+        :type freqs_per_band: int, optional
+        :param n_cycles: Number of cycles of the wavelets. Trades temporal for spectral resolution. defaults to 5
+        :type n_cycles: float, optional
+        :param time_bins: Number of time bins per event, defaults to 4
+        :type time_bins: int, optional
+        """
+        self.bands = tuple(bands) if bands is not None else (
+            (4, 8), (8, 13), (13, 30))
+        self.freqs_per_band = freqs_per_band
+        self.n_cycles = n_cycles
+        self.time_bins = time_bins
+        super().__init__()
+
+    @property
+    def freqs(self) -> Tuple[float, ...]:
+        """Center frequencies of all wavelets, ordered by band."""
+        steps = (np.arange(self.freqs_per_band) + 0.5) / self.freqs_per_band
+        return tuple(float(low + (high - low) * s)
+                     for low, high in self.bands for s in steps)
+
+    def extract_features(self, ev: EventContainer) -> NDArray:
+        """Extract features from an EventContainer. Features are: mean power of each band and time bin of each channel.
+
+        :param ev: EventContainer to extract features from.
+        :type ev: EventContainer
+        :return: Features as a numpy array.
+        :rtype: NDArray
+        """
+        return self.extract_batch([ev])[0]
+
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are: mean power of each band and time bin of each channel.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, channels * bands * time_bins).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        freqs = self.freqs
+
+        def compute():
+            tfr = morlet_transform(
+                batch.signals, batch.sample_rate, freqs, self.n_cycles)
+            return tfr.real**2 + tfr.imag**2
+        power = batch.cached(("morlet_power", freqs, self.n_cycles), compute)
+
+        # (epochs, channels, frequencies, samples) -> (epochs, channels, bands, samples)
+        n = power.shape[-1]
+        power = power.reshape(power.shape[:2] + (len(self.bands), -1, n)).mean(axis=3)
+
+        edges = np.linspace(0, n, self.time_bins + 1).round().astype(int)
+        binned = np.add.reduceat(power, edges[:-1], axis=-1) / np.diff(edges)
+        return binned.reshape(len(batch), -1)
 
     def __str__(self) -> str:
-        return f"BandpowerModel()"
+        return f"MorletModel(bands={list(self.bands)}, freqs_per_band={self.freqs_per_band}, n_cycles={self.n_cycles}, time_bins={self.time_bins})"
 
 
 class PACModel(FeatureExtractionModelBase):
@@ -101,7 +591,7 @@ class PACModel(FeatureExtractionModelBase):
         """
         super().__init__()
 
-    def aggregate_ps(self, power: NDArray, freqs: NDArray) -> List[int]:
+    def aggregate_ps(self, power: NDArray, freqs: NDArray) -> NDArray:
         """Returns median for detla, theta, alpha, and beta powerbands
         low [0-10Hz]
         alpha [10-13Hz]
@@ -112,16 +602,11 @@ class PACModel(FeatureExtractionModelBase):
         :type power: NDArray
         :param freqs: Frequency labels.
         :type freqs: NDArray
-        :return: List of length 4, with the mean value for each power bands.
-        Ordered as [<alpha>, <beta>]
-        :rtype: List[int]
+        :return: Array of length 4, with the mean value for each power bands.
+        Ordered as [<low>, <alpha>, <beta>, <gamma>]
+        :rtype: NDArray
         """
-        low = np.average(power[(freqs >= 0) & (freqs <= 10)])
-        alpha = np.average(power[(freqs > 10) & (freqs <= 13)])
-        beta = np.average(power[(freqs > 13) & (freqs <= 30)])
-        gamma = np.average(power[(freqs > 30) & (freqs <= 50)])
-
-        return [low, alpha, beta, gamma]
+        return BandPlan(freqs, PAC_BANDS).apply(power)
 
     def extract_features(self, ev: EventContainer) -> NDArray:
         """Extract features from an EventContainer. Features are: power spectrum and AR coefficients. The AR coefficients are calculated for each channel. The power spectrum is calculated for each channel and aggregated to a single value for each power band.
@@ -133,21 +618,34 @@ class PACModel(FeatureExtractionModelBase):
         """
         features = []
         power_spectrum = ev.power_spectrum()
+        plan = band_plan(len(ev), len(power_spectrum[-1]), ev.sample_rate,
+                         PAC_BANDS)
+        bands = plan.apply(np.array(power_spectrum[:-1]))
 
         # Calculate features for each channel
         for i in range(len(ev.signals)):
-            # Extract power spectrum for channel
-            features.append(self.aggregate_ps(
-                power_spectrum[i], power_spectrum[-1]))
+            features.append(bands[i])
 
             # Calculate AR coefficients
-            rho, sigma = yule_walker(
-                ev[i], order=10, method="mle")
-            features.append(rho)
+            features.append(ar_coefficients(np.asarray(ev[i]), 10))
 
         # Concatenate features, and return normalized features
         return np.concatenate(features)
 
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are ordered as by extract_features.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, 14 * channels).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        bands = batch.band_means(PAC_BANDS)
+        rho = batch.ar_coefficients(10)
+        return np.concatenate([bands, rho], axis=-1).reshape(len(batch), -1)
+
     def __str__(self) -> str:
         return f"PACModel()"
 
@@ -164,7 +662,7 @@ class AdaptedPACModel(FeatureExtractionModelBase):
         self.num_coefficients = num_coefficients
         super().__init__()
 
-    def aggregate_ps(self, power: NDArray, freqs: NDArray) -> List[int]:
+    def aggregate_ps(self, power: NDArray, freqs: NDArray) -> NDArray:
         """Returns aggregated value for each power band.
         low [0-10Hz]
         alpha [10-13Hz]
@@ -177,16 +675,9 @@ class AdaptedPACModel(FeatureExtractionModelBase):
         :type y: NDArray
         :return: Normalized list of length 4, with aggregated value for each power bands.
         Ordered as [<delta>, <theta>, <alpha>, <beta>]
-        :rtype: List[int]
+        :rtype: NDArray
         """
-        low = np.average(power[(freqs >= 0) & (freqs <= 10)])
-        alpha = np.average(power[(freqs > 10) & (freqs <= 13)])
-        beta = np.average(power[(freqs > 13) & (freqs <= 30)])
-        gamma = np.average(power[(freqs > 30) & (freqs <= 50)])
-
-        concat = np.array([low, alpha, beta, gamma])
-
-        return normalize_npy(concat)
+        return normalize_npy(BandPlan(freqs, PAC_BANDS).apply(power))
 
     def extract_features(self, ev: EventContainer) -> NDArray:
         """Extract features from an EventContainer. Features are: AR coefficients, power spectrum.
@@ -197,19 +688,623 @@ class AdaptedPACModel(FeatureExtractionModelBase):
         :rtype: NDArray
         """
         # Extract AR coefficients
-        features = []
-        for sig in ev.signals:
-            rho, sigma = yule_walker(
-                sig, order=self.num_coefficients, method="mle")
-            features.append(rho)
+        features = list(ar_coefficients(
+            np.asarray(ev.signals), self.num_coefficients))
 
         # Extract power spectrum
         power_spectrum = ev.power_spectrum()
-        for ch_ps in power_spectrum[:-1]:
-            features.append(self.aggregate_ps(ch_ps, power_spectrum[-1]))
+        plan = band_plan(len(ev), len(power_spectrum[-1]), ev.sample_rate,
+                         PAC_BANDS)
+        for bands in plan.apply(np.array(power_spectrum[:-1])):
+            features.append(normalize_npy(bands))
 
         # Concatenate features
         return np.concatenate(features)
 
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are ordered as by extract_features.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, (num_coefficients + 4) * channels).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        rho = batch.ar_coefficients(self.num_coefficients)
+        bands = batch.band_means(PAC_BANDS)
+        bands /= np.sqrt((bands**2).sum(axis=-1, keepdims=True))
+        return np.concatenate([rho.reshape(len(batch), -1),
+                               bands.reshape(len(batch), -1)], axis=1)
+
     def __str__(self) -> str:
         return f"AdaptedPACModel(num_coefficients={self.num_coefficients})"
+
+
+class FeatureUnion(FeatureExtractionModelBase):
+    __slots__ = "models"
+
+    def __init__(self, *models: FeatureExtractionModelBase) -> None:
+        """Model that concatenates the features of several models. All models extract their features from one shared
+        EpochBatch, so intermediate results used by several models, e.g., the power spectrum, autocorrelation or channel
+        averages, are computed only once.
+
+        :param models: Models whose features are concatenated in the given order.
+        :type models: FeatureExtractionModelBase
+        """
+        assert len(models) > 0, "Union needs at least one model."
+        self.models = list(models)
+        super().__init__()
+
+    def extract_features(self, ev: EventContainer) -> NDArray:
+        """Extract features of all models from an EventContainer.
+
+        :param ev: EventContainer to extract features from.
+        :type ev: EventContainer
+        :return: Features as a numpy array.
+        :rtype: NDArray
+        """
+        return self.extract_batch([ev])[0]
+
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features of all models from several events at once.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, features), concatenated in the order of the models.
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        features = [m.extract_batch(batch).reshape(len(batch), -1)
+                    for m in self.models]
+        return np.concatenate(features, axis=1)
+
+    def __str__(self) -> str:
+        _sub = ", ".join([str(m) for m in self.models])
+        return f"FeatureUnion({_sub})"
+
+
+class CachedModel(FeatureExtractionModelBase):
+    __slots__ = "model", "max_bytes", "_entries", "_size", "_stats"
+
+    def __init__(self, model: FeatureExtractionModelBase,
+                 max_bytes: int = 64 << 20) -> None:
+        """Wraps a model and keeps the features of recently seen events in memory. Entries are addressed by a hash of
+        an event's signals, timestamps, channel names and sample rate together with the model's string representation,
+        so models must include all their parameters in __str__, and fitted models their fingerprint. Once the features of all entries exceed max_bytes,
+        least recently used entries are removed.
+
+        :param model: Model to extract features with.
+        :type model: FeatureExtractionModelBase
+        :param max_bytes: Maximum size of all cached features in bytes, defaults to 64 MiB
+        :type max_bytes: int, optional
+        """
+        self.model = model
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._stats = CacheStats()
+        super().__init__()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counters as well as the current size of the cache."""
+        self._stats.entries = len(self._entries)
+        self._stats.size_bytes = self._size
+        return self._stats
+
+    def key(self, signals: NDArray, timestamps: NDArray,
+            channel_names: List[str], sample_rate: int) -> bytes:
+        """Returns the key of the features of an event.
+
+        :param signals: Signals of the event of shape (channels, samples).
+        :type signals: NDArray
+        :param timestamps: Timestamps of the event.
+        :type timestamps: NDArray
+        :param channel_names: Channel names of the event.
+        :type channel_names: List[str]
+        :param sample_rate: Sample rate of the event.
+        :type sample_rate: int
+        :return: Digest identifying the features.
+        :rtype: bytes
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((str(self.model), list(channel_names),
+                 sample_rate)).encode())
+        h.update(np.ascontiguousarray(timestamps, dtype=np.float64).tobytes())
+        h.update(np.ascontiguousarray(signals, dtype=np.float64).tobytes())
+        return h.digest()
+
+    def extract_features(self, ev: EventContainer) -> NDArray:
+        """Extract features from an EventContainer, or return the cached features of an equal event.
+
+        :param ev: EventContainer to extract features from.
+        :type ev: EventContainer
+        :return: Features as a numpy array.
+        :rtype: NDArray
+        """
+        key = self.key(np.asarray(ev.signals), ev.timestamps,
+                       ev.channel_names, ev.sample_rate)
+        features = self.__lookup(key)
+        if features is None:
+            features = self.__store(key, self.model.extract_features(ev))
+        return features.copy()
+
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features of events not in the cache are extracted by the
+        wrapped model in one batch.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, features).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        if isinstance(epochs, EpochBatch):
+            timestamps = [batch.timestamps] * len(batch)
+        else:
+            timestamps = [e.timestamps for e in epochs]
+        keys = [self.key(e, t, batch.channel_names, batch.sample_rate)
+                for e, t in zip(batch.signals, timestamps)]
+        features = [self.__lookup(k) for k in keys]
+
+        misses = [i for i, f in enumerate(features) if f is None]
+        if misses:
+            if isinstance(epochs, EpochBatch):
+                missing = EpochBatch(batch.signals[misses], batch.channel_names,
+                                     batch.sample_rate, batch.timestamps)
+            else:
+                missing = [epochs[i] for i in misses]
+            extracted = self.model.extract_batch(missing)
+            for i, f in zip(misses, extracted):
+                features[i] = self.__store(keys[i], f)
+
+        return np.stack(features)
+
+    def clear(self):
+        """Remove all entries from the cache.
+        """
+        self._entries.clear()
+        self._size = 0
+
+    def __lookup(self, key: bytes) -> Optional[NDArray]:
+        features = self._entries.get(key)
+        if features is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        self._entries.move_to_end(key)
+        return features
+
+    def __store(self, key: bytes, features: NDArray) -> NDArray:
+        features = np.array(features)
+        self._entries[key] = features
+        self._size += features.nbytes
+        self.__evict()
+        return features
+
+    def __evict(self):
+        """Remove least recently used entries until the cache fits into max_bytes.
+        """
+        while self._entries and self._size > self.max_bytes:
+            _, features = self._entries.popitem(last=False)
+            self._size -= features.nbytes
+            self._stats.evictions += 1
+
+    def __str__(self) -> str:
+        return f"CachedModel({self.model}, max_bytes={self.max_bytes})"
+
+
+class FittedModelBase(FeatureExtractionModelBase):
+    def __init__(self, name: str) -> None:
+        """Base class for feature extraction models with a state fitted on events, e.g., on enrollment data. Templates
+        are only comparable if they were created with the same state, so the state should be stored alongside the
+        templates in a TemplateDatabase.
+
+        :param name: Name the state is stored under in a TemplateDatabase.
+        :type name: str
+        """
+        self.name = name
+        super().__init__()
+
+    @property
+    @abstractmethod
+    def fitted(self) -> bool:
+        """True if the model was fitted."""
+        pass
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the fitted state. Subclasses include it in __str__, so a CachedModel does not return features
+        extracted with a previous state. Subclasses may override it with a cheaper digest of their state.
+        """
+        state = json.dumps(self.get_state(), sort_keys=True).encode()
+        return hashlib.blake2b(state, digest_size=8).hexdigest()
+
+    @staticmethod
+    def digest(*values: Any) -> str:
+        """Returns a short digest of numbers and arrays, e.g., to compute a fingerprint.
+
+        :return: Hexadecimal digest.
+        :rtype: str
+        """
+        h = hashlib.blake2b(digest_size=8)
+        for value in values:
+            if value is not None:
+                h.update(np.ascontiguousarray(value, dtype=np.float64).tobytes())
+            h.update(b"|")
+        return h.hexdigest()
+
+    @abstractmethod
+    def partial_fit(self, epochs: Union[List[EventContainer], EpochBatch]) -> "FittedModelBase":
+        """Update the state of the model with several events.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Self.
+        :rtype: FittedModelBase
+        """
+        pass
+
+    @abstractmethod
+    def get_state(self) -> dict:
+        """Returns a JSON serializable representation of the fitted state.
+
+        :return: State of the model.
+        :rtype: dict
+        """
+        pass
+
+    @abstractmethod
+    def set_state(self, state: dict):
+        """Restores the state created by get_state.
+
+        :param state: State of the model.
+        :type state: dict
+        """
+        pass
+
+    def store(self, database) -> None:
+        """Store the state in a TemplateDatabase.
+
+        :param database: Database to store the state in.
+        :type database: TemplateDatabase
+        """
+        database.set_state(self.name, self.get_state())
+
+    def restore(self, database) -> bool:
+        """Restore the state from a TemplateDatabase.
+
+        :param database: Database to restore the state from.
+        :type database: TemplateDatabase
+        :return: True if a state was stored in the database, else False.
+        :rtype: bool
+        """
+        state = database.get_state(self.name)
+        if state is None:
+            return False
+        self.set_state(state)
+        return True
+
+
+class ProjectedModel(FittedModelBase):
+    __slots__ = "model", "projection"
+
+    def __init__(self, model: FeatureExtractionModelBase, n_components: int,
+                 whiten: bool = False, name: str = "projection") -> None:
+        """Wraps a model and projects its features onto their principal components. The projection is fitted
+        incrementally with partial_fit, e.g., on enrollment data, and must be fitted before features are extracted.
+        Templates shrink to n_components values, which reduces storage and the cost of similarity calculation.
+        Templates are only comparable if they were created with the same projection, so the fitted projection should
+        be stored alongside the templates with store.
+
+        :param model: Model whose features are projected.
+        :type model: FeatureExtractionModelBase
+        :param n_components: Number of components to keep.
+        :type n_components: int
+        :param whiten: Scale projections to unit variance, defaults to False
+        :type whiten: bool, optional
+        :param name: Name the projection is stored under in a TemplateDatabase, defaults to "projection"
+        :type name: str, optional
+        """
+        self.model = model
+        self.projection = IncrementalPCA(n_components, whiten)
+        super().__init__(name)
+
+    @property
+    def fitted(self) -> bool:
+        """True if the projection was fitted."""
+        return self.projection.fitted
+
+    def partial_fit(self, epochs: Union[List[EventContainer], EpochBatch]) -> "ProjectedModel":
+        """Update the projection with the features of several events.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Self.
+        :rtype: ProjectedModel
+        """
+        features = self.model.extract_batch(epochs)
+        self.projection.partial_fit(features.reshape(len(features), -1))
+        return self
+
+    def extract_features(self, ev: EventContainer) -> NDArray:
+        """Extract features from an EventContainer and project them.
+
+        :param ev: EventContainer to extract features from.
+        :type ev: EventContainer
+        :return: Projected features as a numpy array.
+        :rtype: NDArray
+        """
+        return self.projection.transform(np.ravel(self.model.extract_features(ev)))
+
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once and project them.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Projected features of shape (epochs, components).
+        :rtype: NDArray
+        """
+        features = self.model.extract_batch(epochs)
+        return self.projection.transform(features.reshape(len(features), -1))
+
+    def get_state(self) -> dict:
+        """Returns a JSON serializable representation of the projection.
+
+        :return: State of the projection.
+        :rtype: dict
+        """
+        return self.projection.to_dict()
+
+    def set_state(self, state: dict):
+        """Restores a projection created by get_state.
+
+        :param state: State of the projection.
+        :type state: dict
+        """
+        self.projection = IncrementalPCA.from_dict(state)
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the fitted projection."""
+        p = self.projection
+        return self.digest(p.n_samples_seen, p.mean, p.components, p.singular_values)
+
+    def __str__(self) -> str:
+        return f"ProjectedModel({self.model}, n_components={self.projection.n_components}, " \
+            f"whiten={self.projection.whiten}, state={self.fingerprint})"
+
+
+class SlidingBandpower():
+    __slots__ = "sample_rate", "window", "step", "bands", "_bins", "_weights", "_use_fft", "_history", "_next_end"
+
+    # Relative cost of one bin of the sliding DFT per sample compared to one FFT operation per window sample
+    SLIDING_DFT_COST = 32
+    # Number of windows apply passes to process at once, which bounds the memory of both methods
+    CHUNK_WINDOWS = 256
+
+    def __init__(self, sample_rate: int, window_s: float = 1, step_s: float = 0.25,
+                 bands: Optional[List[Band]] = None) -> None:
+        """Band power of overlapping windows of a continuous stream, e.g., for continuous authentication without events.
+        Features equal BandpowerModel applied to each window. For small steps only the DFT bins inside the bands are
+        computed, using a sliding DFT: every bin is a running sum of the demodulated signal, so each window costs a
+        difference of two cumulative sums and the cost per window depends on the step, not on the overlap. For larger
+        steps, the FFT of each strided window is cheaper. The last window - 1 samples are kept between calls, so chunks
+        of a stream can be passed in order.
+
+        :param sample_rate: Sample rate of the stream.
+        :type sample_rate: int
+        :param window_s: Length of each window in seconds, defaults to 1
+        :type window_s: float, optional
+        :param step_s: Distance between the starts of consecutive windows in seconds, defaults to 0.25
+        :type step_s: float, optional
+        :param bands: Bands as (low, high) or (low, high, include_low). If None, alpha and beta bands are used. defaults to None
+        :type bands: Optional[List[Band]], optional
+        """
+        self.sample_rate = sample_rate
+        self.window = round(window_s * sample_rate)
+        self.step = max(1, round(step_s * sample_rate))
+        self.bands = tuple(bands) if bands is not None else (
+            (10, 13), (13, 30))
+
+        weights = band_plan(self.window, self.window // 2,
+                            sample_rate, self.bands).weights
+        self._bins = np.flatnonzero(np.nan_to_num(weights).any(axis=1))
+        self._weights = weights[self._bins]
+        self._use_fft = self.step * len(self._bins) * self.SLIDING_DFT_COST > \
+            self.window * np.log2(max(self.window, 2))
+        self.reset()
+
+    def reset(self):
+        """Forget the state of the stream. Must be called before processing a new stream.
+        """
+        self._history = None
+        self._next_end = self.window
+
+    def process(self, signals: NDArray) -> NDArray:
+        """Compute the band power of all windows completed by the next chunk of a stream.
+
+        :param signals: Chunk of signals of shape (channels, samples).
+        :type signals: NDArray
+        :return: Features of shape (windows, bands * channels), ordered like BandpowerModel.
+        :rtype: NDArray
+        """
+        signals = np.asarray(signals, dtype=np.float64)
+        if self._history is not None:
+            signals = np.hstack([self._history, signals])
+        n = signals.shape[-1]
+        ends = np.arange(self._next_end, n + 1, self.step)
+
+        if not len(ends):
+            spectrum = np.zeros((0, len(signals), len(self._bins)))
+        elif self._use_fft:
+            # (channels, windows, samples) view of the strided windows
+            windows = sliding_window_view(signals, self.window, axis=-1)[
+                :, ends[0] - self.window::self.step][:, :len(ends)]
+            spectrum = np.fft.rfft(windows, axis=-1)[..., self._bins].swapaxes(0, 1)
+        else:
+            # Running sums of the signal demodulated to each bin. Phases are relative to the buffer, which only
+            # rotates the DFT of each window and leaves its magnitude unchanged.
+            phase = np.exp(-2j * np.pi * np.outer(self._bins, np.arange(n)) / self.window)
+            sums = np.zeros(signals.shape[:1] + phase.shape[:1] + (n + 1,), dtype=complex)
+            np.cumsum(signals[:, None, :] * phase, axis=-1, out=sums[..., 1:])
+            spectrum = (sums[..., ends] - sums[..., ends - self.window]).transpose(2, 0, 1)
+
+        # (windows, channels, bins) -> (windows, channels, bands)
+        power = 2.0 / self.window * np.abs(spectrum)
+        features = (power @ self._weights).reshape(len(ends),
+                                                   len(signals) * len(self.bands))
+
+        next_end = ends[-1] + self.step if len(ends) else self._next_end
+        keep = min(max(next_end - self.window, 0), n)
+        self._history = signals[:, keep:]
+        self._next_end = next_end - keep
+        return features
+
+    def apply(self, container: AbstractContainer) -> Tuple[NDArray, NDArray]:
+        """Compute the band power of all windows of a recording. The recording is passed to process in chunks of
+        CHUNK_WINDOWS windows, so memory does not grow with its length. The state of the stream is reset before and
+        after.
+
+        :param container: Recording to compute the band power of.
+        :type container: AbstractContainer
+        :return: Features of shape (windows, bands * channels) and the timestamp of the last sample of each window.
+        :rtype: Tuple[NDArray, NDArray]
+        """
+        self.reset()
+        signals = np.asarray(container.signals)
+        chunk = self.CHUNK_WINDOWS * self.step
+        features = [np.zeros((0, len(signals) * len(self.bands)))]
+        features += [self.process(signals[:, i:i + chunk])
+                     for i in range(0, signals.shape[-1], chunk)]
+        features = np.vstack(features)
+        self.reset()
+        ends = np.arange(len(features)) * self.step + self.window - 1
+        return features, np.asarray(container.timestamps)[ends]
+
+    def __str__(self) -> str:
+        return f"SlidingBandpower(window={self.window}, step={self.step}, bands={list(self.bands)})"
+
+
+class TangentSpaceModel(FittedModelBase):
+    __slots__ = "shrinkage", "_log_sum", "_n_samples_seen", "_whitening"
+
+    def __init__(self, shrinkage: float = 0.01, name: str = "tangent_space") -> None:
+        """Model that extracts spatial features from the channel covariance of each event. Covariance matrices are
+        projected onto the tangent space at a reference covariance and vectorized, so euclidean distances between
+        features approximate the Riemannian distance between covariances. The reference is the log-Euclidean mean of
+        all covariances passed to partial_fit, e.g., during enrollment, and is updated incrementally. All matrix
+        functions are computed for all events at once through eigendecomposition.
+
+        :param shrinkage: Shrinkage of each covariance towards a scaled identity, defaults to 0.01
+        :type shrinkage: float, optional
+        :param name: Name the reference is stored under in a TemplateDatabase, defaults to "tangent_space"
+        :type name: str, optional
+        """
+        self.shrinkage = shrinkage
+        self._log_sum: Optional[NDArray] = None
+        self._n_samples_seen = 0
+        self._whitening: Optional[NDArray] = None
+        super().__init__(name)
+
+    @property
+    def fitted(self) -> bool:
+        """True if the reference was fitted."""
+        return self._n_samples_seen > 0
+
+    @property
+    def reference(self) -> NDArray:
+        """Log-Euclidean mean of all fitted covariances."""
+        return spd_apply(self._log_sum / self._n_samples_seen, np.exp)
+
+    def covariances(self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Returns the shrunk channel covariance of each event.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Covariance matrices of shape (epochs, channels, channels).
+        :rtype: NDArray
+        """
+        batch = EpochBatch.create(epochs)
+        return batch.cached(("covariance", self.shrinkage),
+                            lambda: covariance(batch.signals, self.shrinkage))
+
+    def partial_fit(self, epochs: Union[List[EventContainer], EpochBatch]) -> "TangentSpaceModel":
+        """Update the reference with the covariances of several events.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Self.
+        :rtype: TangentSpaceModel
+        """
+        logs = spd_apply(self.covariances(epochs), np.log, EIGENVALUE_FLOOR)
+        if self._log_sum is None:
+            self._log_sum = np.zeros(logs.shape[1:])
+        self._log_sum += logs.sum(axis=0)
+        self._n_samples_seen += len(logs)
+        self._whitening = None
+        return self
+
+    def extract_features(self, ev: EventContainer) -> NDArray:
+        """Extract features from an EventContainer. Features are: upper triangle of the tangent vector of the covariance.
+
+        :param ev: EventContainer to extract features from.
+        :type ev: EventContainer
+        :return: Features as a numpy array.
+        :rtype: NDArray
+        """
+        return self.extract_batch([ev])[0]
+
+    def extract_batch(
+            self, epochs: Union[List[EventContainer], EpochBatch]) -> NDArray:
+        """Extract features from several events at once. Features are: upper triangle of the tangent vector of each
+        covariance.
+
+        :param epochs: Events of equal shape or batch of events.
+        :type epochs: Union[List[EventContainer], EpochBatch]
+        :return: Features of shape (epochs, channels * (channels + 1) / 2).
+        :rtype: NDArray
+        """
+        assert self.fitted, "Reference was not fitted."
+        if self._whitening is None:
+            self._whitening = spd_apply(
+                self.reference, lambda w: w**-0.5, EIGENVALUE_FLOOR)
+
+        cov = self.covariances(epochs)
+        whitened = self._whitening @ cov @ self._whitening
+        return upper_triangle(spd_apply(whitened, np.log, EIGENVALUE_FLOOR))
+
+    def get_state(self) -> dict:
+        """Returns a JSON serializable representation of the reference.
+
+        :return: State of the reference.
+        :rtype: dict
+        """
+        state = {"shrinkage": self.shrinkage,
+                 "n_samples_seen": self._n_samples_seen}
+        if self.fitted:
+            state["log_sum"] = self._log_sum.tolist()
+        return state
+
+    def set_state(self, state: dict):
+        """Restores a reference created by get_state.
+
+        :param state: State of the reference.
+        :type state: dict
+        """
+        self.shrinkage = state["shrinkage"]
+        self._n_samples_seen = state["n_samples_seen"]
+        self._log_sum = np.array(state["log_sum"]) if "log_sum" in state else None
+        self._whitening = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the fitted reference."""
+        return self.digest(self._n_samples_seen, self._log_sum)
+
+    def __str__(self) -> str:
+        return f"TangentSpaceModel(shrinkage={self.shrinkage}, state={self.fingerprint})"
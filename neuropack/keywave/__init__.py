@@ -4,15 +4,16 @@ from typing import Callable, List, Optional, Tuple, Union
 import numpy as np
 from numpy.typing import NDArray
 
-from ..containers import EEGContainer, EventContainer
+from ..containers import EEGContainer, EventContainer, IngestionStage
 from ..devices.base import DeviceBase
 from ..feature_extraction import *
-from ..preprocessing import PreprocessingPipeline
+from ..preprocessing import (ComponentPipeline, PreprocessingPipeline,
+                             StreamingPipeline)
 from ..tasks.base import PersistentTaskBase
 from ..utils import osum
 from ..utils.logging import AuthLogger
 from .auth_exception import AuthException
-from .operation_modes import SimilarityMode, TemplateMode
+from .operation_modes import PreprocessingMode, SimilarityMode, TemplateMode
 from .template_database import TemplateDatabase
 
 
@@ -31,7 +32,12 @@ class KeyWave():
                  before_event_time_ms: int = 200,
                  after_event_time_ms: int = 800,
                  template_mode: TemplateMode = TemplateMode.AverageTemplate,
-                 similarity_mode: SimilarityMode = SimilarityMode.AverageSimilarity) -> None:
+                 similarity_mode: SimilarityMode = SimilarityMode.AverageSimilarity,
+                 ingestion_stage: Optional[IngestionStage] = None,
+                 clock_sync: bool = False,
+                 streaming_pipeline: Optional[StreamingPipeline] = None,
+                 preprocessing_mode: PreprocessingMode = PreprocessingMode.Epochs,
+                 component_pipeline: Optional[ComponentPipeline] = None) -> None:
         """Constructor for KeyWave verification system. A prototype brainwave-based verification system based on ERPs.
         KeyWave supports a continuous authentication mode, in which a person is first authenticated or identified using their brainwaves.
         Following this, the person's BCI is effectively transformed into a hardware token that continuously proves the user's identity.
@@ -61,6 +67,16 @@ class KeyWave():
         :type template_mode: TemplateMode, optional
         :param similarity_mode: Similarity mode for multiple samples defaults to SimilarityMode.AverageSimilarity
         :type similarity_mode: SimilarityMode, optional
+        :param ingestion_stage: Stage repairing gaps and duplicate samples while recording. Events overlapping unrepairable gaps are rejected. defaults to None
+        :type ingestion_stage: Optional[IngestionStage], optional
+        :param clock_sync: If true, stimulus times are corrected for clock offset and drift between host and device before epoching. defaults to False
+        :type clock_sync: bool, optional
+        :param streaming_pipeline: Causal filters applied to every chunk while recording, so data is already filtered once the task ends. Filters are designed for the sample rate of the device. Leading linear filters of the preprocessing pipeline covered by the streaming pipeline are not applied again, remaining filters are applied to the extracted events afterwards. Covered filters are replaced by their causal counterparts, which delay the signals and attenuate less than the zero-phase offline filters, so templates enrolled without the streaming pipeline do not match probes recorded with it and vice versa. defaults to None
+        :type streaming_pipeline: Optional[StreamingPipeline], optional
+        :param preprocessing_mode: If set to PreprocessingMode.Continuous, the leading linear filters of the preprocessing pipeline are applied to the continuous recording once before events are extracted. Remaining filters are applied to each event. defaults to PreprocessingMode.Epochs
+        :type preprocessing_mode: PreprocessingMode, optional
+        :param component_pipeline: Components checked on all preprocessed events at once. Rejected events are dropped before templates are created. defaults to None
+        :type component_pipeline: Optional[ComponentPipeline], optional
         """
         assert isinstance(device, DeviceBase)
         assert isinstance(preprocessing_pipeline, PreprocessingPipeline)
@@ -75,12 +91,22 @@ class KeyWave():
         self.similarity_metric = similarity_metric
         self.default_threshold = default_threshold
         self.logger = AuthLogger(logging_directory)
+        self.metrics_logging = False
         self.last_auth = 0
         self.last_id = None
         self.before_event_time_ms = before_event_time_ms
         self.after_event_time_ms = after_event_time_ms
         self.template_mode = template_mode
         self.similarity_mode = similarity_mode
+        self.ingestion_stage = ingestion_stage
+        self.clock_sync = clock_sync
+        self.streaming_pipeline = streaming_pipeline
+        self.preprocessing_mode = preprocessing_mode
+        self.component_pipeline = component_pipeline
+
+        # Templates in the database were created with the stored model state
+        if isinstance(feature_extraction, FittedModelBase):
+            feature_extraction.restore(database)
 
     def reset(self):
         """Resets system to initial state. Should be done if continuous authentication is being used.
@@ -88,14 +114,21 @@ class KeyWave():
         self.last_id = None
         self.last_auth = 0
 
-    def configure_logging(self, event_logging: bool, file_logging: bool):
+    def configure_logging(
+            self,
+            event_logging: bool,
+            file_logging: bool,
+            metrics_logging: bool = False):
         """Configure logging behavior for authentication system.
 
         :param event_logging: If set to true, system performs logging. Else not.
         :type event_logging: bool
         :param file_logging: If true, system logs recorded data to file. Else not.
         :type file_logging: bool
+        :param metrics_logging: If true, system logs the device's throughput and health counters after each recording. defaults to False
+        :type metrics_logging: bool, optional
         """
+        self.metrics_logging = metrics_logging
         if event_logging:
             self.logger.start_logging()
         else:
@@ -184,10 +217,6 @@ class KeyWave():
             self.logger.log_fail(f"Authentication failed \"{e.args}\".")
             return False
 
-        # Apply preprocessing
-        self.preprocessing_pipeline.apply(events)
-        self.logger.log_info(f"Applying {self.preprocessing_pipeline}")
-
         # Create templates
         templates = self.__create_templates(events, template_mode)
 
@@ -278,10 +307,6 @@ class KeyWave():
             self.logger.log_fail(f"Identification failed \"{e.args}\".")
             return False, None
 
-        # Apply preprocessing
-        self.preprocessing_pipeline.apply(events)
-        self.logger.log_info(f"Applying {self.preprocessing_pipeline}")
-
         # Create templates
         templates = self.__create_templates(events, template_mode)
 
@@ -345,9 +370,16 @@ class KeyWave():
             self.logger.log_fail(f"Enrollment failed \"{e.args}\".")
             return False
 
-        # Apply preprocessing to recorded events
-        self.preprocessing_pipeline.apply(events)
-        self.logger.log_info(f"Applying {self.preprocessing_pipeline}")
+        # Fit model on first enrollment and store its state alongside the templates
+        if isinstance(self.feature_extraction, FittedModelBase) and not self.feature_extraction.fitted:
+            try:
+                self.feature_extraction.partial_fit(events)
+            except AssertionError as e:
+                self.logger.log_fail(f"Enrollment failed \"{e.args}\".")
+                return False
+            self.feature_extraction.store(self.database)
+            self.logger.log_info(
+                f"Fitted {self.feature_extraction} on enrollment events")
 
         # Add templates to database
         for t in self.__create_templates(events, enrollment_mode):
@@ -404,8 +436,7 @@ class KeyWave():
         if mode in [
                 TemplateMode.SingleTemplates,
                 TemplateMode.AverageAndSingleTemplates]:
-            for e in events:
-                templates.append(self.feature_extraction.extract_features(e))
+            templates.extend(self.feature_extraction.extract_batch(events))
 
         return templates
 
@@ -415,7 +446,7 @@ class KeyWave():
         :param timeout_s: Length of acquisition task.
         :type timeout_s: float
         :raises AuthException: Raises exceptions if anything goes wrong during recording.
-        :return: All events (ERPs) recorded during acquisition task.
+        :return: All events (ERPs) recorded during acquisition task, preprocessed according to the preprocessing mode.
         :rtype: List[EventContainer]
         """
         self.logger.log_info("Starting Task")
@@ -424,6 +455,11 @@ class KeyWave():
             self.device.channel_names,
             self.device.sample_rate)
         stimuli_times = []
+        if self.ingestion_stage:
+            self.ingestion_stage.reset()
+        if self.streaming_pipeline:
+            self.streaming_pipeline.configure(self.device.sample_rate)
+            self.streaming_pipeline.reset()
 
         start = time()
         self.device.start_stream()
@@ -443,7 +479,15 @@ class KeyWave():
 
             # Fetch data from device
             if self.device.has_data():
-                eeg_container.add_data(self.device.fetch_data())
+                chunk = self.device.fetch_chunk()
+                spans = []
+                if self.ingestion_stage:
+                    chunk, spans = self.ingestion_stage.process(chunk)
+                if self.streaming_pipeline:
+                    chunk = self.streaming_pipeline.apply(chunk)
+                eeg_container.add_chunk(chunk)
+                for span_start, span_end in spans:
+                    eeg_container.mark_invalid(span_start, span_end)
 
         # We are done getting data for given time frame
         self.device.stop_stream()
@@ -458,6 +502,37 @@ class KeyWave():
                 stimuli_times.append(t.timestamp)
         self.task.stop()
 
+        # Map stimulus times from host clock onto device time base
+        if self.clock_sync:
+            stimuli_times = [self.device.to_device_time(
+                t) for t in stimuli_times]
+            self.logger.log_info(
+                "Corrected stimulus times for clock offset and drift")
+
+        # Log recording before it is filtered in continuous mode. If a streaming
+        # pipeline is used, it was already filtered causally while recording.
+        self.logger.log_recording(eeg_container)
+
+        # Linear filters already applied while recording are not applied
+        # again. Filter continuous recording once with the remaining leading
+        # linear filters. Non-linear filters are left to be applied to each
+        # event.
+        pipeline = self.preprocessing_pipeline
+        if self.streaming_pipeline:
+            skipped = pipeline.skipped_linear(self.streaming_pipeline.covered)
+            if skipped:
+                self.logger.log_info(
+                    f"Skipping {', '.join(str(f) for f in skipped)}, "
+                    f"applied causally by {self.streaming_pipeline}")
+            pipeline = pipeline.skip_linear(self.streaming_pipeline.covered)
+        if self.preprocessing_mode == PreprocessingMode.Continuous:
+            plan = pipeline.get_plan()
+            pipeline = pipeline.apply_continuous(eeg_container)
+            applied = plan[:len(plan) - len(pipeline.filters)]
+            if applied:
+                self.logger.log_info(
+                    f"Applied {', '.join(str(f) for f in applied)} to continuous recording")
+
         # Fetch all recorded events. Remove events until all events are of same
         # length.
         events = []
@@ -467,6 +542,10 @@ class KeyWave():
         events = eeg_container.get_events(
             1, self.before_event_time_ms, self.after_event_time_ms)
 
+        # Events overlapping invalid spans are rejected, possibly leaving none
+        if not events:
+            raise AuthException("No valid events recorded")
+
         # Events can possibly be shorter than needed. Remove events which do not have
         # enough data points.
         while len(events[0]) != len(events[-1]):
@@ -478,11 +557,30 @@ class KeyWave():
         self.logger.log_info("Recorded " +
                              str(len(eeg_container.timestamps)) +
                              " timestamps")
+        if self.ingestion_stage:
+            self.logger.log_info(
+                f"Dropped {self.ingestion_stage.dropped_samples} duplicate samples, filled {self.ingestion_stage.filled_samples} missing samples, and marked {self.ingestion_stage.invalid_spans} invalid spans")
+        if self.streaming_pipeline:
+            self.logger.log_info(f"Applied {self.streaming_pipeline} while recording")
         self.logger.log_info(
             "Recorded " + str(len(events)) + " events")
-        self.logger.log_recording(eeg_container)
+        if self.metrics_logging:
+            self.logger.log_metrics(self.device.get_metrics())
         self.logger.log_info("Task finished")
 
+        # Apply preprocessing to recorded events
+        pipeline.apply(events)
+        self.logger.log_info(f"Applying {pipeline}")
+
+        # Drop events containing artifacts
+        if self.component_pipeline:
+            keep, counts = self.component_pipeline.check_batch(events)
+            events = [e for e, k in zip(events, keep) if k]
+            self.logger.log_info(
+                f"Rejected {len(keep) - len(events)} events {counts}")
+            if not events:
+                raise AuthException("All events were rejected")
+
         # Return all events
         return events
 
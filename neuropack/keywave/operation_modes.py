@@ -12,3 +12,9 @@ class SimilarityMode(Enum):
     """Enum for similarity mode. Used to determine how similarity is calculated."""
     BestSimilarity = 1
     AverageSimilarity = 2
+
+
+class PreprocessingMode(Enum):
+    """Enum for preprocessing mode. Used to determine whether filters are applied to each event or to the continuous recording."""
+    Epochs = 1
+    Continuous = 2
@@ -1,11 +1,14 @@
 from json import dump, dumps, loads
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 from numpy.typing import NDArray
 
 
 class TemplateDatabase():
+    # Reserved key of the JSON representation under which model states are stored
+    STATE_KEY = "__state__"
+
     @classmethod
     def construct_from_dict(cls, data: dict[str, List[NDArray]]):
         """Construct a TemplateDatabase instance from a dictionary of templates.
@@ -37,6 +40,7 @@ class TemplateDatabase():
         """
         d = loads(data)
         instance = cls()
+        instance.states = d.pop(cls.STATE_KEY, dict())
         for k, v in d.items():
             assert isinstance(k, str)
             assert isinstance(v, List)
@@ -48,6 +52,7 @@ class TemplateDatabase():
         """Constructor.
         """
         self.internal_data = dict()
+        self.states = dict()
 
     def get_templates(
             self, id: str) -> Tuple[bool, Union[List[NDArray], None]]:
@@ -71,11 +76,32 @@ class TemplateDatabase():
         :param template: Template to add.
         :type template: NDArray
         """
+        assert id != self.STATE_KEY, f"Id \"{id}\" is reserved."
         if id not in self.internal_data:
             self.internal_data[id] = []
 
         self.internal_data[id].append(template)
 
+    def get_state(self, name: str) -> Optional[dict]:
+        """Get the stored state of a model, e.g., a fitted projection templates were created with.
+
+        :param name: Name the state was stored under.
+        :type name: str
+        :return: State or None if no state was stored under that name.
+        :rtype: Optional[dict]
+        """
+        return self.states.get(name)
+
+    def set_state(self, name: str, state: dict) -> None:
+        """Store the state of a model alongside the templates. States must be JSON serializable.
+
+        :param name: Name to store the state under.
+        :type name: str
+        :param state: State to store.
+        :type state: dict
+        """
+        self.states[name] = state
+
     def get_all_idents(self) -> List[str]:
         """Get a list of all identities in the database."""
         return list(self.internal_data.keys())
@@ -98,23 +124,28 @@ class TemplateDatabase():
         if not path.endswith("json"):
             path += ".json"
 
-        # Make database serializable
-        s_data = {k: [a.tolist() for a in v]
-                  for (k, v) in self.internal_data.items()}
-
         out_file = open(path, "w")
-        dump(s_data, out_file)
+        dump(self.__serializable(), out_file)
 
     def to_json(self):
         """Get json representation of database."""
+        return dumps(self.__serializable())
+
+    def __serializable(self) -> dict:
+        """Make database serializable."""
         s_data = {k: [a.tolist() for a in v]
                   for (k, v) in self.internal_data.items()}
-        return dumps(s_data)
+        if self.states:
+            s_data[self.STATE_KEY] = self.states
+        return s_data
 
     def __eq__(self, other: object) -> bool:
         if len(self.internal_data) != len(other.internal_data):
             return False
 
+        if self.states != other.states:
+            return False
+
         for k, v in self.internal_data.items():
             if k not in other.internal_data:
                 return False
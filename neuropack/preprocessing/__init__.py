@@ -1,4 +1,6 @@
+from .cache import PreprocessingCache
 from .component_pipeline import ComponentPipeline, ComponentType
 from .filters import *
 from .preprocessing_pipeline import PreprocessingPipeline
 from .signal_components import *
+from .streaming import *
@@ -0,0 +1,171 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import List, Union
+
+import numpy as np
+
+from ..containers import AbstractContainer
+from ..utils.cache_stats import CacheStats
+from .filters import signal_array, store_signal_array
+from .preprocessing_pipeline import PreprocessingPipeline
+
+
+class PreprocessingCache():
+    def __init__(self, directory: str, max_bytes: int = 1 << 30) -> None:
+        """On-disk cache for preprocessing results. Entries are addressed by a hash of a container's data, i.e., signals,
+        timestamps, channel names and sample rate, together with the filters applied by the pipeline. Results are stored
+        as uncompressed .npz files. Once the cache grows beyond max_bytes, least recently used entries are removed.
+        Entries already present in the directory are picked up, so the cache persists between sessions.
+
+        :param directory: Directory to store entries in. Created if it does not exist.
+        :type directory: str
+        :param max_bytes: Maximum size of all entries in bytes, defaults to 1 GiB
+        :type max_bytes: int, optional
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._stats = CacheStats()
+        self._entries = OrderedDict()
+
+        os.makedirs(directory, exist_ok=True)
+        files = [f for f in os.listdir(directory) if f.endswith(".npz")]
+        files.sort(key=lambda f: os.path.getmtime(os.path.join(directory, f)))
+        for f in files:
+            self._entries[f[:-4]] = os.path.getsize(
+                os.path.join(directory, f))
+        self.__evict()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counters as well as the current size of the cache."""
+        self._stats.entries = len(self._entries)
+        self._stats.size_bytes = sum(self._entries.values())
+        return self._stats
+
+    def key(self, pipeline: PreprocessingPipeline,
+            container: AbstractContainer) -> str:
+        """Returns the key of the result of applying a pipeline to a container.
+
+        :param pipeline: Pipeline to apply.
+        :type pipeline: PreprocessingPipeline
+        :param container: Container to apply the pipeline to.
+        :type container: AbstractContainer
+        :return: Hex digest identifying the result.
+        :rtype: str
+        """
+        h = hashlib.sha256()
+        plan = ", ".join([str(f) for f in pipeline.get_plan()])
+        h.update(f"{type(container).__name__}({plan})".encode())
+        h.update(repr((list(container.channel_names),
+                 container.sample_rate)).encode())
+        h.update(np.ascontiguousarray(
+            container.timestamps, dtype=np.float64).tobytes())
+        h.update(np.ascontiguousarray(
+            signal_array(container)).tobytes())
+        return h.hexdigest()
+
+    def apply(self,
+              pipeline: PreprocessingPipeline,
+              container: Union[AbstractContainer, List[AbstractContainer]]):
+        """Apply a pipeline to a container or a list of containers like PreprocessingPipeline.apply. Results of previous
+        runs are loaded from disk, all other containers are preprocessed together and their results are stored.
+
+        :param pipeline: Pipeline to apply.
+        :type pipeline: PreprocessingPipeline
+        :param container: Container or list of containers to apply the pipeline to.
+        :type container: Union[AbstractContainer, List[AbstractContainer]]
+        """
+        if not isinstance(container, list):
+            container = [container]
+
+        misses = []
+        for co in container:
+            key = self.key(pipeline, co)
+            if self.__load(key, co):
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+                misses.append((key, co))
+
+        if not misses:
+            return
+
+        pipeline.apply([co for _, co in misses])
+        for key, co in misses:
+            self.__store(key, co)
+        self.__evict()
+
+    def clear(self):
+        """Remove all entries from the cache.
+        """
+        for key in list(self._entries):
+            self.__remove(key)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def __load(self, key: str, container: AbstractContainer) -> bool:
+        """Load a stored result into a container.
+
+        :return: True if the entry existed, False otherwise.
+        :rtype: bool
+        """
+        if key not in self._entries:
+            return False
+        try:
+            with np.load(self.__path(key), allow_pickle=False) as entry:
+                signals = entry["signals"]
+                timestamps = entry["timestamps"]
+                channel_names = entry["channel_names"].tolist()
+                sample_rate = entry["sample_rate"].item()
+        except (OSError, KeyError, ValueError):
+            self.__remove(key)
+            return False
+
+        store_signal_array(container, signals)
+        if isinstance(container.timestamps, list):
+            timestamps = timestamps.tolist()
+        container.timestamps = timestamps
+        container.channel_names = channel_names
+        container.sample_rate = sample_rate
+
+        self._entries.move_to_end(key)
+        os.utime(self.__path(key))
+        return True
+
+    def __store(self, key: str, container: AbstractContainer):
+        """Store the preprocessed state of a container.
+        """
+        path = self.__path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f,
+                     signals=signal_array(container),
+                     timestamps=np.asarray(
+                         container.timestamps, dtype=np.float64),
+                     channel_names=np.array(container.channel_names, dtype=str),
+                     sample_rate=np.array(container.sample_rate))
+        os.replace(tmp, path)
+        self._entries[key] = os.path.getsize(path)
+        self._entries.move_to_end(key)
+
+    def __remove(self, key: str):
+        self._entries.pop(key, None)
+        try:
+            os.remove(self.__path(key))
+        except FileNotFoundError:
+            pass
+
+    def __evict(self):
+        """Remove least recently used entries until the cache fits into max_bytes.
+        """
+        size = sum(self._entries.values())
+        while self._entries and size > self.max_bytes:
+            key, entry_size = next(iter(self._entries.items()))
+            self.__remove(key)
+            size -= entry_size
+            self._stats.evictions += 1
+
+    def __str__(self) -> str:
+        return f"PreprocessingCache(directory={self.directory}, max_bytes={self.max_bytes})"
@@ -1,7 +1,11 @@
 from enum import Enum
+from typing import Dict, List, Tuple
 
-from ..containers import EventContainer
-from .signal_components import SignalComponentBase
+import numpy as np
+from numpy.typing import NDArray
+
+from ..containers import EventContainer, stack_signals
+from .signal_components import ArrayComponentBase, SignalComponentBase
 
 
 class ComponentType(Enum):
@@ -50,3 +54,39 @@ class ComponentPipeline():
                 return False
 
         return True
+
+    def check_batch(self, events: List[EventContainer]
+                    ) -> Tuple[NDArray, Dict[str, int]]:
+        """Check several events at once. Events of equal shape are stacked once and passed to all ArrayComponents, other
+        components check each event separately.
+
+        :param events: Events to check.
+        :type events: List[EventContainer]
+        :return: Boolean mask, True for every event to keep, and the number of events rejected by each component,
+            keyed by its string representation, which includes the checked channels. Missing desired components are
+            counted as "missing <component>". An event can be rejected by several components.
+        :rtype: Tuple[NDArray, Dict[str, int]]
+        """
+        signals = None
+        if len(events) and len({np.shape(e.signals) for e in events}) == 1:
+            signals = stack_signals(events)
+
+        def find(component):
+            if signals is not None and isinstance(
+                    component, ArrayComponentBase):
+                return component.find_array(signals, events[0].channel_names)
+            return component.find_batch(events)
+
+        keep = np.ones(len(events), dtype=bool)
+        counts = {}
+        for des in self.desired_components:
+            rejected = ~find(des)
+            counts[f"missing {des}"] = int(rejected.sum())
+            keep &= ~rejected
+
+        for des in self.undesired_components:
+            rejected = find(des)
+            counts[str(des)] = int(rejected.sum())
+            keep &= ~rejected
+
+        return keep, counts
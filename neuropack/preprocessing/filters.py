@@ -1,12 +1,117 @@
-from abc import ABC, abstractclassmethod
-from typing import Any, Union
+from abc import ABC, abstractclassmethod, abstractmethod
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Union
 
 import numpy as np
-from scipy.signal import butter, detrend, filtfilt, iirnotch, sosfiltfilt
+from numpy.typing import NDArray
+from scipy.signal import (butter, decimate, detrend, filtfilt, iirnotch,
+                          resample_poly, sosfilt, sosfiltfilt, tf2sos)
 
 from ..containers import AbstractContainer, EventContainer
 
 
+# Sample rate filters are designed for by .sos, .b and .a if they were created without a sample rate
+DEFAULT_SAMPLE_RATE = 256
+
+
+@lru_cache(maxsize=None)
+def design_butter(order: int, cutoff: float, btype: str,
+                  sample_rate: float) -> NDArray:
+    """Designs a digital Butterworth filter. Designs are memoised, so filters sharing a specification and sample rate
+    share one array of second-order sections, which must not be modified.
+
+    :param order: Order of the filter.
+    :type order: int
+    :param cutoff: Cutoff frequency.
+    :type cutoff: float
+    :param btype: Type of the filter, e.g., "high" or "low".
+    :type btype: str
+    :param sample_rate: Sample rate of the signals to filter.
+    :type sample_rate: float
+    :return: Second-order sections of shape (sections, 6).
+    :rtype: NDArray
+    """
+    return butter(order, cutoff, btype, fs=sample_rate,
+                  analog=False, output="sos")
+
+
+@lru_cache(maxsize=None)
+def design_notch_ba(notch: float, quality_factor: float,
+                    sample_rate: float) -> Tuple[NDArray, NDArray]:
+    """Designs a digital notch filter as transfer function. Designs are memoised, so filters sharing a specification
+    and sample rate share one pair of coefficient arrays, which must not be modified.
+
+    :param notch: Frequency to remove.
+    :type notch: float
+    :param quality_factor: Quality factor of the notch.
+    :type quality_factor: float
+    :param sample_rate: Sample rate of the signals to filter.
+    :type sample_rate: float
+    :return: Numerator and denominator of the transfer function.
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    return iirnotch(notch, quality_factor, sample_rate)
+
+
+@lru_cache(maxsize=None)
+def design_notch(notch: float, quality_factor: float,
+                 sample_rate: float) -> NDArray:
+    """Designs a digital notch filter. Designs are memoised, so filters sharing a specification and sample rate
+    share one array of second-order sections, which must not be modified.
+
+    :param notch: Frequency to remove.
+    :type notch: float
+    :param quality_factor: Quality factor of the notch.
+    :type quality_factor: float
+    :param sample_rate: Sample rate of the signals to filter.
+    :type sample_rate: float
+    :return: Second-order sections of shape (sections, 6).
+    :rtype: NDArray
+    """
+    return tf2sos(*design_notch_ba(notch, quality_factor, sample_rate))
+
+
+def signal_array(data: AbstractContainer) -> NDArray:
+    """Returns the signals of a container as one array of shape (channels, samples).
+
+    :param data: Container to get signals from.
+    :type data: AbstractContainer
+    :return: Signals as array.
+    :rtype: NDArray
+    """
+    return np.asarray(data.signals, dtype=np.float64)
+
+
+def store_signal_array(data: AbstractContainer, signals: NDArray) -> None:
+    """Replaces the signals of a container with an array of shape (channels, samples). If the container
+    stores its signals as lists, e.g., EEGContainer, the array is converted in a single call.
+
+    :param data: Container to update.
+    :type data: AbstractContainer
+    :param signals: New signals.
+    :type signals: NDArray
+    """
+    if len(data.signals) and isinstance(data.signals[0], list):
+        data.signals = signals.tolist()
+    else:
+        data.signals = list(signals)
+
+
+def store_timestamps(data: AbstractContainer, timestamps: NDArray) -> None:
+    """Replaces the timestamps of a container, keeping them a list if they were stored as list before.
+
+    :param data: Container to update.
+    :type data: AbstractContainer
+    :param timestamps: New timestamps.
+    :type timestamps: NDArray
+    """
+    if isinstance(data.timestamps, list):
+        data.timestamps = timestamps.tolist()
+    else:
+        data.timestamps = timestamps
+
+
 class FilterBase(ABC):
     @abstractclassmethod
     def apply(self, data: AbstractContainer) -> None:
@@ -16,10 +121,50 @@ class FilterBase(ABC):
         self.apply(data)
 
 
-class DetrendFilter(FilterBase):
-    def __init__(self) -> None:
-        """Detrend filter. Removes linear trend from data. Uses scipy.signal.detrend. See https://docs.scipy.org/doc/scipy/reference/generated/scipy.signal.detrend.html for more information."""
-        super().__init__()
+class ArrayFilterBase(FilterBase):
+    """Base class for filters operating on all channels at once. Such filters work on arrays of shape
+    (channels, samples) as well as on batches of shape (epochs, channels, samples), always along the last axis.
+    PreprocessingPipeline stacks equally shaped containers and applies consecutive ArrayFilters to the whole batch.
+    Filters setting uses_timestamps receive the timestamps of the signals as keyword argument timestamps of apply_array,
+    with shape (samples,) or (epochs, samples).
+    """
+    uses_timestamps = False
+
+    @abstractmethod
+    def apply_array(self, signals: NDArray, sample_rate: int) -> NDArray:
+        """Apply the filter to an array of signals along the last axis. The input is not modified.
+
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :return: Filtered signals of the same shape, unless the filter changes the sample rate.
+        :rtype: NDArray
+        """
+        pass
+
+    def output_rate(self, sample_rate: float) -> float:
+        """Returns the sample rate of the filtered signals. Only filters changing the sample rate need to override this.
+
+        :param sample_rate: Sample rate of the signals before filtering.
+        :type sample_rate: float
+        :return: Sample rate of the signals after filtering.
+        :rtype: float
+        """
+        return sample_rate
+
+    def apply_timestamps(self, timestamps: NDArray,
+                         sample_rate: float) -> NDArray:
+        """Returns the timestamps of the filtered signals. Only filters changing the sample rate need to override this.
+
+        :param timestamps: Timestamps before filtering of shape (samples,) or (epochs, samples).
+        :type timestamps: NDArray
+        :param sample_rate: Sample rate of the signals before filtering.
+        :type sample_rate: float
+        :return: Timestamps after filtering.
+        :rtype: NDArray
+        """
+        return timestamps
 
     def apply(self, data: AbstractContainer) -> None:
         """Apply the filter to an AbstractContainer. The filter is applied to all channels in the AbstractContainer. The filter is applied in-place.
@@ -27,155 +172,484 @@ class DetrendFilter(FilterBase):
         :param data: Container to apply the filter to.
         :type data: AbstractContainer
         """
-        for c in data.channel_names:
-            t = detrend(data[c])
-            if isinstance(data[c], list):
-                data[c] = t.tolist()
-            else:
-                data[c] = t
+        sample_rate = data.sample_rate
+        if self.uses_timestamps:
+            signals = self.apply_array(signal_array(data), sample_rate,
+                                       timestamps=np.asarray(data.timestamps, dtype=np.float64))
+        else:
+            signals = self.apply_array(signal_array(data), sample_rate)
+        store_signal_array(data, signals)
+        if self.output_rate(sample_rate) != sample_rate:
+            store_timestamps(data, self.apply_timestamps(
+                np.asarray(data.timestamps, dtype=np.float64), sample_rate))
+            data.sample_rate = self.output_rate(sample_rate)
+
+
+class LinearFilterBase(ArrayFilterBase):
+    """Base class for linear time-invariant filters given as second-order sections. As such filters commute,
+    consecutive linear filters can be combined into one FilterCascade and applied in a single forward-backward pass.
+    Filters may override apply_array to filter differently on their own, e.g., in several passes; get_sos is only
+    used once filters are compiled.
+    """
+    # Minimum length of chunks in apply_chunked relative to the overlap between chunks
+    CHUNK_MARGINS = 8
+
+    @abstractmethod
+    def get_sos(self, sample_rate: int) -> NDArray:
+        """Returns the second-order sections of the filter.
+
+        :param sample_rate: Sample rate of the signals to filter.
+        :type sample_rate: int
+        :return: Second-order sections of shape (sections, 6).
+        :rtype: NDArray
+        """
+        pass
+
+    def apply_array(self, signals: NDArray, sample_rate: int) -> NDArray:
+        """Apply the filter to an array of signals along the last axis.
+
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :return: Filtered signals of the same shape.
+        :rtype: NDArray
+        """
+        return sosfiltfilt(self.get_sos(sample_rate), signals, axis=-1)
+
+    def impulse_length(self, sample_rate: int, max_samples: int,
+                       tol: float = 1e-6) -> int:
+        """Returns the number of samples until the impulse response of the filter has decayed below a tolerance.
+
+        :param sample_rate: Sample rate of the signals to filter.
+        :type sample_rate: int
+        :param max_samples: Maximum length to consider. Returned if the response has not decayed by then.
+        :type max_samples: int
+        :param tol: Tolerance relative to the peak of the impulse response, defaults to 1e-6
+        :type tol: float, optional
+        :return: Length of the impulse response in samples.
+        :rtype: int
+        """
+        impulse = np.zeros(max(max_samples, 1))
+        impulse[0] = 1
+        response = np.abs(sosfilt(self.get_sos(sample_rate), impulse))
+        above = np.nonzero(response > tol * response.max())[0]
+        return int(above[-1]) + 1 if len(above) else 1
+
+    def apply_chunked(self, signals: NDArray, sample_rate: int,
+                      chunk_samples: int, tol: float = 1e-6) -> NDArray:
+        """Apply the filter to a long signal chunk by chunk using overlap-save. Every chunk is extended on both sides by the
+        length of the filter's impulse response, filtered, and only its center is kept. Results deviate from apply_array
+        only where the impulse response was cut off, while memory of intermediate results is bounded by the chunk size.
+        Chunks are made at least CHUNK_MARGINS times as long as the overlap, so filters with long impulse responses, e.g.,
+        highpass filters with low cutoffs, do not filter most samples several times. If a single chunk would cover the
+        signal, it is filtered in one pass.
+
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :param chunk_samples: Minimum number of samples kept from each chunk.
+        :type chunk_samples: int
+        :param tol: Tolerance relative to the peak of the impulse response used to determine the overlap, defaults to 1e-6
+        :type tol: float, optional
+        :return: Filtered signals of the same shape.
+        :rtype: NDArray
+        """
+        n = signals.shape[-1]
+        margin = self.impulse_length(sample_rate, n, tol)
+        chunk_samples = max(chunk_samples, self.CHUNK_MARGINS * margin)
+        if n <= chunk_samples + 2 * margin:
+            return self.apply_array(signals, sample_rate)
+
+        filtered = np.empty(signals.shape, dtype=np.float64)
+        for start in range(0, n, chunk_samples):
+            stop = min(start + chunk_samples, n)
+            lo, hi = max(start - margin, 0), min(stop + margin, n)
+            chunk = self.apply_array(signals[..., lo:hi], sample_rate)
+            filtered[..., start:stop] = chunk[..., start - lo:stop - lo]
+        return filtered
+
+
+class FilterCascade(LinearFilterBase):
+    def __init__(self, *filters: LinearFilterBase) -> None:
+        """Combination of several linear filters into one set of second-order sections. Applying the cascade needs one
+        forward-backward pass instead of one per filter. Apart from the edges of the signal, where each pass pads the signal
+        on its own, the result equals applying the filters one after another.
+
+        :param filters: Linear filters to combine.
+        :type filters: LinearFilterBase
+        """
+        super().__init__()
+        self.filters = list(filters)
+
+    def get_sos(self, sample_rate: int) -> NDArray:
+        """Returns the second-order sections of all combined filters.
+
+        :param sample_rate: Sample rate of the signals to filter.
+        :type sample_rate: int
+        :return: Second-order sections of shape (sections, 6).
+        :rtype: NDArray
+        """
+        return np.vstack([f.get_sos(sample_rate) for f in self.filters])
+
+    def __str__(self) -> str:
+        _sub = ", ".join([str(x) for x in self.filters])
+        return f"FilterCascade({_sub})"
+
+
+class DetrendFilter(ArrayFilterBase):
+    def __init__(self) -> None:
+        """Detrend filter. Removes linear trend from data. Uses scipy.signal.detrend. See https://docs.scipy.org/doc/scipy/reference/generated/scipy.signal.detrend.html for more information."""
+        super().__init__()
+
+    def apply_array(self, signals: NDArray, sample_rate: int) -> NDArray:
+        """Apply the filter to an array of signals along the last axis.
+
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :return: Filtered signals of the same shape.
+        :rtype: NDArray
+        """
+        return detrend(signals, axis=-1)
 
     def __str__(self) -> str:
         return f"DetrendFilter()"
 
 
-class HighpassFilter(FilterBase):
-    def __init__(self, cutoff: float = 0.1, sample_rate: int = 256) -> None:
+class HighpassFilter(LinearFilterBase):
+    def __init__(self, cutoff: float = 0.1,
+                 sample_rate: Optional[int] = None) -> None:
         """Highpass filter. Removes low frequency components from data. Uses scipy.signal.butter. See https://docs.scipy.org/doc/scipy/reference/generated/scipy.signal.butter.html for more information.
 
         :param cutoff: Frequency cutoff. Frequencies below this value are removed, defaults to 0.1
         :type cutoff: float
-        :param sample_rate: Sample rate of the data, defaults to 256
-        :type sample_rate: int
+        :param sample_rate: Sample rate the filter is designed for. If None, the filter is designed for the sample rate of each container. defaults to None
+        :type sample_rate: Optional[int]
         """
         super().__init__()
         self._cutoff = cutoff
-        self.sos = butter(
-            5,
-            cutoff,
-            "high",
-            fs=sample_rate,
-            analog=False,
-            output="sos")
+        self._sample_rate = sample_rate
 
-    def apply(self, data: AbstractContainer) -> None:
-        """Apply the filter to an AbstractContainer. The filter is applied to all channels in the AbstractContainer. The filter is applied in-place.
+    def get_sos(self, sample_rate: int) -> NDArray:
+        """Returns the second-order sections of the filter. If the filter was created with a sample rate, that rate is used instead.
 
-        :param data: Container to apply the filter to.
-        :type data: AbstractContainer
+        :param sample_rate: Sample rate of the signals to filter.
+        :type sample_rate: int
+        :return: Second-order sections of shape (sections, 6).
+        :rtype: NDArray
         """
-        for c in data.channel_names:
-            t = sosfiltfilt(self.sos, data[c])
-            if isinstance(data[c], list):
-                data[c] = t.tolist()
-            else:
-                data[c] = t
+        return design_butter(5, self._cutoff, "high",
+                             self._sample_rate or sample_rate)
+
+    @property
+    def sos(self) -> NDArray:
+        """Second-order sections for the configured sample rate, or DEFAULT_SAMPLE_RATE if none was configured."""
+        return self.get_sos(self._sample_rate or DEFAULT_SAMPLE_RATE)
 
     def __str__(self) -> str:
-        return f"HighpassFilter(cutoff={self._cutoff})"
+        _rate = f", sample_rate={self._sample_rate}" if self._sample_rate else ""
+        return f"HighpassFilter(cutoff={self._cutoff}{_rate})"
 
 
-class LowpassFilter(FilterBase):
-    def __init__(self, cutoff: float = 30, sample_rate: int = 256) -> None:
+class LowpassFilter(LinearFilterBase):
+    def __init__(self, cutoff: float = 30,
+                 sample_rate: Optional[int] = None) -> None:
         """Lowpass filter. Removes high frequency components from data. Uses scipy.signal.butter. See https://docs.scipy.org/doc/scipy/reference/generated/scipy.signal.butter.html for more information.
 
         :param cutoff: Frequency cutoff. Frequencies above this value are removed, defaults to 30
         :type cutoff: float
-        :param sample_rate: Sample rate of the data, defaults to 256
-        :type sample_rate: int
+        :param sample_rate: Sample rate the filter is designed for. If None, the filter is designed for the sample rate of each container. defaults to None
+        :type sample_rate: Optional[int]
         """
         super().__init__()
         self._cutoff = cutoff
-        self.sos = butter(
-            5,
-            cutoff,
-            "low",
-            fs=sample_rate,
-            analog=False,
-            output="sos")
+        self._sample_rate = sample_rate
 
-    def apply(self, data: AbstractContainer) -> None:
-        """Apply the filter to an AbstractContainer. The filter is applied to all channels in the AbstractContainer. The filter is applied in-place.
+    def get_sos(self, sample_rate: int) -> NDArray:
+        """Returns the second-order sections of the filter. If the filter was created with a sample rate, that rate is used instead.
 
-        :param data: Container to apply the filter to.
-        :type data: AbstractContainer
+        :param sample_rate: Sample rate of the signals to filter.
+        :type sample_rate: int
+        :return: Second-order sections of shape (sections, 6).
+        :rtype: NDArray
         """
-        for c in data.channel_names:
-            t = sosfiltfilt(self.sos, data[c])
-            if isinstance(data[c], list):
-                data[c] = t.tolist()
-            else:
-                data[c] = t
+        return design_butter(5, self._cutoff, "low",
+                             self._sample_rate or sample_rate)
+
+    @property
+    def sos(self) -> NDArray:
+        """Second-order sections for the configured sample rate, or DEFAULT_SAMPLE_RATE if none was configured."""
+        return self.get_sos(self._sample_rate or DEFAULT_SAMPLE_RATE)
 
     def __str__(self) -> str:
-        return f"LowpassFilter(cutoff={self._cutoff})"
+        _rate = f", sample_rate={self._sample_rate}" if self._sample_rate else ""
+        return f"LowpassFilter(cutoff={self._cutoff}{_rate})"
 
 
-class BandpassFilter(FilterBase):
-    def __init__(self, low=0.1, high=30, sample_rate=256) -> None:
-        """Bandpass filter. Removes low and high frequency components from data. Uses LowpassFilter and HighpassFilter.
+class BandpassFilter(LinearFilterBase):
+    def __init__(self, low=0.1, high=30, sample_rate=None) -> None:
+        """Bandpass filter. Removes low and high frequency components from data. Uses LowpassFilter and HighpassFilter. If filters are compiled, both are applied as one cascade.
 
         :param low: Low cutoff frequency. Frequencies below this value are removed. Defaults to 0.1.
         :type low: float, optional
         :param high: High cutoff frequency. Frequencies above this value are removed. Defaults to 30.
         :type high: int, optional
-        :param sample_rate: Sample rate of the data. Defaults to 256.
+        :param sample_rate: Sample rate the filter is designed for. If None, the filter is designed for the sample rate of each container. Defaults to None.
         :type sample_rate: int, optional
         """
         super().__init__()
         self.low_pass = LowpassFilter(high, sample_rate)
         self.high_pass = HighpassFilter(low, sample_rate)
 
-    def apply(self, data: AbstractContainer) -> None:
-        """Apply the filter to an AbstractContainer. The filter is applied to all channels in the AbstractContainer. The filter is applied in-place.
+    def apply_array(self, signals: NDArray, sample_rate: int) -> NDArray:
+        """Apply lowpass and highpass one after another to an array of signals along the last axis.
 
-        :param data: Container to apply the filter to.
-        :type data: AbstractContainer
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :return: Filtered signals of the same shape.
+        :rtype: NDArray
         """
-        self.low_pass.apply(data)
-        self.high_pass.apply(data)
+        signals = self.low_pass.apply_array(signals, sample_rate)
+        return self.high_pass.apply_array(signals, sample_rate)
+
+    def get_sos(self, sample_rate: int) -> NDArray:
+        """Returns the second-order sections of lowpass and highpass combined.
+
+        :param sample_rate: Sample rate of the signals to filter.
+        :type sample_rate: int
+        :return: Second-order sections of shape (sections, 6).
+        :rtype: NDArray
+        """
+        return np.vstack([self.low_pass.get_sos(sample_rate),
+                          self.high_pass.get_sos(sample_rate)])
 
     def __str__(self) -> str:
         return f"BandpassFilter({str(self.low_pass)}, {str(self.high_pass)})"
 
 
-class NotchFilter(FilterBase):
-    def __init__(self, notch=50, sample_rate=256, quality_factor=30) -> None:
+class NotchFilter(LinearFilterBase):
+    def __init__(self, notch=50, sample_rate=None, quality_factor=30) -> None:
+        """Notch filter. Removes a narrow band around a single frequency, e.g., power line noise. Uses scipy.signal.iirnotch.
+
+        :param notch: Frequency to remove, defaults to 50
+        :type notch: float, optional
+        :param sample_rate: Sample rate the filter is designed for. If None, the filter is designed for the sample rate of each container. defaults to None
+        :type sample_rate: int, optional
+        :param quality_factor: Quality factor of the notch, defaults to 30
+        :type quality_factor: float, optional
+        """
         super().__init__()
         self._notch = notch
         self._quality_factor = quality_factor
-        self.b, self.a = iirnotch(notch, quality_factor, sample_rate)
+        self._sample_rate = sample_rate
 
-    def apply(self, data: AbstractContainer) -> None:
-        """Apply the filter to an AbstractContainer. The filter is applied to all channels in the AbstractContainer. The filter is applied in-place.
+    def apply_array(self, signals: NDArray, sample_rate: int) -> NDArray:
+        """Apply the filter to an array of signals along the last axis. Uses scipy.signal.filtfilt.
 
-        :param data: Container to apply the filter to.
-        :type data: AbstractContainer
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :return: Filtered signals of the same shape.
+        :rtype: NDArray
         """
-        for c in data.channel_names:
-            t = filtfilt(self.b, self.a, data[c])
-            if isinstance(data[c], list):
-                data[c] = t.tolist()
-            else:
-                data[c] = t
+        b, a = design_notch_ba(self._notch, self._quality_factor,
+                               self._sample_rate or sample_rate)
+        return filtfilt(b, a, signals, axis=-1)
+
+    def get_sos(self, sample_rate: int) -> NDArray:
+        """Returns the second-order sections of the filter. If the filter was created with a sample rate, that rate is used instead.
+
+        :param sample_rate: Sample rate of the signals to filter.
+        :type sample_rate: int
+        :return: Second-order sections of shape (sections, 6).
+        :rtype: NDArray
+        """
+        return design_notch(self._notch, self._quality_factor,
+                            self._sample_rate or sample_rate)
+
+    @property
+    def b(self) -> NDArray:
+        """Numerator of the transfer function for the configured sample rate, or DEFAULT_SAMPLE_RATE if none was configured."""
+        return design_notch_ba(self._notch, self._quality_factor,
+                               self._sample_rate or DEFAULT_SAMPLE_RATE)[0]
+
+    @property
+    def a(self) -> NDArray:
+        """Denominator of the transfer function for the configured sample rate, or DEFAULT_SAMPLE_RATE if none was configured."""
+        return design_notch_ba(self._notch, self._quality_factor,
+                               self._sample_rate or DEFAULT_SAMPLE_RATE)[1]
 
     def __str__(self) -> str:
-        return f"NotchFilter(notch={self._notch}, quality_factor={self._quality_factor})"
+        _rate = f", sample_rate={self._sample_rate}" if self._sample_rate else ""
+        return f"NotchFilter(notch={self._notch}, quality_factor={self._quality_factor}{_rate})"
 
 
-class BaselineCorrectionFilter(FilterBase):
-    def apply(self, data: EventContainer) -> None:
-        """Apply the filter to an EventContainer. The filter is applied to all channels in the EventContainer. The filter is applied in-place. The baseline is calculated as the average of the data before the stimulus.
+class ResampleFilter(ArrayFilterBase):
+    def __init__(self, sample_rate: int, max_denominator: int = 1000) -> None:
+        """Resample data to a new sample rate using polyphase filtering. Uses scipy.signal.resample_poly, which applies an
+        anti-aliasing FIR filter. Timestamps are interpolated linearly at the positions of the new samples, so gaps and drift
+        of the device clock are kept.
 
-        :param data: Container to apply the filter to.
-        :type data: EventContainer
+        :param sample_rate: Sample rate of the resampled data.
+        :type sample_rate: int
+        :param max_denominator: Largest down factor used to approximate the ratio between both rates, defaults to 1000
+        :type max_denominator: int, optional
+        """
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.max_denominator = max_denominator
+
+    def factors(self, sample_rate: float) -> Tuple[int, int]:
+        """Returns up and down factors to resample from a given sample rate.
+
+        :param sample_rate: Sample rate of the data.
+        :type sample_rate: float
+        :return: Up and down factor.
+        :rtype: Tuple[int, int]
+        """
+        ratio = Fraction(self.sample_rate / sample_rate).limit_denominator(
+            self.max_denominator)
+        return ratio.numerator, ratio.denominator
+
+    def apply_array(self, signals: NDArray, sample_rate: int) -> NDArray:
+        """Resample an array of signals along the last axis.
+
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :return: Resampled signals.
+        :rtype: NDArray
+        """
+        up, down = self.factors(sample_rate)
+        if up == down:
+            return signals
+        return resample_poly(signals, up, down, axis=-1)
+
+    def output_rate(self, sample_rate: float) -> float:
+        return self.sample_rate
+
+    def apply_timestamps(self, timestamps: NDArray,
+                         sample_rate: float) -> NDArray:
+        up, down = self.factors(sample_rate)
+        if up == down or not timestamps.shape[-1]:
+            return timestamps
+        samples = timestamps.shape[-1]
+        n = -(-samples * up // down)
+        if samples == 1:
+            return timestamps[..., :1] + np.arange(n) / self.sample_rate
+
+        # Position of each new sample in samples of the original signal. Positions past the last sample are
+        # extrapolated from the last interval.
+        position = np.arange(n) * down / up
+        i = np.minimum(position.astype(int), samples - 2)
+        frac = position - i
+        return timestamps[..., i] * (1 - frac) + timestamps[..., i + 1] * frac
+
+    def __str__(self) -> str:
+        return f"ResampleFilter(sample_rate={self.sample_rate}, max_denominator={self.max_denominator})"
+
+
+class DecimateFilter(ArrayFilterBase):
+    def __init__(self, factor: int) -> None:
+        """Reduce the sample rate by an integer factor. Uses scipy.signal.decimate with a zero-phase FIR anti-aliasing filter,
+        which is applied by polyphase filtering. Every factor-th sample is kept, so the remaining timestamps are unchanged.
+
+        :param factor: Downsampling factor.
+        :type factor: int
+        """
+        super().__init__()
+        assert factor >= 1
+        self.factor = factor
+
+    def apply_array(self, signals: NDArray, sample_rate: int) -> NDArray:
+        """Decimate an array of signals along the last axis.
+
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :return: Decimated signals.
+        :rtype: NDArray
+        """
+        if self.factor == 1:
+            return signals
+        return decimate(signals, self.factor, ftype="fir", axis=-1)
+
+    def output_rate(self, sample_rate: float) -> float:
+        if sample_rate % self.factor == 0:
+            return sample_rate // self.factor
+        return sample_rate / self.factor
+
+    def apply_timestamps(self, timestamps: NDArray,
+                         sample_rate: float) -> NDArray:
+        return timestamps[..., ::self.factor]
+
+    def __str__(self) -> str:
+        return f"DecimateFilter(factor={self.factor})"
+
+
+class BaselineCorrectionFilter(ArrayFilterBase):
+    uses_timestamps = True
+
+    def __init__(self, window: Optional[Tuple[float, float]] = None) -> None:
+        """Baseline correction for events. Subtracts the average of each channel within a baseline window. Timestamps are
+        expected relative to the stimulus, as in EventContainers. The window is resolved to sample indices for every event,
+        so events do not need a sample exactly at the stimulus.
+
+        :param window: Start and end of the baseline window in milliseconds relative to the stimulus. The start is included, the end is not.
+            If None, all samples before the stimulus are used. defaults to None
+        :type window: Optional[Tuple[float, float]], optional
+        """
+        super().__init__()
+        self.window = window
+
+    def apply_array(self, signals: NDArray, sample_rate: int,
+                    timestamps: Optional[NDArray] = None) -> NDArray:
+        """Subtract the baseline from an array of signals.
+
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: int
+        :param timestamps: Timestamps in seconds relative to the stimulus of shape (samples,) or (epochs, samples).
+        :type timestamps: NDArray
+        :return: Corrected signals of the same shape.
+        :rtype: NDArray
         """
-        stim_i = np.where(data.timestamps == 0)[0][0]
-        for channel in data.channel_names:
-            avg = sum(data[channel][0:stim_i]) / stim_i
-            data[channel] -= avg
+        assert timestamps is not None, "Baseline correction needs timestamps."
+        if self.window is None:
+            t0, t1 = -np.inf, 0
+        else:
+            t0, t1 = self.window[0] / 1000, self.window[1] / 1000
+
+        # Timestamps are sorted, so counting gives the window's indices
+        start = np.sum(timestamps < t0, axis=-1)
+        end = np.sum(timestamps < t1, axis=-1)
+        start = start.reshape(start.shape + (1, 1))
+        end = end.reshape(end.shape + (1, 1))
+
+        # Window sums of all epochs and channels from one cumulative sum
+        zeros = np.zeros(signals.shape[:-1] + (1,))
+        cumsum = np.concatenate(
+            [zeros, np.cumsum(signals, axis=-1)], axis=-1)
+        total = np.take_along_axis(cumsum, np.broadcast_to(end, signals.shape[:-1] + (1,)), axis=-1) - \
+            np.take_along_axis(cumsum, np.broadcast_to(
+                start, signals.shape[:-1] + (1,)), axis=-1)
+        count = end - start
+        baseline = np.where(count > 0, total / np.maximum(count, 1), 0)
+        return signals - baseline
 
     def __str__(self) -> str:
-        return f"BaselineCorrectionFilter()"
+        if self.window is None:
+            return f"BaselineCorrectionFilter()"
+        return f"BaselineCorrectionFilter(window={self.window})"
 
 
 class ReductionFilter(FilterBase):
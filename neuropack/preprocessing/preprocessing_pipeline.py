@@ -1,17 +1,73 @@
-from typing import List, Union
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import groupby
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Iterable, Iterator, List, Optional, Union
 
-from ..containers import EEGContainer, EventContainer
+from ..containers import (AbstractContainer, EEGContainer, EventContainer,
+                          stack_signals)
 from .filters import *
 
 
+def _apply_shared(pipeline: "PreprocessingPipeline",
+                  is_event: bool,
+                  channel_names: List[str],
+                  sample_rate: int,
+                  shm_name: str,
+                  shape: tuple):
+    """Worker of PreprocessingPipeline.apply_parallel. Applies the pipeline to signals and timestamps stored in shared memory,
+    signals in all rows but the last and timestamps in the last row, and writes the result back into the same buffer. If the
+    result does not fit the buffer, it is returned instead.
+    """
+    shm = SharedMemory(name=shm_name)
+    try:
+        shared = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        timestamps = shared[-1].copy()
+        if is_event:
+            container = EventContainer(
+                channel_names, sample_rate, list(shared[:-1].copy()), timestamps)
+        else:
+            container = EEGContainer(channel_names, sample_rate)
+            container.signals = list(shared[:-1].copy())
+            # Recordings store timestamps as list, like the containers apply is called with
+            container.timestamps = timestamps.tolist()
+            timestamps = container.timestamps
+
+        pipeline.apply(container)
+
+        signals = signal_array(container)
+        new_timestamps = np.asarray(container.timestamps, dtype=np.float64)
+        timestamps_changed = container.timestamps is not timestamps
+        result = None
+        if signals.shape[-1] == shape[-1] and len(signals) < shape[0]:
+            shared[:len(signals)] = signals
+            if timestamps_changed:
+                shared[-1] = new_timestamps
+                new_timestamps = None
+        else:
+            result = signals
+        del shared
+    finally:
+        shm.close()
+
+    return container.channel_names, container.sample_rate, timestamps_changed, new_timestamps, len(signals), result
+
+
 class PreprocessingPipeline():
-    def __init__(self, *filters: List[FilterBase]) -> None:
+    def __init__(self, *filters: List[FilterBase],
+                 compile_filters: bool = False) -> None:
         """Preprocessing pipeline for containers. Applies a list of filters to the containers.
 
         :param filters: List of filters to apply to the containers. Defaults to empty list.
         :type filters: List[FilterBase]
+        :param compile_filters: If true, consecutive linear filters are combined into one FilterCascade and applied in a single forward-backward pass.
+            Non-linear filters, e.g., DetrendFilter or ReductionFilter, separate cascades. Results only differ from applying the filters one after another at the edges of the signal. defaults to False
+        :type compile_filters: bool, optional
         """
         self.filters = list(filters)
+        self.compile_filters = compile_filters
+        self._plan = None
+        self._plan_filters = None
 
     def add_filter(self, filter: FilterBase):
         """Add a filter to the pipeline. Filters are applied in the order they are added.
@@ -20,6 +76,7 @@ class PreprocessingPipeline():
         :type filter: FilterBase
         """
         self.filters.append(filter)
+        self._plan = None
 
     def apply(self,
               container: Union[EventContainer,
@@ -27,15 +84,272 @@ class PreprocessingPipeline():
                                EEGContainer,
                                List[EEGContainer]]):
         """Apply the pipeline to a container or a list of containers. The pipeline is applied in the order the filters were added.
+        Consecutive ArrayFilters are applied to all containers of equal shape at once, other filters are applied to each container separately.
 
         :param container: Event or list of containers to apply the pipeline to.
         :type container: Union[EventContainer, List[EventContainer], EEGContainer, List[EEGContainer]]
         """
         if not isinstance(container, list):
             container = [container]
-        for co in container:
-            for filter in self.filters:
-                filter.apply(co)
+        for is_array, filters in groupby(
+                self.get_plan(), key=lambda f: isinstance(f, ArrayFilterBase)):
+            filters = list(filters)
+            if is_array:
+                self.__apply_batched(filters, container)
+            else:
+                for co in container:
+                    for filter in filters:
+                        filter.apply(co)
+
+    def apply_parallel(self,
+                       containers: Iterable[AbstractContainer],
+                       workers: Optional[int] = None) -> Iterator[AbstractContainer]:
+        """Apply the pipeline to many containers using a pool of processes. Signals and timestamps are passed to the workers
+        through shared memory instead of being pickled, and results are written back into the containers in-place. Workers
+        only see signals, timestamps, channel names and sample rate. Event markers and invalid spans of an EEGContainer
+        are not passed to them and stay unchanged on the container, which is valid as both refer to timestamps, not
+        samples. Containers are yielded as soon as they are processed, which is not necessarily in the order they were
+        given. Processing only proceeds while the returned iterator is consumed.
+
+        :param containers: Containers to apply the pipeline to.
+        :type containers: Iterable[AbstractContainer]
+        :param workers: Number of processes. If None, the number of processors is used. defaults to None
+        :type workers: Optional[int], optional
+        :yield: Processed containers in order of completion.
+        :rtype: Iterator[AbstractContainer]
+        """
+        workers = workers or os.cpu_count() or 1
+        max_pending = 2 * workers
+        with ProcessPoolExecutor(workers) as pool:
+            pending = {}
+            containers = iter(containers)
+            exhausted = False
+            try:
+                while pending or not exhausted:
+                    # Keep a bounded number of containers in shared memory
+                    while not exhausted and len(pending) < max_pending:
+                        container = next(containers, None)
+                        if container is None:
+                            exhausted = True
+                            break
+                        signals = signal_array(container)
+                        assert len(container.timestamps) == signals.shape[-1], \
+                            "Expected one timestamp per sample."
+                        shape = (len(signals) + 1, signals.shape[-1])
+                        shm = SharedMemory(
+                            create=True, size=max(8 * shape[0] * shape[1], 1))
+                        shared = np.ndarray(
+                            shape, dtype=np.float64, buffer=shm.buf)
+                        shared[:-1] = signals
+                        shared[-1] = container.timestamps
+                        del shared
+                        future = pool.submit(
+                            _apply_shared, self,
+                            isinstance(container, EventContainer),
+                            container.channel_names, container.sample_rate,
+                            shm.name, shape)
+                        pending[future] = (container, shm, shape)
+
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        container, shm, shape = pending.pop(future)
+                        try:
+                            channel_names, sample_rate, timestamps_changed, timestamps, channels, result = \
+                                future.result()
+                            shared = np.ndarray(
+                                shape, dtype=np.float64, buffer=shm.buf)
+                            if result is None:
+                                result = shared[:channels].copy()
+                            if timestamps_changed and timestamps is None:
+                                timestamps = shared[-1].copy()
+                            del shared
+                        finally:
+                            shm.close()
+                            shm.unlink()
+
+                        container.channel_names = channel_names
+                        container.sample_rate = sample_rate
+                        if timestamps_changed:
+                            store_timestamps(container, timestamps)
+                        store_signal_array(container, result)
+                        yield container
+            finally:
+                for future, (_, shm, _) in pending.items():
+                    future.cancel()
+                    shm.close()
+                    shm.unlink()
+
+    def apply_continuous(self, container: EEGContainer,
+                         chunk_s: float = 10,
+                         tol: float = 1e-6) -> "PreprocessingPipeline":
+        """Apply the leading linear filters of the pipeline to a continuous recording once, before events are extracted.
+        Linear time-invariant filters yield the same result on the recording as on each event, apart from the edges of
+        the events, and are applied chunk-wise using overlap-save, so long recordings are not filtered in one piece.
+        Filters starting with the first non-linear filter, e.g., DetrendFilter or BaselineCorrectionFilter, depend on
+        the extent of each event and are returned as a new pipeline to be applied to the extracted events.
+
+        :param container: Continuous recording. The filters are applied in-place.
+        :type container: EEGContainer
+        :param chunk_s: Length of chunks for linear filters in seconds, defaults to 10
+        :type chunk_s: float, optional
+        :param tol: Tolerance relative to the peak of the filters' impulse responses used to determine the overlap between chunks, defaults to 1e-6
+        :type tol: float, optional
+        :return: Pipeline of the remaining filters.
+        :rtype: PreprocessingPipeline
+        """
+        plan = self.get_plan()
+        n = 0
+        while n < len(plan) and isinstance(plan[n], LinearFilterBase):
+            n += 1
+
+        if n and len(container.signals) and len(container.signals[0]):
+            signals, _, _ = self.__apply_filters(
+                plan[:n], signal_array(container), None,
+                container.sample_rate, chunk_s, tol)
+            store_signal_array(container, signals)
+
+        return PreprocessingPipeline(
+            *plan[n:], compile_filters=self.compile_filters)
+
+    def skip_linear(self, covered: Callable[[List[FilterBase]], List[bool]]) -> "PreprocessingPipeline":
+        """Returns a pipeline without the leading linear filters that were already applied otherwise, e.g., causally
+        while recording. As linear filters commute, any of the leading linear filters can be skipped. Note that a
+        causal filter is not equivalent to the zero-phase filter it replaces: it delays the signals and applies the
+        magnitude response once instead of squared. Signals filtered with and without skipped filters, e.g., templates
+        and probes, are therefore not comparable. Use skipped_linear to report the filters that are dropped.
+
+        :param covered: Returns for every filter, whether it was already applied, e.g., StreamingPipeline.covered.
+        :type covered: Callable[[List[FilterBase]], List[bool]]
+        :return: Pipeline of the remaining filters.
+        :rtype: PreprocessingPipeline
+        """
+        n = self.__leading_linear()
+        leading = [f for f, c in zip(self.filters[:n], covered(self.filters[:n])) if not c]
+        return PreprocessingPipeline(
+            *leading, *self.filters[n:], compile_filters=self.compile_filters)
+
+    def skipped_linear(self, covered: Callable[[List[FilterBase]], List[bool]]) -> List[FilterBase]:
+        """Returns the leading linear filters skip_linear drops.
+
+        :param covered: Returns for every filter, whether it was already applied, e.g., StreamingPipeline.covered.
+        :type covered: Callable[[List[FilterBase]], List[bool]]
+        :return: Filters that were already applied.
+        :rtype: List[FilterBase]
+        """
+        n = self.__leading_linear()
+        return [f for f, c in zip(self.filters[:n], covered(self.filters[:n])) if c]
+
+    def __leading_linear(self) -> int:
+        """Returns the number of linear filters at the start of the pipeline.
+        """
+        n = 0
+        while n < len(self.filters) and isinstance(self.filters[n], LinearFilterBase):
+            n += 1
+        return n
+
+    def get_plan(self) -> List[FilterBase]:
+        """Returns the filters as they are applied. If filters are compiled, runs of consecutive linear filters are replaced by one FilterCascade each,
+        so every run is applied as second-order sections in a single forward-backward pass.
+        The plan is cached until the filters of the pipeline change.
+
+        :return: Filters in order of application.
+        :rtype: List[FilterBase]
+        """
+        if not self.compile_filters:
+            return self.filters
+
+        if self._plan is not None and self._plan_filters == self.filters:
+            return self._plan
+
+        plan = []
+        for is_linear, filters in groupby(
+                self.filters, key=lambda f: isinstance(f, LinearFilterBase)):
+            filters = list(filters)
+            if is_linear:
+                plan.append(FilterCascade(*filters))
+            else:
+                plan.extend(filters)
+
+        self._plan = plan
+        self._plan_filters = list(self.filters)
+        return plan
+
+    @staticmethod
+    def __apply_batched(filters: List[ArrayFilterBase],
+                        containers: List[AbstractContainer]):
+        """Apply ArrayFilters to batches of containers sharing channel count, length and sample rate.
+
+        :param filters: Filters to apply in order.
+        :type filters: List[ArrayFilterBase]
+        :param containers: Containers to apply the filters to.
+        :type containers: List[AbstractContainer]
+        """
+        batches = {}
+        for co in containers:
+            if len(co.signals) == 0:
+                continue
+            key = (len(co.signals), len(co.signals[0]), co.sample_rate)
+            batches.setdefault(key, []).append(co)
+
+        for (_, _, sample_rate), batch in batches.items():
+            signals = stack_signals(batch)
+            timestamps = None
+            if any(f.uses_timestamps or f.output_rate(sample_rate) != sample_rate
+                   for f in filters):
+                timestamps = np.stack([np.asarray(co.timestamps, dtype=np.float64)
+                                       for co in batch])
+
+            signals, timestamps, sample_rate = PreprocessingPipeline.__apply_filters(
+                filters, signals, timestamps, sample_rate)
+
+            for i, co in enumerate(batch):
+                store_signal_array(co, signals[i])
+                if co.sample_rate != sample_rate:
+                    store_timestamps(co, timestamps[i])
+                    co.sample_rate = sample_rate
+
+    @staticmethod
+    def __apply_filters(filters: List[ArrayFilterBase],
+                        signals: NDArray,
+                        timestamps: Optional[NDArray],
+                        sample_rate: float,
+                        chunk_s: Optional[float] = None,
+                        tol: float = 1e-6):
+        """Apply ArrayFilters to an array of signals, keeping timestamps and sample rate up to date.
+
+        :param filters: Filters to apply in order.
+        :type filters: List[ArrayFilterBase]
+        :param signals: Signals of shape (channels, samples) or (epochs, channels, samples).
+        :type signals: NDArray
+        :param timestamps: Timestamps of shape (samples,) or (epochs, samples). Only needed if a filter uses timestamps or changes the sample rate.
+        :type timestamps: Optional[NDArray]
+        :param sample_rate: Sample rate of the signals.
+        :type sample_rate: float
+        :param chunk_s: If set, linear filters are applied chunk-wise with chunks of this length in seconds, defaults to None
+        :type chunk_s: Optional[float], optional
+        :param tol: Tolerance used to determine the overlap between chunks, defaults to 1e-6
+        :type tol: float, optional
+        :return: Filtered signals, their timestamps and sample rate.
+        """
+        for filter in filters:
+            if chunk_s and isinstance(filter, LinearFilterBase):
+                chunk_samples = max(int(chunk_s * sample_rate), 1)
+                signals = filter.apply_chunked(
+                    signals, sample_rate, chunk_samples, tol)
+            elif filter.uses_timestamps:
+                signals = filter.apply_array(
+                    signals, sample_rate, timestamps=timestamps)
+            else:
+                signals = filter.apply_array(signals, sample_rate)
+
+            rate = filter.output_rate(sample_rate)
+            if rate != sample_rate:
+                timestamps = filter.apply_timestamps(timestamps, sample_rate)
+                sample_rate = rate
+        return signals, timestamps, sample_rate
 
     def __str__(self) -> str:
         _sub = ", ".join([str(x) for x in self.filters])
@@ -1,6 +1,8 @@
-from abc import ABC, abstractclassmethod
+from abc import ABC, abstractclassmethod, abstractmethod
+from typing import List
 
 import numpy as np
+from numpy.typing import NDArray
 
 from ..containers import EventContainer
 
@@ -17,30 +19,211 @@ class SignalComponentBase(ABC):
         """
         pass
 
+    def find_batch(self, events: List[EventContainer]) -> NDArray:
+        """Try to find specified feature in several events.
+
+        :param events: Events to check for feature.
+        :type events: List[EventContainer]
+        :return: Boolean mask, True for every event the feature is present in.
+        :rtype: NDArray
+        """
+        return np.array([self.find(e) for e in events], dtype=bool)
+
+
+class ArrayComponentBase(SignalComponentBase):
+    """Base class for components detected on all epochs at once. Such components work on arrays of shape
+    (epochs, channels, samples). ComponentPipeline stacks equally shaped events once and passes the array to every ArrayComponent.
+    """
 
-class Blink(SignalComponentBase):
     def __init__(self, *channel_names) -> None:
-        """Check if specified channels in given EventContainer contain a blink.
-        If no channels were specified in constructor, checks all channels.
+        """If no channels are specified, all channels are checked.
         """
         super().__init__()
         self.channel_names = channel_names
 
+    @abstractmethod
+    def find_array(self, signals: NDArray,
+                   channel_names: List[str]) -> NDArray:
+        """Try to find specified feature in an array of epochs.
+
+        :param signals: Signals of shape (epochs, channels, samples).
+        :type signals: NDArray
+        :param channel_names: Channel names of the second axis.
+        :type channel_names: List[str]
+        :return: Boolean mask of shape (epochs,), True for every epoch the feature is present in.
+        :rtype: NDArray
+        """
+        pass
+
+    def select(self, signals: NDArray, channel_names: List[str]) -> NDArray:
+        """Returns the channels checked by this component.
+
+        :param signals: Signals of shape (epochs, channels, samples).
+        :type signals: NDArray
+        :param channel_names: Channel names of the second axis.
+        :type channel_names: List[str]
+        :return: Signals of the selected channels.
+        :rtype: NDArray
+        """
+        if not self.channel_names:
+            return signals
+        return signals[:, [channel_names.index(ch) for ch in self.channel_names]]
+
     def find(self, data: EventContainer) -> bool:
-        """Check if specified channels in given EventContainer contain a blink.
-        If no channels were specified in constructor, checks all channels.
+        """Try to find specified feature in data.
 
-        :param data: _description_
+        :param data: Container to check for feature.
         :type data: EventContainer
-        :return: _description_
+        :return: Is feature present in EventContainer.
         :rtype: bool
         """
-        channel_names = self.channel_names
-        if not channel_names:
-            channel_names = data.channel_names
+        signals = np.asarray(data.signals, dtype=np.float64)[None]
+        return bool(self.find_array(signals, data.channel_names)[0])
+
+    def find_batch(self, events: List[EventContainer]) -> NDArray:
+        """Try to find specified feature in several events of equal shape.
+
+        :param events: Events to check for feature.
+        :type events: List[EventContainer]
+        :return: Boolean mask, True for every event the feature is present in.
+        :rtype: NDArray
+        """
+        if not events:
+            return np.zeros(0, dtype=bool)
+        signals = np.stack([np.asarray(e.signals, dtype=np.float64)
+                           for e in events])
+        return self.find_array(signals, events[0].channel_names)
+
+    def describe(self, **params) -> str:
+        """Returns the string representation of the component, including its channels if specified, so components
+        checking different channels are told apart, e.g., in the counts of ComponentPipeline.check_batch.
+
+        :return: Name of the component followed by its channels and parameters.
+        :rtype: str
+        """
+        args = list(self.channel_names) + [f"{k}={v}" for k, v in params.items()]
+        return f"{type(self).__name__}({', '.join(args)})"
+
+
+class Blink(ArrayComponentBase):
+    def __init__(self, *channel_names, threshold: float = 100) -> None:
+        """Check if specified channels in given EventContainer contain a blink, i.e., if the absolute amplitude exceeds a threshold.
+        If no channels were specified in constructor, checks all channels.
+
+        :param threshold: Amplitude above which a blink is detected, defaults to 100
+        :type threshold: float, optional
+        """
+        super().__init__(*channel_names)
+        self.threshold = threshold
 
-        for ch in channel_names:
-            if np.abs(data[ch]).max() > 100:
-                return True
+    def find_array(self, signals: NDArray,
+                   channel_names: List[str]) -> NDArray:
+        """Check if specified channels of each epoch contain a blink.
+
+        :param signals: Signals of shape (epochs, channels, samples).
+        :type signals: NDArray
+        :param channel_names: Channel names of the second axis.
+        :type channel_names: List[str]
+        :return: Boolean mask of shape (epochs,), True for every epoch containing a blink.
+        :rtype: NDArray
+        """
+        signals = self.select(signals, channel_names)
+        return np.abs(signals).max(axis=(1, 2)) > self.threshold
+
+    def __str__(self) -> str:
+        return self.describe(threshold=self.threshold)
+
+
+class PeakToPeak(ArrayComponentBase):
+    def __init__(self, *channel_names, threshold: float = 150) -> None:
+        """Check if the peak-to-peak amplitude of any specified channel exceeds a threshold, e.g., due to movement artifacts.
+        If no channels are specified, checks all channels.
+
+        :param threshold: Peak-to-peak amplitude above which the component is detected, defaults to 150
+        :type threshold: float, optional
+        """
+        super().__init__(*channel_names)
+        self.threshold = threshold
+
+    def find_array(self, signals: NDArray,
+                   channel_names: List[str]) -> NDArray:
+        """Check if the peak-to-peak amplitude of any specified channel of each epoch exceeds the threshold.
+
+        :param signals: Signals of shape (epochs, channels, samples).
+        :type signals: NDArray
+        :param channel_names: Channel names of the second axis.
+        :type channel_names: List[str]
+        :return: Boolean mask of shape (epochs,).
+        :rtype: NDArray
+        """
+        signals = self.select(signals, channel_names)
+        return np.ptp(signals, axis=2).max(axis=1) > self.threshold
+
+    def __str__(self) -> str:
+        return self.describe(threshold=self.threshold)
+
+
+class FlatLine(ArrayComponentBase):
+    def __init__(self, *channel_names, threshold: float = 0.5) -> None:
+        """Check if any specified channel is flat, i.e., its peak-to-peak amplitude stays below a threshold. Flat channels
+        indicate a lost electrode contact or a saturated amplifier. If no channels are specified, checks all channels.
+
+        :param threshold: Peak-to-peak amplitude below which a channel is considered flat, defaults to 0.5
+        :type threshold: float, optional
+        """
+        super().__init__(*channel_names)
+        self.threshold = threshold
+
+    def find_array(self, signals: NDArray,
+                   channel_names: List[str]) -> NDArray:
+        """Check if any specified channel of each epoch is flat.
+
+        :param signals: Signals of shape (epochs, channels, samples).
+        :type signals: NDArray
+        :param channel_names: Channel names of the second axis.
+        :type channel_names: List[str]
+        :return: Boolean mask of shape (epochs,).
+        :rtype: NDArray
+        """
+        signals = self.select(signals, channel_names)
+        return np.ptp(signals, axis=2).min(axis=1) < self.threshold
+
+    def __str__(self) -> str:
+        return self.describe(threshold=self.threshold)
+
+
+class VarianceZScore(ArrayComponentBase):
+    def __init__(self, *channel_names, threshold: float = 3) -> None:
+        """Check if the variance of any specified channel deviates from the other epochs. Variances are compared on a
+        logarithmic scale and z-scored per channel across all epochs checked together, using median and median absolute
+        deviation so that outliers do not mask themselves. A single epoch is never detected. If no channels are specified,
+        checks all channels.
+
+        :param threshold: Absolute z-score above which an epoch is detected, defaults to 3
+        :type threshold: float, optional
+        """
+        super().__init__(*channel_names)
+        self.threshold = threshold
+
+    def find_array(self, signals: NDArray,
+                   channel_names: List[str]) -> NDArray:
+        """Check if the variance of any specified channel of each epoch deviates from the other epochs.
+
+        :param signals: Signals of shape (epochs, channels, samples).
+        :type signals: NDArray
+        :param channel_names: Channel names of the second axis.
+        :type channel_names: List[str]
+        :return: Boolean mask of shape (epochs,).
+        :rtype: NDArray
+        """
+        signals = self.select(signals, channel_names)
+        log_var = np.log(np.var(signals, axis=2) + np.finfo(np.float64).tiny)
+        median = np.median(log_var, axis=0)
+        # Scale MAD to be consistent with the standard deviation
+        mad = 1.4826 * np.median(np.abs(log_var - median), axis=0)
+        mad[mad == 0] = np.inf
+        z = (log_var - median) / mad
+        return np.abs(z).max(axis=1) > self.threshold
 
-        return False
+    def __str__(self) -> str:
+        return self.describe(threshold=self.threshold)
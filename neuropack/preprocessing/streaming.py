@@ -0,0 +1,284 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.signal import sosfilt, sosfilt_zi
+
+from ..devices.base import BCIChunk
+from .filters import (BandpassFilter, FilterBase, HighpassFilter,
+                      LinearFilterBase, LowpassFilter, NotchFilter)
+
+
+class StreamingFilterBase(ABC):
+    @abstractmethod
+    def process(self, signals: NDArray) -> NDArray:
+        """Filter the next chunk of a stream. Filters keep state between calls, so chunks must be passed in order.
+
+        :param signals: Chunk of signals of shape (channels, samples).
+        :type signals: NDArray
+        :return: Filtered chunk of the same shape.
+        :rtype: NDArray
+        """
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Forget the state of the stream. Must be called before filtering a new stream.
+        """
+        pass
+
+    def configure(self, sample_rate: int):
+        """Prepare the filter for a stream with the given sample rate. Only filters depending on the sample rate need
+        to override this.
+
+        :param sample_rate: Sample rate of the stream.
+        :type sample_rate: int
+        """
+        pass
+
+    def __call__(self, signals: NDArray) -> NDArray:
+        return self.process(signals)
+
+
+class StreamingSOSFilter(StreamingFilterBase):
+    def __init__(self, sos: NDArray) -> None:
+        """Causal filter given as second-order sections. Keeps the scipy.signal.sosfilt state of every channel
+        between chunks, so filtering a stream chunk-wise yields the same result as filtering it at once.
+        The state is initialized to the steady state of the first sample of each channel to avoid a step response
+        at the beginning of the stream.
+
+        :param sos: Second-order sections of the filter.
+        :type sos: NDArray
+        """
+        self.sos = np.atleast_2d(sos)
+        self._zi: Optional[NDArray] = None
+
+    def reset(self):
+        """Forget the state of the stream. Must be called before filtering a new stream.
+        """
+        self._zi = None
+
+    def process(self, signals: NDArray) -> NDArray:
+        """Filter the next chunk of a stream.
+
+        :param signals: Chunk of signals of shape (channels, samples).
+        :type signals: NDArray
+        :return: Filtered chunk of the same shape.
+        :rtype: NDArray
+        """
+        signals = np.asarray(signals, dtype=np.float64)
+        if signals.shape[-1] == 0:
+            return signals
+
+        if self._zi is None or self._zi.shape[1] != signals.shape[0]:
+            # (sections, 2) -> (sections, channels, 2)
+            self._zi = sosfilt_zi(self.sos)[:, None, :] * \
+                signals[None, :, 0, None]
+
+        filtered, self._zi = sosfilt(self.sos, signals, axis=-1, zi=self._zi)
+        return filtered
+
+    def __str__(self) -> str:
+        return f"StreamingSOSFilter(sections={len(self.sos)})"
+
+
+class StreamingLinearFilter(StreamingSOSFilter):
+    def __init__(self, filter: LinearFilterBase,
+                 sample_rate: Optional[int] = None) -> None:
+        """Causal counterpart of a linear filter of a PreprocessingPipeline. The filter is designed once the sample rate
+        of the stream is known, either given here or set with configure, e.g., by KeyWave for the rate of its device.
+
+        :param filter: Linear filter to apply causally.
+        :type filter: LinearFilterBase
+        :param sample_rate: Sample rate of the stream. If None, configure must be called before processing. defaults to None
+        :type sample_rate: Optional[int], optional
+        """
+        self.filter = filter
+        self.sample_rate = sample_rate
+        super().__init__(np.zeros((0, 6)))
+        if sample_rate is not None:
+            self.configure(sample_rate)
+
+    def configure(self, sample_rate: int):
+        """Design the filter for the sample rate of the stream.
+
+        :param sample_rate: Sample rate of the stream.
+        :type sample_rate: int
+        """
+        assert self.sample_rate in (None, sample_rate), \
+            f"{self} was created for {self.sample_rate} Hz, but the stream has {sample_rate} Hz."
+        self.sample_rate = sample_rate
+        self.sos = np.atleast_2d(self.filter.get_sos(sample_rate))
+        self.reset()
+
+    def process(self, signals: NDArray) -> NDArray:
+        """Filter the next chunk of a stream.
+
+        :param signals: Chunk of signals of shape (channels, samples).
+        :type signals: NDArray
+        :return: Filtered chunk of the same shape.
+        :rtype: NDArray
+        """
+        assert self.sample_rate is not None, f"Sample rate of {self} was not configured."
+        return super().process(signals)
+
+    def __str__(self) -> str:
+        return f"StreamingLinearFilter({self.filter})"
+
+
+class StreamingHighpassFilter(StreamingLinearFilter):
+    def __init__(self, cutoff: float = 0.1,
+                 sample_rate: Optional[int] = None) -> None:
+        """Causal counterpart of HighpassFilter.
+
+        :param cutoff: Frequency cutoff. Frequencies below this value are removed, defaults to 0.1
+        :type cutoff: float
+        :param sample_rate: Sample rate of the data. If None, configure must be called before processing. defaults to None
+        :type sample_rate: Optional[int]
+        """
+        super().__init__(HighpassFilter(cutoff), sample_rate)
+        self._cutoff = cutoff
+
+    def __str__(self) -> str:
+        return f"StreamingHighpassFilter(cutoff={self._cutoff})"
+
+
+class StreamingLowpassFilter(StreamingLinearFilter):
+    def __init__(self, cutoff: float = 30,
+                 sample_rate: Optional[int] = None) -> None:
+        """Causal counterpart of LowpassFilter.
+
+        :param cutoff: Frequency cutoff. Frequencies above this value are removed, defaults to 30
+        :type cutoff: float
+        :param sample_rate: Sample rate of the data. If None, configure must be called before processing. defaults to None
+        :type sample_rate: Optional[int]
+        """
+        super().__init__(LowpassFilter(cutoff), sample_rate)
+        self._cutoff = cutoff
+
+    def __str__(self) -> str:
+        return f"StreamingLowpassFilter(cutoff={self._cutoff})"
+
+
+class StreamingBandpassFilter(StreamingLinearFilter):
+    def __init__(self, low=0.1, high=30, sample_rate=None) -> None:
+        """Causal counterpart of BandpassFilter. Lowpass and highpass are cascaded into a single set of second-order sections.
+
+        :param low: Low cutoff frequency. Frequencies below this value are removed. Defaults to 0.1.
+        :type low: float, optional
+        :param high: High cutoff frequency. Frequencies above this value are removed. Defaults to 30.
+        :type high: int, optional
+        :param sample_rate: Sample rate of the data. If None, configure must be called before processing. Defaults to None.
+        :type sample_rate: int, optional
+        """
+        super().__init__(BandpassFilter(low, high), sample_rate)
+        self._low = low
+        self._high = high
+
+    def __str__(self) -> str:
+        return f"StreamingBandpassFilter(low={self._low}, high={self._high})"
+
+
+class StreamingNotchFilter(StreamingLinearFilter):
+    def __init__(self, notch=50, sample_rate=None, quality_factor=30) -> None:
+        """Causal counterpart of NotchFilter.
+
+        :param notch: Frequency to remove, defaults to 50
+        :type notch: float, optional
+        :param sample_rate: Sample rate of the data. If None, configure must be called before processing. defaults to None
+        :type sample_rate: int, optional
+        :param quality_factor: Quality factor of the notch, defaults to 30
+        :type quality_factor: float, optional
+        """
+        super().__init__(NotchFilter(
+            notch, quality_factor=quality_factor), sample_rate)
+        self._notch = notch
+        self._quality_factor = quality_factor
+
+    def __str__(self) -> str:
+        return f"StreamingNotchFilter(notch={self._notch}, quality_factor={self._quality_factor})"
+
+
+class StreamingPipeline():
+    def __init__(self, *filters: List[StreamingFilterBase]) -> None:
+        """Chain of streaming filters applied to chunks while they are recorded. In contrast to PreprocessingPipeline,
+        all filters are causal and introduce a phase delay.
+
+        :param filters: List of filters to apply to every chunk. Defaults to empty list.
+        :type filters: List[StreamingFilterBase]
+        """
+        self.filters = list(filters)
+
+    def add_filter(self, filter: StreamingFilterBase):
+        """Add a filter to the pipeline. Filters are applied in the order they are added.
+
+        :param filter: Filter to add to the pipeline.
+        :type filter: StreamingFilterBase
+        """
+        self.filters.append(filter)
+
+    def reset(self):
+        """Forget the state of all filters. Must be called before filtering a new stream.
+        """
+        for filter in self.filters:
+            filter.reset()
+
+    def configure(self, sample_rate: int):
+        """Prepare all filters for a stream with the given sample rate.
+
+        :param sample_rate: Sample rate of the stream.
+        :type sample_rate: int
+        """
+        for filter in self.filters:
+            filter.configure(sample_rate)
+
+    def covered(self, filters: List[FilterBase]) -> List[bool]:
+        """Checks, which filters of a PreprocessingPipeline are already applied causally by this pipeline. Filters are
+        matched one-to-one, so a filter applied twice offline is only covered once if it is streamed once. A covered
+        filter is not equivalent to the offline filter: it is applied in a single causal pass, so it delays the
+        signals and applies the magnitude response once instead of squared.
+
+        :param filters: Filters of a PreprocessingPipeline.
+        :type filters: List[FilterBase]
+        :return: For every filter, True if a distinct StreamingLinearFilter of this pipeline was created from an equal
+            filter, else False.
+        :rtype: List[bool]
+        """
+        available = [str(f.filter) for f in self.filters
+                     if isinstance(f, StreamingLinearFilter)]
+        covered = []
+        for filter in filters:
+            key = str(filter)
+            covered.append(key in available)
+            if covered[-1]:
+                available.remove(key)
+        return covered
+
+    def process(self, signals: NDArray) -> NDArray:
+        """Filter the next chunk of a stream.
+
+        :param signals: Chunk of signals of shape (channels, samples).
+        :type signals: NDArray
+        :return: Filtered chunk of the same shape.
+        :rtype: NDArray
+        """
+        for filter in self.filters:
+            signals = filter.process(signals)
+        return signals
+
+    def apply(self, chunk: BCIChunk) -> BCIChunk:
+        """Filter the next chunk received from a device.
+
+        :param chunk: Chunk of samples.
+        :type chunk: BCIChunk
+        :return: Filtered chunk with the same timestamps.
+        :rtype: BCIChunk
+        """
+        if not len(chunk):
+            return chunk
+        return BCIChunk(chunk.timestamps, self.process(chunk.signals))
+
+    def __str__(self) -> str:
+        _sub = ", ".join([str(x) for x in self.filters])
+        return f"StreamingPipeline({_sub})"
@@ -50,6 +50,14 @@ class AuthLogger():
         """
         self.__log("FAIL", msg)
 
+    def log_metrics(self, metrics) -> None:
+        """Add a snapshot of a device's throughput and health counters to log file.
+
+        :param metrics: Snapshot to add to log file
+        :type metrics: DeviceMetrics
+        """
+        self.__log("METRICS", str(metrics))
+
     def log_database(self, database) -> None:
         """Saves TemplateDatabase instance alongside log file. Further adds a reference
         to saved instance to log file. Reference is of the form:
@@ -0,0 +1,131 @@
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class IncrementalPCA():
+    __slots__ = "n_components", "whiten", "mean", "components", "singular_values", "n_samples_seen"
+
+    def __init__(self, n_components: int, whiten: bool = False) -> None:
+        """Principal component analysis fitted batch by batch. Each update merges the current components with the
+        centered batch and the shift of the mean, and decomposes the result with a single SVD. The number of samples
+        kept in memory is therefore bounded by n_components plus the batch size.
+
+        :param n_components: Number of components to keep.
+        :type n_components: int
+        :param whiten: Scale projections to unit variance, defaults to False
+        :type whiten: bool, optional
+        """
+        assert n_components > 0, "Expected at least one component."
+        self.n_components = n_components
+        self.whiten = whiten
+        self.mean: Optional[NDArray] = None
+        self.components: Optional[NDArray] = None
+        self.singular_values: Optional[NDArray] = None
+        self.n_samples_seen = 0
+
+    @property
+    def fitted(self) -> bool:
+        """True if at least one batch was fitted."""
+        return self.components is not None
+
+    @property
+    def explained_variance(self) -> NDArray:
+        """Variance of the data along each component."""
+        return self.singular_values**2 / max(self.n_samples_seen - 1, 1)
+
+    def partial_fit(self, x: NDArray) -> "IncrementalPCA":
+        """Update the components with a batch of samples.
+
+        :param x: Samples of shape (samples, features). The first batch needs at least n_components samples.
+        :type x: NDArray
+        :return: Self.
+        :rtype: IncrementalPCA
+        """
+        x = np.asarray(x, dtype=np.float64)
+        assert x.ndim == 2, "Expected samples of shape (samples, features)."
+        n = len(x)
+        if n == 0:
+            return self
+
+        batch_mean = x.mean(axis=0)
+        if not self.fitted:
+            assert min(x.shape) >= self.n_components, \
+                f"First batch needs at least {self.n_components} samples and features, got {x.shape}."
+            total = n
+            mean = batch_mean
+            stacked = x - batch_mean
+        else:
+            assert x.shape[1] == len(self.mean), "Number of features changed."
+            total = self.n_samples_seen + n
+            mean = self.mean + (batch_mean - self.mean) * n / total
+            correction = np.sqrt(self.n_samples_seen * n / total) * \
+                (self.mean - batch_mean)
+            stacked = np.vstack([self.singular_values[:, None] * self.components,
+                                 x - batch_mean, correction])
+
+        _, s, vt = np.linalg.svd(stacked, full_matrices=False)
+
+        # Flip signs, so the largest loading of each component is positive
+        signs = np.sign(vt[np.arange(len(vt)), np.abs(vt).argmax(axis=1)])
+        vt *= signs[:, None]
+
+        self.mean = mean
+        self.components = vt[:self.n_components]
+        self.singular_values = s[:self.n_components]
+        self.n_samples_seen = total
+        return self
+
+    def transform(self, x: NDArray) -> NDArray:
+        """Project samples onto the components.
+
+        :param x: Samples of shape (..., features).
+        :type x: NDArray
+        :return: Projections of shape (..., components).
+        :rtype: NDArray
+        """
+        assert self.fitted, "Projection was not fitted."
+        projected = (np.asarray(x, dtype=np.float64) -
+                     self.mean) @ self.components.T
+        if self.whiten:
+            # Components without variance are not scaled up, they only carry numerical noise
+            variance = self.explained_variance
+            scale = np.sqrt(variance, out=np.full_like(variance, np.inf),
+                            where=variance > 1e-12 * variance.max())
+            projected /= scale
+        return projected
+
+    def to_dict(self) -> dict:
+        """Returns a JSON serializable representation of the projection.
+
+        :return: State of the projection.
+        :rtype: dict
+        """
+        state = {"n_components": self.n_components, "whiten": self.whiten,
+                 "n_samples_seen": self.n_samples_seen}
+        if self.fitted:
+            state["mean"] = self.mean.tolist()
+            state["components"] = self.components.tolist()
+            state["singular_values"] = self.singular_values.tolist()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "IncrementalPCA":
+        """Restores a projection from the representation created by to_dict.
+
+        :param state: State of the projection.
+        :type state: dict
+        :return: Restored projection.
+        :rtype: IncrementalPCA
+        """
+        instance = cls(state["n_components"], state["whiten"])
+        instance.n_samples_seen = state["n_samples_seen"]
+        if "components" in state:
+            instance.mean = np.array(state["mean"])
+            instance.components = np.array(state["components"])
+            instance.singular_values = np.array(state["singular_values"])
+        return instance
+
+    def __str__(self) -> str:
+        return f"IncrementalPCA(n_components={self.n_components}, whiten={self.whiten})"
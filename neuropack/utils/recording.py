@@ -1,16 +1,18 @@
 from time import time
-from typing import Union
+from typing import List, Optional, Union
 
-from ..containers import EEGContainer, LiveEEGContainer
+from ..containers import EEGContainer, IngestionStage, LiveEEGContainer
 from ..devices.base import DeviceBase
+from ..devices.device_group import DeviceGroup
 from ..tasks.base import PersistentTaskBase, TaskBase
+from .logging import AuthLogger
 
 
-def __wait_for_wear(device: DeviceBase, verbose: bool = True):
+def __wait_for_wear(device: Union[DeviceBase, DeviceGroup], verbose: bool = True):
     """Waits for device to be worn.
 
     :param device: Device to check
-    :type device: DeviceBase
+    :type device: Union[DeviceBase, DeviceGroup]
     :param verbose: Print progress to console, defaults to True
     :type verbose: bool, optional
     """
@@ -22,18 +24,26 @@ def __wait_for_wear(device: DeviceBase, verbose: bool = True):
         print("Device is worn.")
 
 
-def record(device: DeviceBase,
+def record(device: Union[DeviceBase, DeviceGroup],
            duration_s: int,
            verbose: bool = True,
            start_on_wear: bool = True,
-           check_worn: bool = True) -> EEGContainer:
+           check_worn: bool = True,
+           report_metrics: bool = False,
+           ingestion: Optional[IngestionStage] = None,
+           merge: bool = True,
+           logger: Optional[AuthLogger] = None) -> Union[EEGContainer, List[EEGContainer]]:
     """Records data from device for a given duration. The data is returned as EEGContainer object.
     If visualize is set to True, the data is also plotted. If verbose is set to True, the progress
     is printed to the console. If check_worn is set to True, the recording will stop if the device
-    is not worn anymore.
-
-    :param device: Device to record from (must be connected)
-    :type device: DeviceBase
+    is not worn anymore. If report_metrics is set to True, the device's throughput and health counters
+    are written to the logger after the recording, or printed if verbose is set to True and no logger
+    is given. If an ingestion stage is provided, every chunk fetched from the device is repaired before
+    being added to the container. If a DeviceGroup is provided, all devices are recorded onto the time
+    base of the group's reference device.
+
+    :param device: Device or group of devices to record from (must be connected)
+    :type device: Union[DeviceBase, DeviceGroup]
     :param duration_s: Duration of recording in seconds
     :type duration_s: int
     :param visualize: Visualize data while recording, defaults to False
@@ -44,8 +54,16 @@ def record(device: DeviceBase,
     :type start_on_wear: bool, optional
     :param check_worn: Check if device is worn, defaults to True
     :type check_worn: bool, optional
+    :param report_metrics: Report device metrics after recording, defaults to False
+    :type report_metrics: bool, optional
+    :param ingestion: Ingestion stage repairing gaps and duplicate samples, defaults to None
+    :type ingestion: Optional[IngestionStage], optional
+    :param merge: Only used for DeviceGroups. If True, returns one merged container, else one container per device sharing one MarkerVault. defaults to True
+    :type merge: bool, optional
+    :param logger: Logger device metrics are written to, defaults to None
+    :type logger: Optional[AuthLogger], optional
     :return: Recorded data
-    :rtype: Union[EEGContainer,LiveEEGContainer]
+    :rtype: Union[EEGContainer, LiveEEGContainer, List[EEGContainer]]
     """
 
     def vprint(t):
@@ -53,6 +71,13 @@ def record(device: DeviceBase,
         if verbose:
             print(t)
 
+    def report(d: DeviceBase):
+        """Writes the metrics of a device to the logger, or prints them if no logger is given."""
+        if logger is not None:
+            logger.log_metrics(d.get_metrics())
+        else:
+            vprint(d.get_metrics())
+
     assert device.is_connected(), "Device must be connected to record data."
     assert duration_s > 0, "Duration must be greater than 0."
 
@@ -60,9 +85,21 @@ def record(device: DeviceBase,
     if start_on_wear:
         __wait_for_wear(device, verbose)
 
+    # Groups take care of their devices themselves
+    if isinstance(device, DeviceGroup):
+        vprint("Starting recording...")
+        recording = device.record(duration_s, merge, check_worn, ingestion)
+        vprint("Recording finished.")
+        if report_metrics:
+            for d in device.devices:
+                report(d)
+        return recording
+
     # Create container
     params = [device.channel_names, device.sample_rate]
     container = EEGContainer(*params)
+    if ingestion:
+        ingestion.reset()
 
     # Start stream
     vprint("Starting stream...")
@@ -77,7 +114,11 @@ def record(device: DeviceBase,
             vprint("Device is not worn anymore. Stopping recording.")
             break
         if device.has_data():
-            container.add_data(device.fetch_data())
+            chunk = device.fetch_chunk()
+            if ingestion:
+                ingestion.ingest(container, chunk)
+            else:
+                container.add_chunk(chunk)
     vprint("Recording finished.")
     samp = len(container)
     vprint(f"Recorded {samp} samples.")
@@ -86,21 +127,29 @@ def record(device: DeviceBase,
     device.stop_stream()
     vprint("Stopped stream.")
 
+    if report_metrics:
+        report(device)
+
     return container
 
 
-def record_erp(device: DeviceBase,
+def record_erp(device: Union[DeviceBase, DeviceGroup],
                acquisition_task: Union[TaskBase, PersistentTaskBase],
                duration_s: int,
                marker: int = 1,
                verbose: bool = True,
                start_on_wear: bool = True,
-               check_worn: bool = True) -> EEGContainer:
+               check_worn: bool = True,
+               ingestion: Optional[IngestionStage] = None,
+               clock_sync: bool = False,
+               merge: bool = True) -> Union[EEGContainer, List[EEGContainer]]:
     """Records data from device for a given duration. The data is returned as EEGContainer object.
-    Returned container also contains marked events for ERP analysis.
+    Returned container also contains marked events for ERP analysis. If clock_sync is set to True,
+    stimulus times are mapped onto the device's time base before events are marked. For DeviceGroups
+    without merging, events are marked in the MarkerVault shared by all returned containers.
 
-    :param device: Device to record from (must be connected)
-    :type device: DeviceBase
+    :param device: Device or group of devices to record from (must be connected)
+    :type device: Union[DeviceBase, DeviceGroup]
     :param acquisition_task: Acquisition task to use
     :type acquisition_task: Union[TaskBase, PersistentTaskBase]
     :param duration_s: Duration of recording in seconds
@@ -113,8 +162,14 @@ def record_erp(device: DeviceBase,
     :type start_on_wear: bool, optional
     :param check_worn: Check if device is worn, defaults to True
     :type check_worn: bool, optional
+    :param ingestion: Ingestion stage repairing gaps and duplicate samples, defaults to None
+    :type ingestion: Optional[IngestionStage], optional
+    :param clock_sync: Correct stimulus times for clock offset and drift between host and device, defaults to False
+    :type clock_sync: bool, optional
+    :param merge: Only used for DeviceGroups. If True, returns one merged container, else one container per device sharing one MarkerVault. defaults to True
+    :type merge: bool, optional
     :return: Recorded data
-    :rtype: EEGContainer
+    :rtype: Union[EEGContainer, List[EEGContainer]]
     """
     def vprint(t):
         """Verbose print function. Prints t if verbose is set to True."""
@@ -132,7 +187,13 @@ def record_erp(device: DeviceBase,
     acquisition_task.start()
 
     # Start recording
-    recording = record(device, duration_s, verbose, False, check_worn)
+    recording = record(device, duration_s, verbose, False, check_worn,
+                       ingestion=ingestion, merge=merge)
+
+    # Containers of a group share one MarkerVault, so marking one suffices
+    container = recording
+    if isinstance(recording, list):
+        container = recording[0]
 
     # Get event times
     vprint("Getting event times...")
@@ -140,10 +201,13 @@ def record_erp(device: DeviceBase,
     while acquisition_task.has_data():
         event_times.append(acquisition_task.fetch_data().timestamp)
 
-    while event_times[0] < recording.timestamps[0]:
+    if clock_sync:
+        event_times = [device.to_device_time(t) for t in event_times]
+
+    while event_times[0] < container.timestamps[0]:
         event_times.pop(0)
 
-    while event_times[-1] > recording.timestamps[-1]:
+    while event_times[-1] > container.timestamps[-1]:
         event_times.pop()
 
     vprint(f"Found {len(event_times)} events.")
@@ -153,6 +217,6 @@ def record_erp(device: DeviceBase,
     vprint("Acquisition task stopped.")
 
     for t in event_times:
-        recording.mark_event(marker, t)
+        container.mark_event(marker, t)
 
     return recording
@@ -0,0 +1,68 @@
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+EIGENVALUE_FLOOR = 1e-10
+
+
+def covariance(signals: NDArray, shrinkage: float = 0, floor: float = EIGENVALUE_FLOOR) -> NDArray:
+    """Channel covariance of every epoch, computed with one einsum over the epoch tensor. Shrinkage towards a scaled
+    identity keeps the matrices positive definite for short or rank deficient epochs. The absolute floor keeps them
+    positive definite for flat epochs, where the scaled identity vanishes.
+
+    :param signals: Signals of shape (..., channels, samples).
+    :type signals: NDArray
+    :param shrinkage: Weight of the scaled identity between 0 and 1, defaults to 0
+    :type shrinkage: float, optional
+    :param floor: Added to the diagonal of every matrix, defaults to EIGENVALUE_FLOOR
+    :type floor: float, optional
+    :return: Covariance matrices of shape (..., channels, channels).
+    :rtype: NDArray
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    centered = signals - signals.mean(axis=-1, keepdims=True)
+    cov = np.einsum("...cn,...dn->...cd", centered,
+                    centered) / max(signals.shape[-1] - 1, 1)
+    if shrinkage:
+        c = cov.shape[-1]
+        mu = np.trace(cov, axis1=-2, axis2=-1)[..., None, None] / c
+        cov = (1 - shrinkage) * cov + shrinkage * mu * np.eye(c)
+    if floor:
+        cov = cov + floor * np.eye(cov.shape[-1])
+    return cov
+
+
+def spd_apply(matrices: NDArray, fn: Callable[[NDArray], NDArray], floor: float = 0) -> NDArray:
+    """Applies a function to the eigenvalues of symmetric positive definite matrices, e.g., np.log for the matrix
+    logarithm. All matrices are decomposed at once. Eigenvalues are clipped to the floor first, so round-off errors
+    of nearly singular matrices cannot reach the function as zero or negative values.
+
+    :param matrices: Matrices of shape (..., n, n).
+    :type matrices: NDArray
+    :param fn: Function applied elementwise to the eigenvalues.
+    :type fn: Callable[[NDArray], NDArray]
+    :param floor: Lower bound of the eigenvalues, defaults to 0
+    :type floor: float, optional
+    :return: Matrices of shape (..., n, n).
+    :rtype: NDArray
+    """
+    w, v = np.linalg.eigh(matrices)
+    if floor:
+        w = np.maximum(w, floor)
+    return (v * fn(w)[..., None, :]) @ np.swapaxes(v, -1, -2)
+
+
+def upper_triangle(matrices: NDArray) -> NDArray:
+    """Vectorizes symmetric matrices. Off-diagonal entries are weighted by sqrt(2), so the euclidean norm of a vector
+    equals the Frobenius norm of its matrix.
+
+    :param matrices: Symmetric matrices of shape (..., n, n).
+    :type matrices: NDArray
+    :return: Vectors of shape (..., n * (n + 1) / 2).
+    :rtype: NDArray
+    """
+    n = matrices.shape[-1]
+    rows, cols = np.triu_indices(n)
+    weights = np.where(rows == cols, 1, np.sqrt(2))
+    return matrices[..., rows, cols] * weights
@@ -0,0 +1,214 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.fft import fft, ifft, irfft, next_fast_len, rfft, rfftfreq
+from scipy.signal import get_window, welch
+from scipy.signal.windows import dpss
+
+
+def autocorrelation(signals: NDArray, max_lag: int,
+                    demean: bool = True) -> NDArray:
+    """Biased autocorrelation of every signal along the last axis, computed through FFT. Lags are normalized by the
+    length of the signal, as in the maximum likelihood estimate.
+
+    :param signals: Signals of shape (..., samples).
+    :type signals: NDArray
+    :param max_lag: Largest lag to compute.
+    :type max_lag: int
+    :param demean: Remove the mean of each signal first, defaults to True
+    :type demean: bool, optional
+    :return: Autocorrelation of shape (..., max_lag + 1) for lags 0 to max_lag.
+    :rtype: NDArray
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    if demean:
+        signals = signals - signals.mean(axis=-1, keepdims=True)
+    n = signals.shape[-1]
+    nfft = next_fast_len(2 * n - 1, real=True)
+    spectrum = rfft(signals, nfft, axis=-1)
+    r = irfft(spectrum.real**2 + spectrum.imag**2, nfft, axis=-1)
+    return r[..., :max_lag + 1] / n
+
+
+def levinson_durbin(r: NDArray, order: int) -> Tuple[NDArray, NDArray]:
+    """Solves the Yule-Walker equations for many autocorrelation sequences at once using the Levinson-Durbin recursion.
+    Sequences without variance yield zero coefficients.
+
+    :param r: Autocorrelation of shape (..., lags) with at least order + 1 lags.
+    :type r: NDArray
+    :param order: Order of the AR model.
+    :type order: int
+    :return: AR coefficients of shape (..., order) and the variance of the innovations of shape (...).
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    r = np.asarray(r, dtype=np.float64)
+    a = np.zeros(r.shape[:-1] + (order,))
+    err = r[..., 0].copy()
+    for k in range(order):
+        acc = r[..., k + 1] - np.sum(a[..., :k] * r[..., k:0:-1], axis=-1)
+        kappa = np.divide(acc, err, out=np.zeros_like(acc), where=err > 0)
+        if k:
+            a[..., :k] -= kappa[..., None] * a[..., k - 1::-1]
+        a[..., k] = kappa
+        err = err * (1 - kappa**2)
+    return a, err
+
+
+def yule_walker(signals: NDArray, order: int) -> Tuple[NDArray, NDArray]:
+    """Estimates AR coefficients of every signal along the last axis. Equivalent to
+    statsmodels.regression.yule_walker(x, order, method="mle") for each signal.
+
+    :param signals: Signals of shape (..., samples).
+    :type signals: NDArray
+    :param order: Order of the AR model.
+    :type order: int
+    :return: AR coefficients of shape (..., order) and the standard deviation of the innovations of shape (...).
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    rho, err = levinson_durbin(autocorrelation(signals, order), order)
+    return rho, np.sqrt(np.maximum(err, 0))
+
+
+@lru_cache(maxsize=32)
+def spectral_window(window: str, n: int) -> NDArray:
+    """Returns the cached window of length n. The returned array is shared and must not be modified.
+
+    :param window: Name of the window as accepted by scipy.signal.get_window.
+    :type window: str
+    :param n: Length of the window.
+    :type n: int
+    :return: Window of shape (n,).
+    :rtype: NDArray
+    """
+    return get_window(window, n)
+
+
+@lru_cache(maxsize=32)
+def dpss_tapers(n: int, nw: float, k: int) -> NDArray:
+    """Returns the cached discrete prolate spheroidal sequences used as tapers for multitaper estimates. The returned
+    array is shared and must not be modified.
+
+    :param n: Length of the tapers.
+    :type n: int
+    :param nw: Time-halfbandwidth product.
+    :type nw: float
+    :param k: Number of tapers.
+    :type k: int
+    :return: Tapers of shape (k, n) with unit energy.
+    :rtype: NDArray
+    """
+    return dpss(n, nw, Kmax=k)
+
+
+def welch_psd(signals: NDArray, sample_rate: float, nperseg: int,
+              noverlap: Optional[int] = None,
+              window: str = "hann") -> Tuple[NDArray, NDArray]:
+    """Power spectral density of every signal along the last axis using Welch's method.
+
+    :param signals: Signals of shape (..., samples).
+    :type signals: NDArray
+    :param sample_rate: Sample rate of the signals.
+    :type sample_rate: float
+    :param nperseg: Length of each segment.
+    :type nperseg: int
+    :param noverlap: Number of samples shared by consecutive segments. If None, segments overlap by half. defaults to None
+    :type noverlap: Optional[int], optional
+    :param window: Window applied to each segment, defaults to "hann"
+    :type window: str, optional
+    :return: Power spectral density of shape (..., nperseg // 2 + 1) and the frequencies.
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    freqs, psd = welch(signals, sample_rate, window=spectral_window(window, nperseg),
+                       nperseg=nperseg, noverlap=noverlap, axis=-1)
+    return psd, freqs
+
+
+def multitaper_psd(signals: NDArray, sample_rate: float, nw: float = 4,
+                   k: Optional[int] = None) -> Tuple[NDArray, NDArray]:
+    """Power spectral density of every signal along the last axis using the multitaper method. Each signal is
+    tapered with k DPSS tapers and the periodograms of all tapers are averaged.
+
+    :param signals: Signals of shape (..., samples).
+    :type signals: NDArray
+    :param sample_rate: Sample rate of the signals.
+    :type sample_rate: float
+    :param nw: Time-halfbandwidth product, defaults to 4
+    :type nw: float, optional
+    :param k: Number of tapers. If None, 2 * nw - 1 tapers are used. defaults to None
+    :type k: Optional[int], optional
+    :return: Power spectral density of shape (..., samples // 2 + 1) and the frequencies.
+    :rtype: Tuple[NDArray, NDArray]
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    n = signals.shape[-1]
+    if k is None:
+        k = max(1, int(2 * nw) - 1)
+    tapers = dpss_tapers(n, nw, k)
+
+    signals = signals - signals.mean(axis=-1, keepdims=True)
+    spectrum = rfft(signals[..., None, :] * tapers, axis=-1)
+    psd = np.mean(spectrum.real**2 + spectrum.imag**2, axis=-2) / sample_rate
+
+    # One-sided density: fold negative frequencies onto positive ones
+    psd[..., 1:(n + 1) // 2] *= 2
+    return psd, rfftfreq(n, 1 / sample_rate)
+
+
+@lru_cache(maxsize=32)
+def morlet_wavelets(freqs: Tuple[float, ...], sample_rate: float,
+                    n_cycles: float = 7) -> NDArray:
+    """Returns cached complex Morlet wavelets. All wavelets share the odd length needed by the lowest frequency and
+    are centered. Wavelets are scaled so that a sinusoid of amplitude A at the center frequency yields a transform of
+    magnitude A. The returned array is shared and must not be modified.
+
+    :param freqs: Center frequencies.
+    :type freqs: Tuple[float, ...]
+    :param sample_rate: Sample rate of the signals.
+    :type sample_rate: float
+    :param n_cycles: Number of cycles within one standard deviation of the gaussian times 2 pi, defaults to 7
+    :type n_cycles: float, optional
+    :return: Wavelets of shape (frequencies, length).
+    :rtype: NDArray
+    """
+    freqs = np.asarray(freqs, dtype=np.float64)
+    sigma = n_cycles / (2 * np.pi * freqs)
+    half = int(np.ceil(3.5 * sigma.max() * sample_rate))
+    t = np.arange(-half, half + 1) / sample_rate
+    gauss = np.exp(-t**2 / (2 * sigma[:, None]**2))
+    gauss /= gauss.sum(axis=-1, keepdims=True) / 2
+    return gauss * np.exp(2j * np.pi * freqs[:, None] * t)
+
+
+@lru_cache(maxsize=32)
+def _wavelet_spectra(freqs: Tuple[float, ...], sample_rate: float,
+                     n_cycles: float, nfft: int) -> NDArray:
+    return fft(morlet_wavelets(freqs, sample_rate, n_cycles), nfft, axis=-1)
+
+
+def morlet_transform(signals: NDArray, sample_rate: float, freqs: Tuple[float, ...],
+                     n_cycles: float = 7) -> NDArray:
+    """Convolves every signal along the last axis with complex Morlet wavelets. All signals and wavelets are convolved
+    in one pass through FFT, spectra of the wavelets are cached per sample rate and signal length. The output is
+    aligned with the input, signals are zero padded at the edges.
+
+    :param signals: Signals of shape (..., samples).
+    :type signals: NDArray
+    :param sample_rate: Sample rate of the signals.
+    :type sample_rate: float
+    :param freqs: Center frequencies.
+    :type freqs: Tuple[float, ...]
+    :param n_cycles: Number of cycles of the wavelets, defaults to 7
+    :type n_cycles: float, optional
+    :return: Complex time-frequency map of shape (..., frequencies, samples).
+    :rtype: NDArray
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    n = signals.shape[-1]
+    length = morlet_wavelets(tuple(freqs), sample_rate, n_cycles).shape[-1]
+    nfft = next_fast_len(n + length - 1)
+    spectra = _wavelet_spectra(tuple(freqs), sample_rate, n_cycles, nfft)
+    tfr = ifft(fft(signals, nfft, axis=-1)[..., None, :] * spectra, axis=-1)
+    half = length // 2
+    return tfr[..., half:half + n]
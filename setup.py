@@ -23,7 +23,6 @@ setup(
         'play_sounds',
         'scipy',
         'matplotlib',
-        'statsmodels',
         'brainflow',
         'numpy',
         "pyEDFlib"],
@@ -0,0 +1,99 @@
+import asyncio
+import unittest
+
+from neuropack.devices.async_device import AsyncDevice
+from neuropack.devices.base import BCISignal, DeviceBase
+
+
+class CountingDevice(DeviceBase):
+    def __init__(self, num_samples: int, worn_after: int = 0):
+        super().__init__()
+        self.channel_names = ["Ch1", "Ch2"]
+        self.sample_rate = 100
+        self.removal_time_stamp = 0
+        self._samples = [BCISignal(i / 100, [i, -i]) for i in range(num_samples)]
+        self._worn_after = worn_after
+        self._connected = False
+        self._streaming = False
+
+    def start_stream(self):
+        self._streaming = True
+
+    def stop_stream(self):
+        self._streaming = False
+
+    def connect(self, timeout: int = 20, raise_exception: bool = True):
+        self._connected = True
+        return True
+
+    def disconnect(self):
+        self._connected = False
+
+    def fetch_data(self) -> BCISignal:
+        return self._samples.pop(0)
+
+    def has_data(self) -> bool:
+        return self._streaming and len(self._samples) > 0
+
+    def is_worn(self) -> bool:
+        self._worn_after -= 1
+        return self._worn_after < 0
+
+    def is_connected(self) -> bool:
+        return self._connected and len(self._samples) > 0
+
+
+class AsyncDeviceTests(unittest.TestCase):
+    def test_stream_chunks(self):
+        """Check, that all samples are streamed in bounded chunks.
+        """
+        # arrange
+        device = AsyncDevice(CountingDevice(50), max_chunk_samples=16)
+
+        async def consume():
+            chunks = []
+            async with device:
+                async for chunk in device.stream():
+                    chunks.append(chunk)
+            return chunks
+
+        # action
+        chunks = asyncio.run(consume())
+
+        # check
+        self.assertEqual(sum(len(c) for c in chunks), 50)
+        self.assertLessEqual(max(len(c) for c in chunks), 16)
+        self.assertEqual(chunks[0].signals.shape, (2, 16))
+        self.assertFalse(device.is_connected(), "Device was not disconnected.")
+
+    def test_multiple_devices(self):
+        """Check, that several devices can be recorded concurrently on one loop.
+        """
+        # arrange
+        devices = [AsyncDevice(CountingDevice(n)) for n in (30, 40, 50)]
+
+        async def record_all():
+            for d in devices:
+                await d.connect()
+            return await asyncio.gather(*[d.record(5) for d in devices])
+
+        # action
+        containers = asyncio.run(record_all())
+
+        # check
+        self.assertListEqual([len(c) for c in containers], [30, 40, 50])
+        self.assertListEqual(containers[0]["Ch1"], list(range(30)))
+
+    def test_wait_until_worn(self):
+        """Check, that waiting polls the device until it is worn, instead of failing on the first check.
+        """
+        # arrange
+        wrapped = CountingDevice(1, worn_after=3)
+        device = AsyncDevice(wrapped, poll_interval=0)
+
+        # action
+        worn = asyncio.run(device.wait_until_worn(timeout=1))
+
+        # check
+        self.assertTrue(worn)
+        self.assertLess(wrapped._worn_after, 0, "Device was not polled until worn.")
@@ -92,3 +92,21 @@ class TemplateDatabaseTests(unittest.TestCase):
             database,
             database2,
             "Database constructed from saved json is not equal to original one.")
+
+    def test_state_json(self):
+        """Check, that model states are stored under a reserved key and restored from json.
+        """
+        # arrange
+        database = TemplateDatabase.construct_from_dict(
+            {"ps1": [np.array([1, 2, 3])]})
+        database.set_state("projection", {"n_components": 2, "mean": [0.5, 1.5]})
+
+        # action
+        database2 = TemplateDatabase.construct_from_json(database.to_json())
+
+        # check
+        self.assertListEqual(database2.get_all_idents(), ["ps1"])
+        self.assertDictEqual(database2.get_state("projection"),
+                             {"n_components": 2, "mean": [0.5, 1.5]})
+        self.assertIsNone(database2.get_state("missing"))
+        self.assertEqual(database, database2)
@@ -0,0 +1,38 @@
+import unittest
+
+from brainflow.board_shim import BoardIds, BoardShim, BrainFlowInputParams
+
+from neuropack.devices.brainflow import BrainFlowDevice
+
+
+class BrainFlowDeviceTests(unittest.TestCase):
+    def setUp(self):
+        BoardShim.disable_board_logger()
+        self.device = BrainFlowDevice(
+            BoardIds.SYNTHETIC_BOARD, BrainFlowInputParams())
+
+    def tearDown(self):
+        self.device.disconnect()
+
+    def test_reconnect(self):
+        """Check, that metrics and clock synchronization of a previous connection are reset on reconnect.
+        """
+        # arrange
+        self.device.connect(timeout=10)
+        self.device.disconnect()
+        self.device.monitor.record_chunk([0, 1], self.device.sample_rate, 0, 0)
+        self.device.monitor.record_disconnect()
+        for i in range(16):
+            self.device.clock.update(i, 1e6 + i)
+
+        # action
+        connected = self.device.connect(timeout=10)
+
+        # check
+        metrics = self.device.get_metrics()
+        self.assertTrue(connected)
+        self.assertEqual(metrics.disconnects, 0)
+        self.assertLess(metrics.lost_samples, self.device.sample_rate,
+                        "Samples between both connections were counted as lost.")
+        self.assertLess(abs(self.device.clock.offset), 1,
+                        "Clock of the previous connection was used.")
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from neuropack.devices.clock_sync import ClockSync
+
+
+class ClockSyncTests(unittest.TestCase):
+    def test_unsynchronized_identity(self):
+        """Check, that host time is mapped unchanged before enough observations were made.
+        """
+        # arrange
+        clock = ClockSync(min_points=8)
+        clock.update(10, 12)
+
+        # action
+        mapped = clock.to_device_time(20)
+
+        # check
+        self.assertFalse(clock.is_synchronized())
+        self.assertEqual(mapped, 20)
+
+    def test_offset_and_drift(self):
+        """Check, that offset and drift are recovered despite random transport delays and outliers.
+        """
+        # arrange
+        rng = np.random.default_rng(42)
+        clock = ClockSync(window=256)
+        offset = 0.25
+        drift = 5e-4
+        host_start = 1000
+        device_times = np.arange(256) * 0.5 + host_start
+        true_host = (device_times - offset - drift * host_start) / (1 + drift)
+        delays = 0.002 + rng.exponential(0.01, len(device_times))
+        delays[::50] += 0.5
+        for h, d in zip(true_host + delays, device_times):
+            clock.update(h, d)
+
+        # action
+        mapped = clock.to_device_time(true_host)
+        restored = clock.to_host_time(mapped)
+
+        # check
+        self.assertAlmostEqual(clock.drift, drift, delta=1e-4)
+        self.assertTrue(np.allclose(mapped, device_times, atol=0.005),
+                        "Mapped host times deviate from device times.")
+        self.assertTrue(np.allclose(restored, true_host),
+                        "Mapping to host time is not the inverse.")
+        self.assertGreater(clock.latency, 0)
+
+    def test_reset(self):
+        """Check, that observations made before a reset are not used for the fit.
+        """
+        # arrange
+        clock = ClockSync(min_points=8)
+        for i in range(16):
+            clock.update(i, i + 100)
+        clock.to_device_time(0)
+
+        # action
+        clock.reset()
+        for i in range(16):
+            clock.update(i, i + 5)
+
+        # check
+        self.assertAlmostEqual(clock.offset, 5)
+        self.assertAlmostEqual(clock.to_device_time(20), 25)
@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from neuropack.devices.base import BCISignal, DeviceBase
+from neuropack.devices.device_group import DeviceGroup
+
+
+class RampDevice(DeviceBase):
+    def __init__(self, sample_rate: int, start: float, duration: float):
+        super().__init__()
+        self.channel_names = ["Ch1", "Ch2"]
+        self.sample_rate = sample_rate
+        self.removal_time_stamp = 0
+        timestamps = start + np.arange(int(duration * sample_rate)) / sample_rate
+        self._samples = [BCISignal(t, [t, 2 * t]) for t in timestamps]
+        self._connected = False
+
+    def start_stream(self):
+        pass
+
+    def stop_stream(self):
+        pass
+
+    def connect(self, timeout: int = 20, raise_exception: bool = True):
+        self._connected = True
+        return True
+
+    def disconnect(self):
+        self._connected = False
+
+    def fetch_data(self) -> BCISignal:
+        return self._samples.pop(0)
+
+    def has_data(self) -> bool:
+        return len(self._samples) > 0
+
+    def is_worn(self) -> bool:
+        return True
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+
+class DeviceGroupTests(unittest.TestCase):
+    def test_merged_recording(self):
+        """Check, that devices with different sample rates are merged onto the reference time base.
+        """
+        # arrange
+        group = DeviceGroup(RampDevice(100, 0, 2), RampDevice(250, 0.5, 2))
+        group.connect()
+
+        # action
+        recording = group.record(0.2)
+
+        # check
+        self.assertListEqual(recording.channel_names,
+                             ["D0_Ch1", "D0_Ch2", "D1_Ch1", "D1_Ch2"])
+        self.assertEqual(len(recording), 200)
+        self.assertTrue(np.allclose(recording["D1_Ch2"][50:], 2 * np.arange(50, 200) / 100),
+                        "Signals were not interpolated onto reference time base.")
+        self.assertEqual(len(recording.invalid_spans), 1,
+                         "Expected uncovered start to be invalid.")
+
+    def test_shared_marker_vault(self):
+        """Check, that per-device containers share one MarkerVault.
+        """
+        # arrange
+        group = DeviceGroup(RampDevice(100, 0, 2), RampDevice(250, 0, 2))
+        group.connect()
+        containers = group.record(0.2, merge=False)
+
+        # action
+        containers[0].mark_event(1, 1.0)
+        events = [c.get_events(1, 100, 100) for c in containers]
+
+        # check
+        self.assertEqual(len(containers), 2)
+        self.assertEqual(len(events[1]), 1, "Marker not visible in second container.")
+        self.assertEqual(len(events[0][0]), 21)
+        self.assertEqual(len(events[1][0]), 51)
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from neuropack.devices.metrics import DeviceMetrics, DeviceMonitor
+
+
+class DeviceMonitorTests(unittest.TestCase):
+    def test_empty_snapshot(self):
+        """Check, that a monitor without any chunks returns an empty snapshot.
+        """
+        # arrange
+        monitor = DeviceMonitor()
+
+        # action
+        metrics = monitor.snapshot(256)
+
+        # check
+        self.assertEqual(metrics, DeviceMetrics(),
+                         "Snapshot of unused monitor is not empty.")
+
+    def test_chunk_counters(self):
+        """Check, that chunk sizes and queue depth are tracked.
+        """
+        # arrange
+        monitor = DeviceMonitor()
+
+        # action
+        monitor.record_chunk(np.arange(10) / 256, 256, 0.002, 10)
+        monitor.record_chunk(np.arange(10, 40) / 256, 256, 0.004, 3)
+
+        # check
+        metrics = monitor.snapshot(256)
+        self.assertEqual(metrics.total_samples, 40)
+        self.assertEqual(metrics.chunk_count, 2)
+        self.assertEqual(metrics.chunk_size_min, 10)
+        self.assertEqual(metrics.chunk_size_max, 30)
+        self.assertEqual(metrics.queue_depth, 3)
+        self.assertEqual(metrics.queue_high_water, 10)
+        self.assertAlmostEqual(metrics.gather_latency_max_ms, 4)
+        self.assertEqual(metrics.timestamp_gaps, 0,
+                         "Found gaps in continuous timestamps.")
+
+    def test_gap_detection(self):
+        """Check, that gaps within and between chunks are detected.
+        """
+        # arrange
+        monitor = DeviceMonitor()
+        timestamps = np.arange(100) / 100
+        # Drop 3 samples inside the first chunk and 5 samples between chunks
+        first = np.delete(timestamps[:50], [20, 21, 22])
+        second = timestamps[55:]
+
+        # action
+        monitor.record_chunk(first, 100, 0, 0)
+        monitor.record_chunk(second, 100, 0, 0)
+
+        # check
+        metrics = monitor.snapshot(100)
+        self.assertEqual(metrics.timestamp_gaps, 2, "Expected two gaps.")
+        self.assertEqual(metrics.lost_samples, 8, "Expected 8 lost samples.")
+
+    def test_wear_transitions(self):
+        # arrange
+        monitor = DeviceMonitor()
+
+        # action
+        monitor.record_wear_transition()
+        monitor.record_wear_transition()
+        monitor.record_disconnect()
+
+        # check
+        metrics = monitor.snapshot(256)
+        self.assertEqual(metrics.wear_transitions, 2)
+        self.assertEqual(metrics.disconnects, 1)
@@ -0,0 +1,345 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+from scipy.linalg import eigvalsh, expm, logm
+from scipy.signal import welch
+
+from neuropack.containers import EEGContainer, EventContainer
+from neuropack.keywave import TemplateDatabase
+from neuropack import feature_extraction
+from neuropack.feature_extraction import (AdaptedPACModel, AverageModel,
+                                          BandpowerModel, CachedModel,
+                                          EpochBatch,
+                                          FeatureExtractionModelBase,
+                                          FeatureUnion,
+                                          MorletModel, MultitaperBandpowerModel,
+                                          PACModel,
+                                          ProjectedModel, SlidingBandpower,
+                                          TangentSpaceModel,
+                                          WelchBandpowerModel)
+
+
+def create_epochs(n: int):
+    rng = np.random.default_rng(0)
+    return [EventContainer(["Ch0", "Ch1", "Ch2"], 256, list(rng.normal(size=(3, 256))),
+                           (np.arange(256) - 51) / 256)
+            for _ in range(n)]
+
+
+class SumModel(FeatureExtractionModelBase):
+    def extract_features(self, ev):
+        return np.sum(ev.signals, axis=1)
+
+
+class FeatureExtractionTests(unittest.TestCase):
+    def test_batch_matches_single(self):
+        """Check, that batched feature extraction matches extracting features of each event.
+        """
+        # arrange
+        epochs = create_epochs(5)
+        models = [AverageModel(), AverageModel("Ch0", "Ch2"), BandpowerModel(),
+                  BandpowerModel([(1, 4, True), (4, 8), (8, 12), (12, 40)]),
+                  PACModel(), AdaptedPACModel(6), WelchBandpowerModel(),
+                  MultitaperBandpowerModel(nw=2), SumModel(),
+                  FeatureUnion(BandpowerModel(), SumModel()),
+                  CachedModel(PACModel()), MorletModel(),
+                  TangentSpaceModel().partial_fit(epochs)]
+
+        for model in models:
+            # action
+            batch = model.extract_batch(epochs)
+
+            # check
+            expected = np.stack([model.extract_features(e) for e in epochs])
+            self.assertEqual(batch.shape, expected.shape, str(model))
+            self.assertTrue(np.allclose(batch, expected), str(model))
+
+    def test_cached_power_spectrum(self):
+        """Check, that a batch computes its power spectrum once and matches the containers' power spectrum.
+        """
+        # arrange
+        epochs = create_epochs(3)
+        batch = EpochBatch.create(epochs)
+
+        # action
+        power, freqs = batch.power_spectrum()
+
+        # check
+        self.assertIs(batch.power_spectrum()[0], power)
+        expected = epochs[1].power_spectrum()
+        self.assertTrue(np.allclose(freqs, expected[-1]))
+        self.assertTrue(np.allclose(power[1], expected[:-1]))
+
+    def test_band_plan(self):
+        """Check, that band plans match averaging masked power spectra and are reused between batches.
+        """
+        # arrange
+        epochs = create_epochs(4)
+        bands = [(0, 10, True), (10, 13), (13, 30), (30, 50)]
+        power, freqs = EpochBatch.create(epochs).power_spectrum()
+        expected = np.stack([power[..., (freqs >= 0) & (freqs <= 10)].mean(axis=-1),
+                             power[..., (freqs > 10) & (freqs <= 13)].mean(axis=-1),
+                             power[..., (freqs > 13) & (freqs <= 30)].mean(axis=-1),
+                             power[..., (freqs > 30) & (freqs <= 50)].mean(axis=-1)], axis=-1)
+        feature_extraction.band_plan.cache_clear()
+
+        # action
+        first = EpochBatch.create(epochs).band_means(bands)
+        second = EpochBatch.create(epochs[:2]).band_means(bands)
+
+        # check
+        self.assertTrue(np.allclose(first, expected))
+        self.assertTrue(np.allclose(second, expected[:2]))
+        self.assertEqual(feature_extraction.band_plan.cache_info().misses, 1,
+                         "Expected one plan per shape and band definition.")
+
+    def test_welch_bandpower(self):
+        """Check, that Welch band power matches averaging scipy's Welch estimate within each band.
+        """
+        # arrange
+        epochs = create_epochs(6)
+        freqs, psd = welch(np.array([e.signals for e in epochs]), 256, nperseg=128, axis=-1)
+        mask = (freqs > 8) & (freqs <= 30)
+
+        # action
+        features = WelchBandpowerModel([(8, 30)]).extract_batch(epochs)
+
+        # check
+        self.assertTrue(np.allclose(features, psd[..., mask].mean(axis=-1)))
+        self.assertTrue(np.allclose(features.mean(), 1 / 128, rtol=0.2),
+                        "Expected the density of white noise.")
+
+    def test_multitaper_variance(self):
+        """Check, that multitaper band power varies less between noise events than the periodogram.
+        """
+        # arrange
+        epochs = create_epochs(40)
+        power, freqs = EpochBatch.create(epochs).power_spectrum()
+        periodogram = np.mean(power[..., (freqs > 8) & (freqs <= 12)]**2, axis=-1)
+
+        # action
+        features = MultitaperBandpowerModel([(8, 12)], nw=3).extract_batch(epochs)
+
+        # check
+        self.assertEqual(features.shape, (40, 3))
+        self.assertTrue(np.allclose(features.mean(), 1 / 128, rtol=0.2),
+                        "Expected the density of white noise.")
+        self.assertLess(features.std(axis=0).mean() / features.mean(),
+                        0.8 * periodogram.std(axis=0).mean() / periodogram.mean())
+
+    def test_feature_union(self):
+        """Check, that a union concatenates the features of its models and computes shared intermediates once.
+        """
+        # arrange
+        epochs = create_epochs(5)
+        models = [BandpowerModel(), PACModel(), AdaptedPACModel(6),
+                  AverageModel("Ch0", "Ch1"), AverageModel("Ch0", "Ch1"), SumModel()]
+        expected = np.concatenate([m.extract_batch(epochs) for m in models], axis=1)
+
+        # action
+        with mock.patch.object(feature_extraction, "rfft", wraps=feature_extraction.rfft) as ffts, \
+                mock.patch.object(feature_extraction, "autocorrelation",
+                                  wraps=feature_extraction.autocorrelation) as correlations:
+            features = FeatureUnion(*models).extract_batch(epochs)
+
+        # check
+        self.assertTrue(np.allclose(features, expected))
+        self.assertEqual(ffts.call_count, 1, "Power spectrum was not shared.")
+        self.assertEqual(correlations.call_count, 1,
+                         "Autocorrelation was not shared.")
+
+    def test_cached_model(self):
+        """Check, that a cached model extracts features of repeated events once and returns equal features.
+        """
+        # arrange
+        epochs = create_epochs(4)
+        expected = PACModel().extract_batch(epochs)
+        model = CachedModel(PACModel())
+        model.extract_batch(epochs[:2])
+
+        # action
+        with mock.patch.object(PACModel, "extract_batch", wraps=model.model.extract_batch) as extract:
+            features = model.extract_batch(epochs)
+            single = model.extract_features(epochs[3])
+
+        # check
+        self.assertTrue(np.allclose(features, expected))
+        self.assertTrue(np.allclose(single, expected[3]))
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(len(extract.call_args.args[0]), 2, "Cached events were extracted again.")
+        self.assertEqual(model.stats.hits, 3)
+        self.assertEqual(model.stats.misses, 4)
+        self.assertEqual(model.stats.entries, 4)
+
+    def test_cached_model_eviction(self):
+        """Check, that least recently used features are evicted once the byte budget is exceeded.
+        """
+        # arrange
+        epochs = create_epochs(4)
+        model = CachedModel(AverageModel(), max_bytes=3 * 256 * 8)
+
+        # action
+        for e in epochs:
+            model.extract_features(e)
+        model.extract_features(epochs[0])
+
+        # check
+        self.assertEqual(model.stats.entries, 3)
+        self.assertEqual(model.stats.evictions, 2)
+        self.assertEqual(model.stats.size_bytes, 3 * 256 * 8)
+        self.assertEqual(model.stats.hits, 0)
+
+    def test_cached_fitted_models(self):
+        """Check, that cached features of fitted models are not reused after refitting or restoring their state.
+        """
+        # arrange
+        epochs = create_epochs(20)
+        rng = np.random.default_rng(7)
+        for e in epochs[10:]:
+            e.signals = list(rng.normal(size=(3, 256)) * [[1], [10], [100]])
+        database = TemplateDatabase()
+        TangentSpaceModel().partial_fit(epochs[10:]).store(database)
+        projected = CachedModel(ProjectedModel(AverageModel(), 4).partial_fit(epochs[:10]))
+        tangent = CachedModel(TangentSpaceModel().partial_fit(epochs[:10]))
+        before = [projected.extract_batch(epochs[:3]), tangent.extract_batch(epochs[:3])]
+
+        # action
+        projected.model.partial_fit(epochs[10:])
+        tangent.model.restore(database)
+        after = [projected.extract_batch(epochs[:3]), tangent.extract_batch(epochs[:3])]
+
+        # check
+        for cached, model, previous in zip(after, [projected.model, tangent.model], before):
+            self.assertTrue(np.allclose(cached, model.extract_batch(epochs[:3])))
+            self.assertFalse(np.allclose(cached, previous))
+        self.assertEqual(projected.stats.hits, 0)
+        self.assertEqual(tangent.stats.hits, 0)
+
+    def test_projected_model(self):
+        """Check, that projected templates are shorter and survive storing the projection with the database.
+        """
+        # arrange
+        epochs = create_epochs(20)
+        model = ProjectedModel(AverageModel(), 8).partial_fit(epochs[:12])
+        database = TemplateDatabase()
+        model.store(database)
+        expected = model.extract_batch(epochs[12:])
+
+        # action
+        restored = ProjectedModel(AverageModel(), 8)
+        found = restored.restore(
+            TemplateDatabase.construct_from_json(database.to_json()))
+
+        # check
+        self.assertTrue(found)
+        self.assertEqual(expected.shape, (8, 8))
+        self.assertTrue(np.allclose(restored.extract_batch(epochs[12:]), expected))
+        self.assertTrue(np.allclose(restored.extract_features(epochs[13]), expected[1]))
+        self.assertFalse(ProjectedModel(AverageModel(), 8).restore(TemplateDatabase()))
+
+    def test_sliding_windows(self):
+        """Check, that windows of a recording are views of its signals.
+        """
+        # arrange
+        container = EEGContainer(["Ch0", "Ch1"], 256)
+        container.signals = np.random.default_rng(5).normal(size=(2, 1000))
+        container.timestamps = np.arange(1000) / 256
+
+        # action
+        batch = EpochBatch.sliding(container, 1, 0.25)
+
+        # check
+        self.assertEqual(batch.signals.shape, (12, 2, 256))
+        self.assertTrue(np.shares_memory(batch.signals, container.signals))
+        self.assertTrue(np.array_equal(batch.signals[3], container.signals[:, 192:448]))
+
+    def test_sliding_bandpower(self):
+        """Check, that sliding band power matches band power of each window, also if the stream arrives in chunks.
+        """
+        # arrange
+        container = EEGContainer(["Ch0", "Ch1", "Ch2"], 256)
+        container.signals = np.random.default_rng(6).normal(size=(3, 3000))
+        container.timestamps = np.arange(3000) / 256
+        bands = [(1, 4, True), (8, 12), (12, 30)]
+        bounds = [0, 100, 101, 700, 1500, 3000]
+
+        # Small steps use the sliding DFT, larger steps the FFT of each window
+        for step_s, step in [(0.1, 26), (2 / 256, 2)]:
+            with self.subTest(step=step):
+                expected = BandpowerModel(bands).extract_batch(
+                    EpochBatch.sliding(container, 1, step_s))
+                sliding = SlidingBandpower(256, 1, step_s, bands)
+
+                # action
+                features, timestamps = sliding.apply(container)
+                chunked = np.vstack([sliding.process(container.signals[:, s:e])
+                                     for s, e in zip(bounds[:-1], bounds[1:])])
+
+                # check
+                self.assertEqual(features.shape, expected.shape)
+                self.assertTrue(np.allclose(features, expected))
+                self.assertTrue(np.allclose(chunked, expected))
+                self.assertAlmostEqual(timestamps[1], (step + 255) / 256)
+        self.assertTrue(SlidingBandpower(256, 1, 0.1, bands)._use_fft)
+        self.assertFalse(sliding._use_fft)
+
+    def test_morlet_model(self):
+        """Check, that time-frequency features locate a burst in band and time.
+        """
+        # arrange
+        t = np.arange(512) / 256
+        signals = np.zeros((2, 512))
+        signals[1, 256:384] = 3 * np.sin(2 * np.pi * 20 * t[256:384])
+        epochs = [EventContainer(["Ch0", "Ch1"], 256, list(signals), t)]
+        model = MorletModel([(4, 8), (15, 25)], time_bins=4)
+
+        # action
+        features = model.extract_batch(epochs).reshape(2, 2, 4)
+
+        # check
+        self.assertTrue(np.allclose(features[0], 0))
+        self.assertEqual(np.unravel_index(features[1].argmax(), (2, 4)), (1, 2))
+        self.assertGreater(features[1, 1, 2], 100 * features[1, 0, 2])
+
+    def test_tangent_space_model(self):
+        """Check, that tangent vectors preserve the Riemannian distance to the incrementally fitted reference.
+        """
+        # arrange
+        epochs = create_epochs(12)
+        model = TangentSpaceModel(shrinkage=0)
+        model.partial_fit(epochs[:5]).partial_fit(epochs[5:])
+        database = TemplateDatabase()
+        model.store(database)
+
+        # action
+        restored = TangentSpaceModel()
+        restored.restore(TemplateDatabase.construct_from_json(database.to_json()))
+        features = restored.extract_batch(epochs)
+
+        # check
+        cov = np.stack([np.cov(np.array(e.signals)) for e in epochs])
+        reference = np.mean([logm(c) for c in cov], axis=0)
+        self.assertTrue(np.allclose(restored.reference, expm(reference)))
+        self.assertEqual(features.shape, (12, 6))
+        for c, f in zip(cov, features):
+            distance = np.sqrt(np.sum(np.log(eigvalsh(c, restored.reference))**2))
+            self.assertAlmostEqual(np.linalg.norm(f), distance)
+
+    def test_tangent_space_flat_channel(self):
+        """Check, that flat channels and flat epochs keep the reference and the features finite.
+        """
+        # arrange
+        epochs = create_epochs(6)
+        for e in epochs[:3]:
+            e.signals[1] = np.full_like(e.signals[1], 5.0)
+        epochs[3].signals = [np.zeros(256) for _ in range(3)]
+        model = TangentSpaceModel()
+
+        # action
+        model.partial_fit(epochs)
+        features = model.extract_batch(epochs)
+
+        # check
+        self.assertTrue(np.all(np.isfinite(model.reference)))
+        self.assertTrue(np.all(np.isfinite(features)))
@@ -0,0 +1,88 @@
+import unittest
+
+import numpy as np
+
+from neuropack.containers import EEGContainer, IngestionStage
+from neuropack.devices.base import BCIChunk
+
+
+class IngestionStageTests(unittest.TestCase):
+    def create_chunk(self, timestamps):
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        return BCIChunk(timestamps, np.vstack([timestamps, -timestamps]))
+
+    def test_untouched_chunk(self):
+        """Check, that uniformly sampled chunks pass unchanged.
+        """
+        # arrange
+        stage = IngestionStage(100)
+        chunk = self.create_chunk(np.arange(50) / 100)
+
+        # action
+        repaired, spans = stage.process(chunk)
+
+        # check
+        self.assertTrue(np.array_equal(repaired.timestamps, chunk.timestamps))
+        self.assertTrue(np.array_equal(repaired.signals, chunk.signals))
+        self.assertEqual(len(spans), 0, "Expected no invalid spans.")
+
+    def test_drop_duplicates(self):
+        """Check, that repeated and out of order samples are dropped.
+        """
+        # arrange
+        stage = IngestionStage(100)
+        timestamps = np.arange(20) / 100
+        chunk = self.create_chunk(np.insert(timestamps, [5, 5, 10], [0.04, 0.04, 0.02]))
+
+        # action
+        repaired, _ = stage.process(chunk)
+
+        # check
+        self.assertTrue(np.allclose(repaired.timestamps, timestamps))
+        self.assertEqual(stage.dropped_samples, 3)
+
+    def test_fill_short_gap(self):
+        """Check, that short gaps within and between chunks are interpolated.
+        """
+        # arrange
+        stage = IngestionStage(100, max_fill_ms=50)
+        timestamps = np.arange(40) / 100
+        first = self.create_chunk(np.delete(timestamps[:20], [5, 6]))
+        second = self.create_chunk(timestamps[23:])
+
+        # action
+        a, _ = stage.process(first)
+        b, spans = stage.process(second)
+
+        # check
+        repaired = np.concatenate((a.timestamps, b.timestamps))
+        signals = np.concatenate((a.signals, b.signals), axis=1)
+        self.assertTrue(np.allclose(repaired, timestamps),
+                        "Timestamps were not filled as expected.")
+        self.assertTrue(np.allclose(signals[0], timestamps),
+                        "Signals were not interpolated linearly.")
+        self.assertEqual(stage.filled_samples, 5)
+        self.assertEqual(len(spans), 0, "Expected no invalid spans.")
+
+    def test_long_gap_rejects_events(self):
+        """Check, that long gaps are marked as invalid and events overlapping them are rejected.
+        """
+        # arrange
+        stage = IngestionStage(100, max_fill_ms=50)
+        container = EEGContainer(["Ch1", "Ch2"], 100)
+        timestamps = np.arange(500) / 100
+        stage.ingest(container, self.create_chunk(timestamps[:200]))
+        stage.ingest(container, self.create_chunk(timestamps[220:]))
+
+        # action
+        container.mark_event(1, 1.0)
+        container.mark_event(1, 2.1)
+        container.mark_event(1, 3.5)
+        events = container.get_events(1, 200, 300)
+        all_events = container.get_events(1, 200, 300, reject_invalid=False)
+
+        # check
+        self.assertEqual(len(container.invalid_spans), 1,
+                         "Expected one invalid span.")
+        self.assertEqual(len(events), 2, "Expected overlapping event to be rejected.")
+        self.assertEqual(len(all_events), 3)
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from neuropack.containers import EventContainer
+from neuropack.preprocessing import (BandpassFilter, BaselineCorrectionFilter,
+                                     PreprocessingCache, PreprocessingPipeline)
+
+
+def create_epochs(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [EventContainer(["Ch0", "Ch1"], 256, list(rng.normal(size=(2, 256))),
+                           (np.arange(256) - 51) / 256)
+            for _ in range(n)]
+
+
+class PreprocessingCacheTests(unittest.TestCase):
+    def test_hit_after_miss(self):
+        """Check, that results are loaded from disk on the second run.
+        """
+        # arrange
+        pipeline = PreprocessingPipeline(
+            BandpassFilter(1, 30), BaselineCorrectionFilter())
+        expected = create_epochs(4)
+        pipeline.apply(expected)
+
+        with tempfile.TemporaryDirectory() as directory:
+            PreprocessingCache(directory).apply(pipeline, create_epochs(4))
+
+            # action
+            cache = PreprocessingCache(directory)
+            epochs = create_epochs(4)
+            cache.apply(pipeline, epochs)
+
+            # check
+            self.assertEqual(cache.stats.hits, 4)
+            self.assertEqual(cache.stats.misses, 0)
+            self.assertEqual(cache.stats.entries, 4)
+            for e, x in zip(epochs, expected):
+                self.assertTrue(np.array_equal(np.array(e.signals), np.array(x.signals)))
+
+    def test_pipeline_change_misses(self):
+        """Check, that changing the pipeline does not return stale results.
+        """
+        # arrange
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PreprocessingCache(directory)
+            cache.apply(PreprocessingPipeline(BandpassFilter(1, 30)), create_epochs(2))
+
+            # action
+            cache.apply(PreprocessingPipeline(BandpassFilter(1, 40)), create_epochs(2))
+
+            # check
+            self.assertEqual(cache.stats.hits, 0)
+            self.assertEqual(cache.stats.misses, 4)
+
+    def test_lru_eviction(self):
+        """Check, that least recently used entries are evicted once the size cap is reached.
+        """
+        # arrange
+        pipeline = PreprocessingPipeline(BandpassFilter(1, 30))
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PreprocessingCache(directory)
+            cache.apply(pipeline, create_epochs(1, 0))
+            cache.max_bytes = 2 * cache.stats.size_bytes
+            cache.apply(pipeline, create_epochs(1, 1))
+            cache.apply(pipeline, create_epochs(1, 0))
+
+            # action
+            cache.apply(pipeline, create_epochs(1, 2))
+            cache.apply(pipeline, create_epochs(1, 0))
+            cache.apply(pipeline, create_epochs(1, 1))
+
+            # check
+            self.assertEqual(cache.stats.evictions, 2)
+            self.assertEqual(cache.stats.entries, 2)
+            self.assertEqual(cache.stats.hits, 2)
@@ -0,0 +1,389 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+from scipy.signal import butter, detrend, filtfilt, iirnotch, sosfiltfilt
+
+from neuropack.containers import EEGContainer, EventContainer
+from neuropack.devices.base import BCIChunk
+from neuropack.preprocessing import filters
+from neuropack.preprocessing import (BandpassFilter, BaselineCorrectionFilter,
+                                     DecimateFilter, DetrendFilter,
+                                     HighpassFilter,
+                                     LowpassFilter, NotchFilter,
+                                     PreprocessingPipeline, ReductionFilter,
+                                     ResampleFilter, StreamingBandpassFilter,
+                                     StreamingHighpassFilter,
+                                     StreamingNotchFilter, StreamingPipeline)
+
+
+def create_epochs(n: int, channels: int = 3, samples: int = 200):
+    rng = np.random.default_rng(0)
+    return [EventContainer([f"Ch{c}" for c in range(channels)], 256,
+                           list(rng.normal(size=(channels, samples))),
+                           (np.arange(samples) - 50) / 256)
+            for _ in range(n)]
+
+
+class PreprocessingTests(unittest.TestCase):
+    def test_batched_pipeline(self):
+        """Check, that a batched pipeline matches filtering each channel separately.
+        """
+        # arrange
+        epochs = create_epochs(20)
+        expected = []
+        bandpass = BandpassFilter(1, 30, 256)
+        notch = NotchFilter(50, 256)
+        for e in epochs:
+            rows = []
+            for s in e.signals:
+                s = sosfiltfilt(bandpass.low_pass.get_sos(256), s)
+                s = sosfiltfilt(bandpass.high_pass.get_sos(256), s)
+                s = filtfilt(*iirnotch(50, 30, 256), s)
+                rows.append(detrend(s))
+            expected.append(np.array(rows))
+        pipeline = PreprocessingPipeline(bandpass, notch, DetrendFilter())
+
+        # action
+        pipeline.apply(epochs)
+
+        # check
+        for e, x in zip(epochs, expected):
+            self.assertTrue(np.allclose(np.array(e.signals), x))
+
+    def test_short_epochs(self):
+        """Check, that without compilation filters are applied one by one like before, which also works on short epochs.
+        """
+        # arrange
+        epochs = create_epochs(3, samples=30)
+        expected = []
+        for e in epochs:
+            rows = []
+            for s in e.signals:
+                s = sosfiltfilt(LowpassFilter(30).get_sos(256), s)
+                s = sosfiltfilt(HighpassFilter(1).get_sos(256), s)
+                rows.append(filtfilt(*iirnotch(50, 30, 256), s))
+            expected.append(np.array(rows))
+
+        # action
+        PreprocessingPipeline(BandpassFilter(1, 30), NotchFilter(50)).apply(epochs)
+
+        # check
+        for e, x in zip(epochs, expected):
+            self.assertTrue(np.allclose(np.array(e.signals), x))
+
+    def test_compiled_pipeline(self):
+        """Check, that a compiled pipeline matches the step-by-step result away from the edges with fewer passes.
+        """
+        # arrange
+        epochs = create_epochs(10, samples=2000)
+        reference = create_epochs(10, samples=2000)
+        steps = [HighpassFilter(4, 256), NotchFilter(50, 256), LowpassFilter(30, 256),
+                 ReductionFilter("Ch0", "Ch1"), NotchFilter(60, 256)]
+        compiled = PreprocessingPipeline(*steps, compile_filters=True)
+        step_by_step = PreprocessingPipeline(*steps)
+
+        # action
+        step_by_step.apply(reference)
+        with mock.patch.object(filters, "sosfiltfilt", wraps=sosfiltfilt) as passes:
+            compiled.apply(epochs)
+
+        # check
+        self.assertEqual(passes.call_count, 2,
+                         "Expected one pass per run of linear filters.")
+        self.assertEqual(len(compiled.get_plan()), 3)
+        self.assertIs(compiled.get_plan(), compiled.get_plan(),
+                      "Plan was not cached.")
+        for e, r in zip(epochs, reference):
+            self.assertTrue(np.allclose(np.array(e.signals)[:, 500:-500],
+                                        np.array(r.signals)[:, 500:-500], atol=1e-5))
+
+    def test_mixed_sample_rates(self):
+        """Check, that filters without a sample rate are designed for each container's sample rate.
+        """
+        # arrange
+        rng = np.random.default_rng(3)
+        epochs = [EventContainer(["Ch0", "Ch1"], rate, list(rng.normal(size=(2, 400))),
+                                 np.arange(400) / rate)
+                  for rate in (250, 256, 512, 250)]
+        expected = [sosfiltfilt(HighpassFilter(1).get_sos(e.sample_rate),
+                                sosfiltfilt(LowpassFilter(30).get_sos(e.sample_rate), np.array(e.signals)))
+                    for e in epochs]
+        filters.design_butter.cache_clear()
+
+        # action
+        PreprocessingPipeline(BandpassFilter(1, 30)).apply(epochs)
+
+        # check
+        for e, x in zip(epochs, expected):
+            self.assertTrue(np.allclose(np.array(e.signals), x))
+        self.assertEqual(filters.design_butter.cache_info().misses, 6,
+                         "Expected one design per filter and sample rate.")
+
+    def test_legacy_coefficients(self):
+        """Check, that filters still expose their coefficients for the configured or the former default sample rate.
+        """
+        # action
+        highpass = HighpassFilter(1)
+        lowpass = LowpassFilter(30, 512)
+        notch = NotchFilter(50)
+
+        # check
+        self.assertTrue(np.allclose(highpass.sos, butter(5, 1, "high", fs=256, output="sos")))
+        self.assertTrue(np.allclose(lowpass.sos, butter(5, 30, "low", fs=512, output="sos")))
+        b, a = iirnotch(50, 30, 256)
+        self.assertTrue(np.allclose(notch.b, b))
+        self.assertTrue(np.allclose(notch.a, a))
+
+    def test_continuous_overlap_save(self):
+        """Check, that chunked filtering of a continuous recording matches filtering it at once.
+        """
+        # arrange
+        rng = np.random.default_rng(4)
+        container = EEGContainer(["Ch0", "Ch1"], 256)
+        container.signals = rng.normal(size=(2, 256 * 60)).tolist()
+        container.timestamps = (np.arange(256 * 60) / 256).tolist()
+        steps = [HighpassFilter(1), NotchFilter(50), DetrendFilter(),
+                 BaselineCorrectionFilter(), LowpassFilter(30)]
+        expected = NotchFilter(50).apply_array(
+            HighpassFilter(1).apply_array(np.array(container.signals), 256), 256)
+
+        # action
+        remaining = PreprocessingPipeline(
+            *steps).apply_continuous(container, chunk_s=5)
+
+        # check
+        self.assertTrue(np.allclose(container.signals, expected, atol=1e-4))
+        self.assertIsInstance(container["Ch0"], list)
+        self.assertEqual(len(remaining.filters), 3)
+        self.assertIsInstance(remaining.filters[0], DetrendFilter,
+                              "Non-linear filters must be applied to events.")
+
+    def test_parallel_pipeline(self):
+        """Check, that a process pool yields the same results as serial preprocessing.
+        """
+        # arrange
+        epochs = create_epochs(12)
+        reference = create_epochs(12)
+        for e in epochs[:4]:
+            e.signals = [s.tolist() for s in e.signals]
+        pipeline = PreprocessingPipeline(
+            BandpassFilter(1, 30), BaselineCorrectionFilter(), ReductionFilter("Ch0", "Ch2"))
+        pipeline.apply(reference)
+
+        # action
+        processed = list(pipeline.apply_parallel(epochs, workers=2))
+
+        # check
+        self.assertEqual(len(processed), 12)
+        self.assertSetEqual({id(e) for e in processed}, {id(e) for e in epochs},
+                            "Containers were not updated in-place.")
+        self.assertIsInstance(epochs[0].signals[0], list)
+        for e, r in zip(epochs, reference):
+            self.assertListEqual(e.channel_names, r.channel_names)
+            self.assertTrue(np.allclose(np.array(e.signals), np.array(r.signals)))
+
+    def test_parallel_timestamps(self):
+        """Check, that parallel preprocessing updates timestamps through shared memory and keeps markers and invalid
+        spans of recordings.
+        """
+        # arrange
+        recordings = []
+        for offset in range(3):
+            container = EEGContainer(["Ch0", "Ch1"], 256)
+            container.signals = list(np.random.default_rng(offset).normal(size=(2, 512)))
+            container.timestamps = list(offset + np.arange(512) / 256)
+            container.mark_event(1, offset + 1)
+            container.mark_invalid(offset + 0.5, offset + 0.6)
+            recordings.append(container)
+        pipeline = PreprocessingPipeline(HighpassFilter(1), ResampleFilter(128))
+
+        # action
+        processed = list(pipeline.apply_parallel(recordings, workers=2))
+
+        # check
+        self.assertEqual(len(processed), 3)
+        for offset, container in enumerate(recordings):
+            self.assertEqual(container.sample_rate, 128)
+            self.assertIsInstance(container.timestamps, list)
+            self.assertTrue(np.allclose(container.timestamps, offset + np.arange(256) / 128))
+            self.assertListEqual(container.get_marker(1), [offset + 1])
+            self.assertListEqual(container.invalid_spans, [(offset + 0.5, offset + 0.6)])
+        truncated = EEGContainer(["Ch0"], 256)
+        truncated.signals = [np.zeros(10)]
+        truncated.timestamps = list(range(5))
+        with self.assertRaises(AssertionError):
+            list(pipeline.apply_parallel([truncated], workers=1))
+
+    def test_resample_batch(self):
+        """Check, that resampling updates signals, sample rate and timestamps of every container in a batch.
+        """
+        # arrange
+        epochs = create_epochs(4, samples=256)
+        t = np.arange(256) / 256
+        for e in epochs:
+            e.signals = [np.sin(2 * np.pi * 5 * t), np.cos(2 * np.pi * 5 * t)]
+        pipeline = PreprocessingPipeline(NotchFilter(50), ResampleFilter(100))
+
+        # action
+        pipeline.apply(epochs)
+
+        # check
+        for e in epochs:
+            self.assertEqual(e.sample_rate, 100)
+            self.assertEqual(len(e.timestamps), 100)
+            self.assertEqual(len(e["Ch0"]), 100)
+            self.assertAlmostEqual(e.timestamps[1] - e.timestamps[0], 0.01)
+            self.assertTrue(np.allclose(e["Ch0"][20:80],
+                                        np.sin(2 * np.pi * 5 * np.arange(100) / 100)[20:80], atol=0.05))
+
+    def test_resample_keeps_gaps(self):
+        """Check, that resampling interpolates the recorded timestamps instead of assuming a regular clock.
+        """
+        # arrange
+        container = EEGContainer(["Ch1"], 512)
+        timestamps = np.arange(1024) / 512
+        timestamps[512:] += 0.5
+        container.timestamps = timestamps.tolist()
+        container.signals = [np.zeros(1024).tolist()]
+
+        # action
+        ResampleFilter(256).apply(container)
+
+        # check
+        self.assertEqual(len(container.timestamps), 512)
+        self.assertTrue(np.allclose(container.timestamps, timestamps[::2]))
+        self.assertEqual(str(ResampleFilter(256)),
+                         "ResampleFilter(sample_rate=256, max_denominator=1000)")
+
+    def test_decimate_container(self):
+        """Check, that decimation keeps every n-th timestamp and preserves list storage.
+        """
+        # arrange
+        container = EEGContainer(["Ch1"], 512)
+        container.timestamps = (np.arange(1024) / 512).tolist()
+        container.signals = [np.sin(2 * np.pi * 3 * np.arange(1024) / 512).tolist()]
+        expected_timestamps = container.timestamps[::4]
+
+        # action
+        DecimateFilter(4).apply(container)
+
+        # check
+        self.assertEqual(container.sample_rate, 128)
+        self.assertListEqual(container.timestamps, expected_timestamps)
+        self.assertIsInstance(container["Ch1"], list)
+        self.assertTrue(np.allclose(container["Ch1"][16:-16],
+                                    np.sin(2 * np.pi * 3 * np.array(expected_timestamps))[16:-16], atol=0.01))
+
+    def test_baseline_window(self):
+        """Check, that baseline windows are resolved per event, also without a sample exactly at the stimulus.
+        """
+        # arrange
+        epochs = create_epochs(6)
+        for i, e in enumerate(epochs):
+            e.timestamps = e.timestamps + i * 0.001
+        expected = []
+        for e in epochs:
+            mask = (e.timestamps >= -0.1) & (e.timestamps < 0)
+            x = np.array(e.signals)
+            expected.append(x - x[:, mask].mean(axis=1, keepdims=True))
+
+        # action
+        PreprocessingPipeline(BaselineCorrectionFilter((-100, 0))).apply(epochs)
+
+        # check
+        for e, x in zip(epochs, expected):
+            self.assertTrue(np.allclose(np.array(e.signals), x))
+
+    def test_baseline_after_detrend(self):
+        """Check, that baseline correction is applied in order with other filters.
+        """
+        # arrange
+        epochs = create_epochs(5)
+        expected = [detrend(e.signals, axis=-1) for e in epochs]
+        expected = [x - x[:, :50].mean(axis=1, keepdims=True) for x in expected]
+        pipeline = PreprocessingPipeline(
+            DetrendFilter(), BaselineCorrectionFilter())
+
+        # action
+        pipeline.apply(epochs)
+
+        # check
+        for e, x in zip(epochs, expected):
+            self.assertTrue(np.allclose(np.array(e.signals), x))
+
+    def test_list_signals(self):
+        """Check, that containers storing lists keep storing lists.
+        """
+        # arrange
+        container = EEGContainer(["Ch1", "Ch2"], 256)
+        container.signals = [list(np.linspace(0, 1, 100)),
+                             list(np.linspace(1, 0, 100))]
+        container.timestamps = list(np.arange(100) / 256)
+
+        # action
+        PreprocessingPipeline(DetrendFilter()).apply(container)
+
+        # check
+        self.assertIsInstance(container["Ch1"], list)
+        self.assertTrue(np.allclose(container["Ch1"], 0))
+
+    def test_streaming_chunks(self):
+        """Check, that filtering a stream chunk-wise equals filtering it at once.
+        """
+        # arrange
+        signals = np.random.default_rng(1).normal(size=(2, 1000))
+        whole = StreamingPipeline(StreamingBandpassFilter(1, 30, 256),
+                                  StreamingNotchFilter(50, 256))
+        chunked = StreamingPipeline(StreamingBandpassFilter(1, 30, 256),
+                                    StreamingNotchFilter(50, 256))
+        expected = whole.process(signals)
+
+        # action
+        bounds = [0, 1, 17, 300, 301, 640, 1000]
+        result = np.hstack([chunked.process(signals[:, s:e])
+                            for s, e in zip(bounds[:-1], bounds[1:])])
+
+        # check
+        self.assertTrue(np.allclose(result, expected))
+
+    def test_streaming_coverage(self):
+        """Check, that streaming filters are designed for the configured rate and replace equal offline filters
+        one-to-one.
+        """
+        # arrange
+        streaming = StreamingPipeline(StreamingBandpassFilter(1, 30), StreamingNotchFilter(50))
+        offline = PreprocessingPipeline(BandpassFilter(1, 30), NotchFilter(60), DetrendFilter(),
+                                        NotchFilter(50))
+        twice = PreprocessingPipeline(NotchFilter(50), NotchFilter(50), DetrendFilter())
+
+        # action
+        streaming.configure(512)
+        remaining = offline.skip_linear(streaming.covered)
+        skipped = twice.skipped_linear(streaming.covered)
+
+        # check
+        self.assertTrue(np.allclose(streaming.filters[0].sos,
+                                    BandpassFilter(1, 30).get_sos(512)))
+        self.assertListEqual([str(f) for f in remaining.filters],
+                             [str(NotchFilter(60)), str(DetrendFilter()), str(NotchFilter(50))])
+        self.assertListEqual(skipped, [twice.filters[0]])
+        self.assertListEqual([str(f) for f in twice.skip_linear(streaming.covered).filters],
+                             [str(NotchFilter(50)), str(DetrendFilter())])
+        with self.assertRaises(AssertionError):
+            StreamingPipeline(StreamingHighpassFilter(1, 256)).configure(512)
+
+    def test_streaming_reset(self):
+        """Check, that resetting a streaming pipeline forgets the previous stream.
+        """
+        # arrange
+        signals = np.random.default_rng(2).normal(size=(2, 200))
+        pipeline = StreamingPipeline(StreamingHighpassFilter(1, 256))
+        first = pipeline.apply(BCIChunk(np.arange(200), signals))
+
+        # action
+        pipeline.reset()
+        second = pipeline.apply(BCIChunk(np.arange(200), signals))
+
+        # check
+        self.assertTrue(np.allclose(first.signals, second.signals))
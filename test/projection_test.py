@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from neuropack.utils.projection import IncrementalPCA
+
+
+class ProjectionTests(unittest.TestCase):
+    def test_incremental_matches_batch(self):
+        """Check, that fitting batch by batch yields the components of a PCA of all samples, if the samples lie in a
+        subspace spanned by the kept components.
+        """
+        # arrange
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(120, 5)) * np.arange(5, 0, -1) @ rng.normal(size=(5, 30)) + 5
+        pca = IncrementalPCA(5)
+
+        # action
+        for batch in np.array_split(x, [7, 40, 41, 90]):
+            pca.partial_fit(batch)
+
+        # check
+        centered = x - x.mean(axis=0)
+        _, s, vt = np.linalg.svd(centered, full_matrices=False)
+        self.assertEqual(pca.n_samples_seen, 120)
+        self.assertTrue(np.allclose(pca.mean, x.mean(axis=0)))
+        self.assertTrue(np.allclose(pca.singular_values, s[:5]))
+        self.assertTrue(np.allclose(np.abs(pca.components @ vt[:5].T), np.eye(5), atol=1e-6))
+
+    def test_whitened_projection(self):
+        """Check, that whitened projections of the fitted samples have unit variance.
+        """
+        # arrange
+        x = np.random.default_rng(1).normal(size=(200, 10)) * np.arange(1, 11)
+        pca = IncrementalPCA(3, whiten=True).partial_fit(x)
+
+        # action
+        projected = pca.transform(x)
+
+        # check
+        self.assertEqual(projected.shape, (200, 3))
+        self.assertTrue(np.allclose(projected.var(axis=0, ddof=1), 1))
+
+    def test_state(self):
+        """Check, that a restored projection yields the same projections.
+        """
+        # arrange
+        x = np.random.default_rng(2).normal(size=(50, 8))
+        pca = IncrementalPCA(4).partial_fit(x)
+
+        # action
+        restored = IncrementalPCA.from_dict(pca.to_dict())
+
+        # check
+        self.assertEqual(restored.n_samples_seen, 50)
+        self.assertTrue(np.allclose(restored.transform(x), pca.transform(x)))
+
+    def test_degenerate_batches(self):
+        """Check, that a first batch with fewer samples than components is rejected and that components without
+        variance are not inflated by whitening.
+        """
+        # arrange
+        x = np.random.default_rng(3).normal(size=(3, 6))
+        pca = IncrementalPCA(3, whiten=True).partial_fit(x)
+
+        # action
+        projected = pca.transform(x)
+
+        # check
+        with self.assertRaises(AssertionError):
+            IncrementalPCA(3).partial_fit(x[:1])
+        self.assertEqual(pca.components.shape, (3, 6))
+        self.assertTrue(np.allclose(projected[:, 2], 0))
+        self.assertTrue(np.all(np.abs(projected) < 10))
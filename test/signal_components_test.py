@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from neuropack.containers import EventContainer
+from neuropack.preprocessing import (Blink, ComponentPipeline, ComponentType,
+                                     FlatLine, PeakToPeak, VarianceZScore)
+
+
+def create_epochs(n: int):
+    rng = np.random.default_rng(0)
+    return [EventContainer(["Ch0", "Ch1"], 256, list(rng.normal(0, 10, size=(2, 256))),
+                           np.arange(256) / 256)
+            for _ in range(n)]
+
+
+class SignalComponentTests(unittest.TestCase):
+    def test_check_batch(self):
+        """Check, that artifacts are rejected in one batch and counted per component.
+        """
+        # arrange
+        epochs = create_epochs(20)
+        epochs[1].signals[0][100] = 300
+        epochs[5].signals[1][:] = 0
+        epochs[9].signals[1] *= 5
+        pipeline = ComponentPipeline()
+        pipeline.add_component(Blink("Ch0"))
+        pipeline.add_component(FlatLine())
+        pipeline.add_component(VarianceZScore())
+
+        # action
+        keep, counts = pipeline.check_batch(epochs)
+
+        # check
+        self.assertListEqual(list(np.nonzero(~keep)[0]), [1, 5, 9])
+        self.assertEqual(counts["Blink(Ch0, threshold=100)"], 1)
+        self.assertEqual(counts["FlatLine(threshold=0.5)"], 1)
+        self.assertEqual(counts["VarianceZScore(threshold=3)"], 3,
+                         "Expected all artifacts to deviate in variance.")
+
+    def test_batch_matches_single(self):
+        """Check, that batch results match checking each event separately.
+        """
+        # arrange
+        epochs = create_epochs(10)
+        epochs[3].signals[1][50:60] = 200
+        pipeline = ComponentPipeline()
+        pipeline.add_component(PeakToPeak("Ch1", threshold=150))
+        pipeline.add_component(Blink(), ComponentType.Desired)
+
+        # action
+        keep, counts = pipeline.check_batch(epochs)
+
+        # check
+        self.assertListEqual(list(keep), [pipeline.check_event(e) for e in epochs])
+        self.assertEqual(counts["missing Blink(threshold=100)"], 9)
+        self.assertEqual(counts["PeakToPeak(Ch1, threshold=150)"], 1)
+
+    def test_counts_per_channel(self):
+        """Check, that equal components checking different channels are counted separately.
+        """
+        # arrange
+        epochs = create_epochs(5)
+        epochs[2].signals[1][10] = 500
+        pipeline = ComponentPipeline()
+        pipeline.add_component(Blink("Ch0"))
+        pipeline.add_component(Blink("Ch1"))
+
+        # action
+        _, counts = pipeline.check_batch(epochs)
+
+        # check
+        self.assertDictEqual(counts, {"Blink(Ch0, threshold=100)": 0,
+                                      "Blink(Ch1, threshold=100)": 1})
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from neuropack.utils.spd import covariance, spd_apply, upper_triangle
+
+
+class SPDTests(unittest.TestCase):
+    def test_covariance(self):
+        """Check, that batched covariances match the covariance of each epoch.
+        """
+        # arrange
+        x = np.random.default_rng(0).normal(size=(5, 4, 100))
+
+        # action
+        cov = covariance(x)
+        shrunk = covariance(x, 0.5)
+
+        # check
+        for i in range(5):
+            self.assertTrue(np.allclose(cov[i], np.cov(x[i])))
+        self.assertTrue(np.allclose(np.trace(shrunk, axis1=1, axis2=2),
+                                    np.trace(cov, axis1=1, axis2=2)))
+
+    def test_matrix_functions(self):
+        """Check, that matrix logarithm and exponential invert each other and vectors keep the Frobenius norm.
+        """
+        # arrange
+        cov = covariance(np.random.default_rng(1).normal(size=(6, 3, 50)))
+
+        # action
+        logs = spd_apply(cov, np.log)
+
+        # check
+        self.assertTrue(np.allclose(spd_apply(logs, np.exp), cov))
+        self.assertTrue(np.allclose(np.linalg.norm(upper_triangle(logs), axis=-1),
+                                    np.linalg.norm(logs, axis=(1, 2))))
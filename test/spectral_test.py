@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+from scipy.linalg import solve_toeplitz
+
+from neuropack.utils.spectral import (autocorrelation, morlet_transform,
+                                      morlet_wavelets, yule_walker)
+
+
+class SpectralTests(unittest.TestCase):
+    def test_autocorrelation(self):
+        """Check, that FFT autocorrelation matches the direct estimate.
+        """
+        # arrange
+        x = np.random.default_rng(0).normal(size=(2, 3, 100))
+
+        # action
+        r = autocorrelation(x, 5)
+
+        # check
+        d = x - x.mean(axis=-1, keepdims=True)
+        expected = np.stack([np.sum(d[..., :100 - k] * d[..., k:], axis=-1) / 100
+                             for k in range(6)], axis=-1)
+        self.assertTrue(np.allclose(r, expected))
+
+    def test_yule_walker(self):
+        """Check, that Levinson-Durbin solves the Yule-Walker equations of every signal.
+        """
+        # arrange
+        rng = np.random.default_rng(1)
+        x = rng.normal(size=(20, 4, 256)).cumsum(axis=-1)
+
+        # action
+        rho, sigma = yule_walker(x, 10)
+
+        # check
+        r = autocorrelation(x, 10)
+        for i in range(20):
+            for c in range(4):
+                expected = solve_toeplitz(r[i, c, :-1], r[i, c, 1:])
+                self.assertTrue(np.allclose(rho[i, c], expected))
+        self.assertTrue(np.allclose(sigma**2, r[..., 0] - np.sum(r[..., 1:] * rho, axis=-1)))
+
+    def test_flat_signal(self):
+        """Check, that signals without variance yield zero coefficients.
+        """
+        # action
+        rho, sigma = yule_walker(np.ones((2, 50)), 4)
+
+        # check
+        self.assertTrue(np.array_equal(rho, np.zeros((2, 4))))
+        self.assertTrue(np.array_equal(sigma, np.zeros(2)))
+
+    def test_morlet_transform(self):
+        """Check, that the batched FFT convolution matches convolving each signal with each wavelet.
+        """
+        # arrange
+        x = np.random.default_rng(2).normal(size=(3, 2, 300))
+        freqs = (5.0, 12.0, 30.0)
+
+        # action
+        tfr = morlet_transform(x, 256, freqs, 5)
+
+        # check
+        wavelets = morlet_wavelets(freqs, 256, 5)
+        self.assertEqual(tfr.shape, (3, 2, 3, 300))
+        for i in range(3):
+            for c in range(2):
+                for f in range(3):
+                    expected = np.convolve(x[i, c], wavelets[f], mode="same")
+                    self.assertTrue(np.allclose(tfr[i, c, f], expected))